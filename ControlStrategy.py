@@ -1,5 +1,5 @@
 import libraries.traci as traci
-import math
+from JunctionContext import JunctionContext
 
 
 class ControlStrategy:
@@ -10,6 +10,24 @@ class ControlStrategy:
     incoming_edges = ['gneE4', '-gneE5', 'gneE2', '-gneE3']
     edges_ud = ['gneE2', '-gneE3']
     edges_lr = ['gneE4', '-gneE5']
+    junction_id = '0'
+    # covers the whole approaches, they end 100 m from the junction center
+    context_radius = 150.0
+    simulation_state = None
+    junction_context = None
+
+    def set_simulation_state(self, simulation_state):
+        self.simulation_state = simulation_state
+
+    def subscribe_junction(self, lanes=None, min_distance=0.0, max_distance=float('inf'), with_queue_vars=True):
+        # one context subscription for the vehicles approaching the controlled junction, call in register
+        self.junction_context = JunctionContext(self.junction_id, self.incoming_edges, self.context_radius, lanes,
+                                                min_distance, max_distance, with_queue_vars)
+        self.simulation_state.add_junction_context(self.junction_context)
+
+    def register(self, scheduler):
+        # strategies without events are controlled every step
+        scheduler.add_step_callback(self.control)
 
     def control(self, step):
         pass
@@ -52,18 +70,31 @@ class TlControl(ControlStrategy):
         self.blocked_edges = []
 
         self.step_length = -0.1
+        self.last_control_step = -1
 
     def set_step_length(self, step_length):
         self.step_length = step_length
 
+    def register(self, scheduler):
+        # the last vehicle only has to be checked when vehicles depart or arrive and after a switch
+        switch_period = int(round(self.tl_period / self.step_length))
+        # closest vehicles to the intersection's critical region, only their positions are needed
+        self.subscribe_junction(min_distance=30.0, max_distance=100000.0, with_queue_vars=False)
+        scheduler.add_periodic_timer(switch_period, self.control)
+        scheduler.add_periodic_timer(switch_period, self.control, first_step=1)
+        scheduler.on_departure(self.control)
+        scheduler.on_arrival(self.control)
+
     def control(self, step):
-        self.time_until_switch = self.time_until_switch - self.step_length
+        # control is not called on every step, count down all steps since the last call
+        self.time_until_switch = self.time_until_switch - (step - self.last_control_step) * self.step_length
+        self.last_control_step = step
 
         # check if a vehicle was generated on a lane with a red light and without a leading vehicle
-        active_vehicles = traci.vehicle.getIDList()
+        active_vehicles = self.simulation_state.get_vehicle_ids()
         if active_vehicles:
             vehicle_id = active_vehicles[len(active_vehicles) - 1]
-            route_id = traci.vehicle.getRouteID(active_vehicles[len(active_vehicles) - 1])
+            route_id = self.simulation_state.get_route_id(vehicle_id)
             edge = self.route_edge_dict[route_id]
             if edge not in self.blocked_edges:
                 if self.priority_ud == 0 and edge in getattr(ControlStrategy, 'edges_ud'):
@@ -86,14 +117,8 @@ class TlControl(ControlStrategy):
             self.time_until_switch = self.tl_period
 
             # find closest vehicles to intersection's critical region
-            closest_vehicles = [['-1', 100000.0], ['-1', 100000.0], ['-1', 100000.0], ['-1', 100000.0]]
-            for vehicle in active_vehicles:
-                x, y = traci.vehicle.getPosition(vehicle)
-                edge = traci.vehicle.getRoadID(vehicle)
-                if edge in getattr(ControlStrategy, 'incoming_edges'):
-                    distance = math.sqrt(x ** 2 + y ** 2)
-                    if 30.0 < distance < closest_vehicles[getattr(ControlStrategy, 'incoming_edges').index(edge)][1]:
-                        closest_vehicles[getattr(ControlStrategy, 'incoming_edges').index(edge)] = [vehicle, distance]
+            closest_vehicles = [[vehicle_id, distance] if vehicle_id is not None else ['-1', 100000.0]
+                                for vehicle_id, distance in self.junction_context.get_closest()]
 
             if self.priority_ud == 0:
                 vehicle_0 = closest_vehicles[getattr(ControlStrategy, 'incoming_edges').index(
@@ -109,7 +134,7 @@ class TlControl(ControlStrategy):
                     except:
                         print("Vehicle could not break and caused traci exception.")
                         print("Vehicle edge: " + edge)
-                        print("Vehicle pos: " + str(traci.vehicle.getPosition(vehicle_0)))
+                        print("Vehicle pos: " + str(self.simulation_state.get_position(vehicle_0)))
                 if vehicle_1 != '-1':
                     edge = getattr(ControlStrategy, 'edges_ud')[1]
                     try:
@@ -118,7 +143,7 @@ class TlControl(ControlStrategy):
                     except:
                         print("Vehicle could not break and caused traci exception.")
                         print("Vehicle edge: " + edge)
-                        print("Vehicle pos: " + str(traci.vehicle.getPosition(vehicle_1)))
+                        print("Vehicle pos: " + str(self.simulation_state.get_position(vehicle_1)))
 
             else:
                 vehicle_0 = closest_vehicles[getattr(ControlStrategy, 'incoming_edges').index(
@@ -134,7 +159,7 @@ class TlControl(ControlStrategy):
                     except:
                         print("Vehicle could not break and caused traci exception.")
                         print("Vehicle edge: " + edge)
-                        print("Vehicle pos: " + str(traci.vehicle.getPosition(vehicle_0)))
+                        print("Vehicle pos: " + str(self.simulation_state.get_position(vehicle_0)))
                 if vehicle_1 != '-1':
                     edge = getattr(ControlStrategy, 'edges_lr')[1]
                     try:
@@ -143,7 +168,7 @@ class TlControl(ControlStrategy):
                     except:
                         print("Vehicle could not break and caused traci exception.")
                         print("Vehicle edge: " + edge)
-                        print("Vehicle pos: " + str(traci.vehicle.getPosition(vehicle_1)))
+                        print("Vehicle pos: " + str(self.simulation_state.get_position(vehicle_1)))
         self.switch = False
 
 
@@ -164,6 +189,10 @@ class NoControl(ControlStrategy):
         self.name = "No Control"
         self.id = 4
 
+    def register(self, scheduler):
+        # nothing to control, the scheduler can fast-forward between insertions
+        pass
+
     def control(self, step):
         # put Grid code here
         pass
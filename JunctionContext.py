@@ -0,0 +1,115 @@
+import numpy as np
+import libraries.traci as traci
+import libraries.traci.constants as tc
+from VehicleKernels import closest_per_approach, queues_per_approach
+
+
+class JunctionContext:
+    # vehicles around one controlled junction from a single context subscription: every step sumo sends the
+    # variables of all vehicles within the radius of the junction in one response instead of one getter per vehicle
+    # sumo only filters junction contexts by the radius, approach, lane and distance filters are applied here
+    required_vars = [tc.VAR_ROAD_ID, tc.VAR_POSITION]
+    queue_vars = [tc.VAR_LANE_ID, tc.VAR_LANEPOSITION, tc.VAR_SPEED]
+
+    def __init__(self, junction_id, approaches, radius, lanes=None, min_distance=0.0, max_distance=np.inf,
+                 with_queue_vars=True):
+        # approaches: incoming edges, vehicles on other roads (outgoing edges, inside the junction) are dropped
+        # lanes: lanes of the approaches to keep, None for all of them
+        # min_distance, max_distance: band of the distance to the junction center, both bounds excluded
+        # with_queue_vars: without them the response is smaller, but stop line distances and speeds are nan
+        self.junction_id = junction_id
+        self.approaches = list(approaches)
+        self.approach_index = {edge: idx for idx, edge in enumerate(self.approaches)}
+        self.radius = radius
+        self.lanes = None if lanes is None else set(lanes)
+        self.min_distance = min_distance
+        self.max_distance = max_distance
+        self.context_vars = list(self.required_vars)
+        if with_queue_vars:
+            self.context_vars.extend(self.queue_vars)
+        elif lanes is not None:
+            self.context_vars.append(tc.VAR_LANE_ID)
+        self.center = (0.0, 0.0)
+        # static lane lengths for the distances to the stop line
+        self.lane_lengths = {}
+        # context subscription results of the last step and the arrays and queues built from them on demand
+        self.vehicles = {}
+        self.arrays = None
+        self.queues = None
+
+    def subscribe(self):
+        # call once after traci.start, the subscription answer already carries the current vehicles
+        self.center = traci.junction.getPosition(self.junction_id)
+        traci.junction.subscribeContext(self.junction_id, tc.CMD_GET_VEHICLE_VARIABLE, self.radius,
+                                        self.context_vars)
+        self.update()
+
+    def unsubscribe(self):
+        traci.junction.unsubscribeContext(self.junction_id, tc.CMD_GET_VEHICLE_VARIABLE, self.radius)
+        self.vehicles = {}
+        self.arrays = None
+        self.queues = None
+
+    def update(self):
+        # call once after every traci.simulationStep, strategies which do not query in a step pay nothing
+        self.vehicles = traci.junction.getContextSubscriptionResults(self.junction_id) or {}
+        self.arrays = None
+        self.queues = None
+
+    def lane_length(self, lane_id):
+        if lane_id not in self.lane_lengths:
+            self.lane_lengths[lane_id] = traci.lane.getLength(lane_id)
+        return self.lane_lengths[lane_id]
+
+    def build_arrays(self):
+        # ids, positions relative to the center and approach indices of the vehicles for the kernels,
+        # vehicles on other roads or lanes get the approach -1
+        ids = list(self.vehicles)
+        positions = np.empty((len(ids), 2))
+        approach_indices = np.empty(len(ids), dtype=np.intp)
+        for idx, values in enumerate(self.vehicles.values()):
+            positions[idx] = values[tc.VAR_POSITION]
+            approach_indices[idx] = self.approach_index.get(values[tc.VAR_ROAD_ID], -1)
+            if self.lanes is not None and values[tc.VAR_LANE_ID] not in self.lanes:
+                approach_indices[idx] = -1
+        positions -= self.center
+        self.arrays = (ids, positions, approach_indices)
+
+    def build_queues(self):
+        # per approach the ids, distances to the center, distances to the stop line and speeds of the vehicles,
+        # closest vehicle first, vehicles at the same distance in the order of the subscription result
+        if self.arrays is None:
+            self.build_arrays()
+        ids, positions, approach_indices = self.arrays
+        members, distances = queues_per_approach(positions, approach_indices, len(self.approaches),
+                                                 self.min_distance, self.max_distance)
+        ids = np.array(ids, dtype=object)
+        values = list(self.vehicles.values())
+        self.queues = []
+        for approach_members in members:
+            stop_line_distances = np.full(len(approach_members), np.nan)
+            speeds = np.full(len(approach_members), np.nan)
+            for idx, member in enumerate(approach_members):
+                vehicle_values = values[member]
+                if tc.VAR_LANEPOSITION in vehicle_values:
+                    stop_line_distances[idx] = self.lane_length(vehicle_values[tc.VAR_LANE_ID]) - \
+                        vehicle_values[tc.VAR_LANEPOSITION]
+                speeds[idx] = vehicle_values.get(tc.VAR_SPEED, np.nan)
+            self.queues.append({"ids": ids[approach_members], "distances": distances[approach_members],
+                                "stop_line_distances": stop_line_distances, "speeds": speeds})
+
+    def get_queue(self, approach):
+        # dict of ordered arrays: ids, distances, stop_line_distances, speeds
+        if self.queues is None:
+            self.build_queues()
+        return self.queues[self.approach_index[approach]]
+
+    def get_closest(self):
+        # per approach the closest vehicle and its distance to the center, None and inf if the approach is empty,
+        # found with the kernel without building the queues
+        if self.arrays is None:
+            self.build_arrays()
+        ids, positions, approach_indices = self.arrays
+        closest, distances = closest_per_approach(positions, approach_indices, len(self.approaches),
+                                                  self.min_distance, self.max_distance)
+        return [(ids[idx], distance) if idx >= 0 else (None, np.inf) for idx, distance in zip(closest, distances)]
@@ -1,14 +1,45 @@
 import sys
 import os
+import random
+import shutil
+import time
 import ControlStrategy
+import SumoStub
+from SimulationState import SimulationState
+from StepScheduler import StepScheduler
 from TrafficGenerator import *
+from VehicleRegistry import VehicleRegistry
 import libraries.traci as traci
 import libraries.sumolib as sumolib
+from libraries.traci.exceptions import FatalTraCIError, TraCIException
+from libraries.traci.replay import ReplayServer, readSession
 
 
 class Main:
 
-    def __init__(self):
+    # directories of local sumo installations, searched after SUMO_HOME and the PATH
+    sumo_bin_dirs = ["/usr/local/Cellar/sumo/1.3.1/bin",
+                     "C:/Users/Bosse/Documents/00_DTU/01_Master/01_First_Semester/02223_Model-Based_Systems_Engineering"
+                     "/sumo-1.3.1/bin"]
+    run_modes = ["headless", "gui", "stub", "replay"]
+
+    def __init__(self, run_mode="headless", cs_id=2, vehicle_appearance_probability=0.005, step_length=0.01,
+                 num_steps=100000, seed=None, scheduled_traffic=True, verbose=False):
+        # choose run mode:
+        #   headless: sumo without GUI, fastest for production runs
+        #   gui: sumo-gui
+        #   stub: in-process stand-in for sumo, no sumo installation needed
+        #   replay: serves a session recorded by an earlier run with the same settings and seed, see enable_replay
+        self.run_mode = run_mode
+        # sumo prints its step log and verbose output, otherwise --no-step-log
+        self.verbose = verbose
+        # per command TraCI statistics, printed when the connection is closed
+        self.profiling = False
+        self.profile_trace_file = None
+        # session file written by a recorded run and served in the replay run mode
+        self.record_file = None
+        self.replay_file = None
+        self.replay_server = None
         # init path vars
         self.sumoBinary = ""
         self.config_path = ""
@@ -16,12 +47,24 @@ class Main:
         # fill paths with local sumo installation
         self.locate_sumo_installation()
         # configure simulation parameters
-        self.num_steps = 100000
-        self.step_length = 0.01
+        self.num_steps = num_steps
+        self.step_length = step_length
+        # seed of sumo and the traffic generator, None for a random run
+        self.seed = seed
         # set sumo command
-        self.sumo_cmd = [self.sumoBinary, "-c", self.config_path, "--step-length", str(self.step_length), "--verbose"]
+        self.sumo_cmd = [self.sumoBinary, "-c", self.config_path, "--step-length", str(self.step_length)]
+        if self.verbose:
+            self.sumo_cmd.append("--verbose")
+        else:
+            self.sumo_cmd.append("--no-step-log")
+        if self.seed is not None:
+            self.sumo_cmd.extend(["--seed", str(self.seed)])
         # configure traffic density
-        self.vehicle_appearance_probability = 0.005
+        self.vehicle_appearance_probability = vehicle_appearance_probability
+        # ids and integer slots of the vehicles, allocated by the traffic generator and freed on arrival
+        self.vehicle_registry = VehicleRegistry()
+        # init cached per-step view of the simulation shared by all control strategies
+        self.simulation_state = SimulationState(self.vehicle_registry)
         # init control strategy
         self.control_strategy = None
         # choose control strategy by ID:
@@ -30,27 +73,33 @@ class Main:
         #   2: Traffic Light
         #   3: Grid
         #   4: None
-        self.select_cs(2)
-        # init traffic generator
-        self.traffic_generator = TrafficGenerator(self.vehicle_appearance_probability,
-                                                  getattr(self.control_strategy, 'routes'))
+        self.select_cs(cs_id)
+        # init traffic generator, the scheduled one draws all departures in advance and registers one vehicle type
+        if scheduled_traffic:
+            self.traffic_generator = ScheduledTrafficGenerator(self.vehicle_appearance_probability,
+                                                               getattr(self.control_strategy, 'routes'),
+                                                               self.num_steps, registry=self.vehicle_registry)
+        else:
+            self.traffic_generator = TrafficGenerator(self.vehicle_appearance_probability,
+                                                      getattr(self.control_strategy, 'routes'),
+                                                      registry=self.vehicle_registry)
 
     def locate_sumo_installation(self):
-        # replace with if-else statements to fit all users
-        path_a = "/usr/local/Cellar/sumo/1.3.1/bin/sumo-gui"
-        path_b = "C:/Users/Bosse/Documents/00_DTU/01_Master/01_First_Semester/02223_Model-Based_Systems_Engineering" \
-                 "/sumo-1.3.1/bin/sumo-gui.exe"
-        path_l = "/usr/local/Cellar/sumo/1.3.1/bin/sumo-gui"
-
-        if os.path.exists(path_a):
-            self.sumoBinary = path_a
-        elif os.path.exists(path_b):
-            self.sumoBinary = path_b
-        elif os.path.exists(path_l):
-            self.sumoBinary = path_l
-        else:
-            print("ERR: Could not find sumo gui")
+        if self.run_mode not in self.run_modes:
+            print("ERR: Invalid run mode " + self.run_mode + ". Exiting...")
             sys.exit()
+        if self.run_mode not in ("stub", "replay"):
+            binary_name = "sumo-gui" if self.run_mode == "gui" else "sumo"
+            # sumolib checks <NAME>_BINARY, the given directory and SUMO_HOME and otherwise returns the bare name,
+            # which is only accepted after all local directories, so the PATH is the last fallback
+            for bin_dir in self.sumo_bin_dirs + [None]:
+                binary = sumolib.checkBinary(binary_name, bin_dir)
+                if binary != binary_name or bin_dir is None and shutil.which(binary):
+                    self.sumoBinary = binary
+                    break
+            else:
+                print("ERR: Could not find " + binary_name + ". Set SUMO_HOME or use the stub run mode.")
+                sys.exit()
 
         rel_config_path = "networks/test.sumocfg"
         self.config_path = os.path.join(os.path.dirname(__file__), rel_config_path)
@@ -59,6 +108,19 @@ class Main:
         self.sumo_cmd.append("--full-output")
         self.sumo_cmd.append("tmp_log.xml")
 
+    def enable_profiling(self, trace_file=None):
+        # the trace file gets the timeline of all TraCI round trips in the Chrome trace format
+        self.profiling = True
+        self.profile_trace_file = trace_file
+
+    def enable_recording(self, session_file):
+        # the requests and responses of the run are written to the session file, a .gz file is compressed
+        self.record_file = session_file
+
+    def enable_replay(self, session_file):
+        # the recorded session answers instead of sumo, the run has to issue the same requests as the recorded one
+        self.replay_file = session_file
+
     def select_cs(self, idx):
         if idx == 0:
             self.control_strategy = ControlStrategy.FifoControl()
@@ -74,11 +136,15 @@ class Main:
         else:
             print("ERR: Invalid control strategy index. Exiting...")
             sys.exit()
+        self.control_strategy.set_simulation_state(self.simulation_state)
 
     def check_setup(self):
         if not self.control_strategy:
             print("ERR: Control strategy not configured. Exiting...")
             return False
+        elif self.run_mode == "replay" and self.replay_file is None:
+            print("ERR: No session file to replay. Exiting...")
+            return False
         elif not 100 <= self.num_steps <= 100000:
             print("ERR: Number of simulation steps is out of range [100, 100 000]. Exiting...")
             return False
@@ -90,21 +156,80 @@ class Main:
         else:
             return True
 
-    def run(self):
+    def server_cmd(self):
+        # program serving the simulation without its options, e.g. for a connection pool
+        if self.run_mode == "stub":
+            return [sys.executable, SumoStub.__file__]
+        return [self.sumoBinary]
+
+    def run(self, label="default", port=None, pool=None):
         if not self.check_setup():
             sys.exit()
 
-        traci.start(self.sumo_cmd)
-        for step in range(self.num_steps):
-            traci.simulationStep()
-            self.traffic_generator.generate_traffic_flow()
-            self.control_strategy.control(step)
+        if self.seed is not None:
+            random.seed(self.seed)
+        if pool is not None:
+            # a warm server of the pool loads the configuration instead of starting a new process
+            traci.attach(pool.acquire(self.sumo_cmd[1:]), label)
+        elif self.run_mode == "stub":
+            SumoStub.connect(self.sumo_cmd, label, self.record_file)
+        elif self.run_mode == "replay":
+            self.replay_server = ReplayServer(readSession(self.replay_file))
+            traci.init(self.replay_server.start(), label=label)
+        else:
+            # without a port traci picks a free one and retries with another one if sumo cannot bind it
+            traci.start(self.sumo_cmd, port=port, label=label, recordFile=self.record_file)
+        if self.profiling:
+            traci.enableProfiler(self.profile_trace_file)
+        start_time = time.time()
+        # traffic generator and control strategy are only called on steps with events
+        scheduler = StepScheduler(self.simulation_state, self.step_length)
+        try:
+            self.simulation_state.subscribe()
+            self.traffic_generator.register(scheduler)
+            self.control_strategy.register(scheduler)
+            scheduler.run(self.num_steps)
+        except (TraCIException, FatalTraCIError):
+            # the replay server answers the first request which differs from the session with an error and stops,
+            # a strategy which catches the error only sees the closed connection
+            if self.replay_server is not None and self.replay_server.mismatch is not None:
+                raise FatalTraCIError("Replay of %s diverged. %s" % (self.replay_file,
+                                                                    self.replay_server.mismatchDescription))
+            raise
+        self.idle_steps = scheduler.idle_steps
+        results = self.collect_results(time.time() - start_time, traci.getConnection(label).getRoundTrips())
+        if pool is not None:
+            pool.release(traci.detach())
+        else:
+            traci.close()
+        return results
+
+    def collect_results(self, wall_clock_time, round_trips):
+        travel_times = self.simulation_state.travel_times
+        return {"wall_clock_time": wall_clock_time,
+                "steps_per_second": self.num_steps / wall_clock_time,
+                "round_trips": round_trips,
+                "idle_steps": self.idle_steps,
+                "departed": len(self.simulation_state.departure_times) + len(travel_times),
+                "arrived": len(travel_times),
+                "mean_travel_time": sum(travel_times) / len(travel_times) if travel_times else 0.0}
+
+    def report(self, results):
+        print("Run mode: " + self.run_mode)
+        print("Wall-clock time: " + str(round(results["wall_clock_time"], 2)) + " s")
+        print("Steps/sec: " + str(round(results["steps_per_second"], 1)))
+        print("TraCI round trips: " + str(results["round_trips"]) + " (" +
+              str(round(results["round_trips"] / self.num_steps, 2)) + " per step)")
+        print("Idle steps: " + str(results["idle_steps"]) + "/" + str(self.num_steps))
+        print("Vehicles departed/arrived: " + str(results["departed"]) + "/" + str(results["arrived"]))
+        print("Mean travel time: " + str(round(results["mean_travel_time"], 2)) + " s")
 
 
-# instantiate object
-main = Main()
-# uncomment to get log file:
-# main.enable_log()
-# run the simulation
-main.run()
-traci.close()
+if __name__ == "__main__":
+    # instantiate object, the run mode can be given as first argument, --verbose turns on sumo's output
+    args = [arg for arg in sys.argv[1:] if arg != "--verbose"]
+    main = Main(args[0] if args else "headless", verbose="--verbose" in sys.argv)
+    # uncomment to get log file:
+    # main.enable_log()
+    # run the simulation
+    main.report(main.run())
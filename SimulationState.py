@@ -0,0 +1,101 @@
+import libraries.traci as traci
+import libraries.traci.constants as tc
+from VehicleRegistry import VehicleRegistry
+
+
+class SimulationState:
+    # variables every departed vehicle is subscribed to
+    vehicle_vars = [tc.VAR_POSITION, tc.VAR_ROAD_ID]
+    # variables which do not change after the departure, read once from the first subscription answer
+    departure_vars = [tc.VAR_ROUTE_ID]
+    simulation_vars = [tc.VAR_TIME, tc.VAR_DEPARTED_VEHICLES_IDS, tc.VAR_ARRIVED_VEHICLES_IDS,
+                       tc.VAR_MIN_EXPECTED_VEHICLES]
+
+    def __init__(self, registry=None):
+        self.time = 0.0
+        self.departed = ()
+        self.arrived = ()
+        # number of active and pending vehicles, None before the first update
+        self.min_expected = None
+        # active vehicle ids in order of departure
+        self.vehicle_ids = []
+        self.vehicles = {}
+        # departure times of the active vehicles and travel times of the arrived ones
+        self.departure_times = {}
+        self.travel_times = []
+        # departure variables of the active vehicles
+        self.departure_values = {}
+        # context subscriptions around the controlled junctions, updated with the rest of the view
+        self.junction_contexts = []
+        # dense integer slots of the active vehicles, shared with the traffic generator
+        self.registry = registry if registry is not None else VehicleRegistry()
+
+    def subscribe(self):
+        # call once after traci.start
+        traci.simulation.subscribe(self.simulation_vars)
+        self.junction_contexts = []
+
+    def add_junction_context(self, junction_context):
+        # call after subscribe, e.g. when a control strategy registers; the vehicles keep their own subscriptions,
+        # a context only carries the vehicles within its radius
+        junction_context.subscribe()
+        self.junction_contexts.append(junction_context)
+
+    def update(self):
+        # call once after every traci.simulationStep, refreshes the cached view without issuing getters
+        results = traci.simulation.getSubscriptionResults()
+        self.time = results[tc.VAR_TIME]
+        self.departed = results[tc.VAR_DEPARTED_VEHICLES_IDS]
+        self.arrived = results[tc.VAR_ARRIVED_VEHICLES_IDS]
+        self.min_expected = results[tc.VAR_MIN_EXPECTED_VEHICLES]
+
+        if self.departed:
+            # the new vehicles are subscribed with one message, the answers already carry their current values
+            with traci.batch():
+                subscribed = [traci.vehicle.subscribe(vehicle_id, self.vehicle_vars + self.departure_vars)
+                              for vehicle_id in self.departed]
+            for vehicle_id, result in zip(self.departed, subscribed):
+                # raises if sumo rejected the subscription
+                result.result()
+                values = traci.vehicle.getSubscriptionResults(vehicle_id)
+                self.departure_values[vehicle_id] = {var_id: values[var_id] for var_id in self.departure_vars}
+                self.registry.register(vehicle_id)
+                self.vehicle_ids.append(vehicle_id)
+                self.departure_times[vehicle_id] = self.time
+        if self.arrived:
+            for vehicle_id in self.arrived:
+                self.travel_times.append(self.time - self.departure_times.pop(vehicle_id))
+                self.departure_values.pop(vehicle_id)
+                self.registry.release(vehicle_id)
+            arrived = set(self.arrived)
+            self.vehicle_ids = [vehicle_id for vehicle_id in self.vehicle_ids if vehicle_id not in arrived]
+
+        self.vehicles = traci.vehicle.getAllSubscriptionResults()
+        for junction_context in self.junction_contexts:
+            junction_context.update()
+
+    def get_vehicle_ids(self):
+        return self.vehicle_ids
+
+    def get_value(self, vehicle_id, var_id):
+        # the variable from the vehicle's own subscription, a junction context around it or, for departure_vars,
+        # its departure; per step variables are never taken from an older step
+        values = self.vehicles.get(vehicle_id)
+        if values is not None and var_id in values:
+            return values[var_id]
+        for junction_context in self.junction_contexts:
+            values = junction_context.vehicles.get(vehicle_id)
+            if values is not None and var_id in values:
+                return values[var_id]
+        if var_id in self.departure_values.get(vehicle_id, ()):
+            return self.departure_values[vehicle_id][var_id]
+        raise KeyError("Vehicle '%s' has no subscribed variable %02x" % (vehicle_id, var_id))
+
+    def get_position(self, vehicle_id):
+        return self.get_value(vehicle_id, tc.VAR_POSITION)
+
+    def get_road_id(self, vehicle_id):
+        return self.get_value(vehicle_id, tc.VAR_ROAD_ID)
+
+    def get_route_id(self, vehicle_id):
+        return self.get_value(vehicle_id, tc.VAR_ROUTE_ID)
@@ -0,0 +1,81 @@
+import heapq
+import itertools
+import libraries.traci as traci
+
+
+class StepScheduler:
+    # drives the simulation and only calls back into python on steps with pending events:
+    #   timers: fire at a given step, e.g. phase boundaries or vehicle insertions
+    #   departure/arrival: fire on steps where vehicles departed/arrived
+    #   step callbacks: fire on every step, for strategies that did not register any events
+    # callbacks are called with the step index, at most once per step, timers first
+
+    def __init__(self, simulation_state, step_length):
+        self.simulation_state = simulation_state
+        self.step_length = step_length
+        self.timers = []
+        self.timer_counter = itertools.count()
+        self.departure_callbacks = []
+        self.arrival_callbacks = []
+        self.step_callbacks = []
+        # number of steps in which no python logic was run, either skipped or fast-forwarded
+        self.idle_steps = 0
+
+    def add_timer(self, step, callback, period=None):
+        heapq.heappush(self.timers, (step, next(self.timer_counter), callback, period))
+
+    def add_periodic_timer(self, period, callback, first_step=0):
+        # period in steps, the timer is rescheduled every time it fires
+        self.add_timer(first_step, callback, period)
+
+    def on_departure(self, callback):
+        self.departure_callbacks.append(callback)
+
+    def on_arrival(self, callback):
+        self.arrival_callbacks.append(callback)
+
+    def add_step_callback(self, callback):
+        self.step_callbacks.append(callback)
+
+    def next_timer_step(self, num_steps):
+        return min(self.timers[0][0], num_steps) if self.timers else num_steps
+
+    def run(self, num_steps):
+        step = 0
+        # callbacks may insert vehicles which are not yet counted in the subscribed number of expected vehicles
+        called_back = True
+        while step < num_steps:
+            next_step = self.next_timer_step(num_steps)
+            if next_step > step and not called_back and not self.step_callbacks and \
+                    self.simulation_state.min_expected == 0:
+                # no vehicle can depart, arrive or move before the next timer, jump to the step before it
+                self.idle_steps += next_step - step
+                step = next_step
+                if step == num_steps:
+                    traci.simulationStep(step * self.step_length)
+                    self.simulation_state.update()
+                    break
+                traci.simulationStep((step + 1) * self.step_length)
+            else:
+                traci.simulationStep()
+            self.simulation_state.update()
+
+            callbacks = []
+            while self.timers and self.timers[0][0] <= step:
+                timer_step, _, callback, period = heapq.heappop(self.timers)
+                if period is not None:
+                    self.add_timer(timer_step + period, callback, period)
+                callbacks.append(callback)
+            if self.simulation_state.departed:
+                callbacks.extend(self.departure_callbacks)
+            if self.simulation_state.arrived:
+                callbacks.extend(self.arrival_callbacks)
+            callbacks.extend(self.step_callbacks)
+
+            called_back = bool(callbacks)
+            if not called_back:
+                self.idle_steps += 1
+            # a callback registered for several events is only called once
+            for callback in dict.fromkeys(callbacks):
+                callback(step)
+            step += 1
@@ -0,0 +1,554 @@
+import json
+import os
+import struct
+import sys
+import threading
+import xml.etree.ElementTree as ET
+import libraries.traci as traci
+import libraries.traci.constants as tc
+import libraries.traci.transport as transport
+import libraries.sumolib as sumolib
+
+
+def pack_string(s):
+    data = s.encode("latin1")
+    return struct.pack("!i", len(data)) + data
+
+
+def pack_string_list(strings):
+    return struct.pack("!i", len(strings)) + b"".join([pack_string(s) for s in strings])
+
+
+def pack_command(cmd_id, body):
+    if len(body) + 2 <= 255:
+        return struct.pack("!BB", len(body) + 2, cmd_id) + body
+    return struct.pack("!BiB", 0, len(body) + 6, cmd_id) + body
+
+
+def pack_status(cmd_id, result=0x00, description=""):
+    return struct.pack("!BBB", 1 + 1 + 1 + 4 + len(description), cmd_id, result) + pack_string(description)
+
+
+class StubVehicle:
+    length = 4.5
+    min_gap = 2.5
+
+    def __init__(self, vehicle_id, route_id, edges, shape, edge_lengths, edge_ends, speed):
+        self.id = vehicle_id
+        self.route_id = route_id
+        self.edges = edges
+        self.shape = shape
+        self.edge_lengths = edge_lengths
+        # distance along the route at which each edge ends
+        self.edge_ends = edge_ends
+        self.max_speed = speed
+        self.speed = speed
+        self.distance = 0.0
+        # pending stops as [edge index, position on edge, duration], the first one is the next stop
+        self.stops = []
+        self.stopped_until = None
+
+    def edge_index(self):
+        for idx, end in enumerate(self.edge_ends):
+            if self.distance < end:
+                return idx
+        return len(self.edge_ends) - 1
+
+    def road_id(self):
+        idx = self.edge_index()
+        if idx > 0 and self.distance < self.edge_ends[idx - 1] + self.junction_length(idx):
+            # vehicle is on the junction between two edges
+            return ":" + self.edges[idx - 1] + "_" + self.edges[idx]
+        return self.edges[idx]
+
+    def junction_length(self, idx):
+        return self.edge_ends[idx] - self.edge_ends[idx - 1] - self.edge_lengths[idx]
+
+    def lane_position(self):
+        idx = self.edge_index()
+        return self.distance - (self.edge_ends[idx] - self.edge_lengths[idx])
+
+    def route_distance(self, edge_idx, pos):
+        return self.edge_ends[edge_idx] - self.edge_lengths[edge_idx] + pos
+
+    def position(self):
+        remaining = self.distance
+        for (x1, y1), (x2, y2) in zip(self.shape[:-1], self.shape[1:]):
+            segment = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+            if remaining <= segment and segment > 0:
+                return x1 + (x2 - x1) * remaining / segment, y1 + (y2 - y1) * remaining / segment
+            remaining -= segment
+        return self.shape[-1]
+
+
+class SumoStub:
+    """In-process stand-in for a sumo server. It moves vehicles with constant speed along the lanes of their
+    routes, keeps a minimum gap to the leader and honours stops. It speaks enough of the TraCI protocol to run
+    the control strategies without a sumo installation."""
+
+    def __init__(self, sumo_cmd):
+        self.configure(sumo_cmd)
+        self.requests = 0
+        self._socket = None
+
+    def configure(self, sumo_cmd):
+        # reads the options the stub understands from a sumo command line or the arguments of a load command
+        self.step_length = 1.0
+        config_path = None
+        state_path = None
+        for idx, arg in enumerate(sumo_cmd):
+            if arg == "-c":
+                config_path = sumo_cmd[idx + 1]
+            elif arg == "--step-length":
+                self.step_length = float(sumo_cmd[idx + 1])
+            elif arg == "--load-state":
+                state_path = sumo_cmd[idx + 1]
+        self.load_config(config_path)
+        self.reset()
+        if state_path is not None:
+            self.load_state(state_path)
+
+    def load_config(self, config_path):
+        config_dir = os.path.dirname(config_path)
+        inputs = ET.parse(config_path).getroot().find("input")
+        net_file = os.path.join(config_dir, inputs.find("net-file").attrib["value"])
+        route_file = os.path.join(config_dir, inputs.find("route-files").attrib["value"])
+        self.net = sumolib.net.readNet(net_file)
+        self.routes = {}
+        for route in ET.parse(route_file).getroot().iter("route"):
+            self.routes[route.attrib["id"]] = route.attrib["edges"].split()
+
+    def reset(self):
+        self.time = 0.0
+        self.vehicles = {}
+        # pending insertions as [vehicle id, route id, min gap]
+        self.pending = []
+        self.departed = []
+        self.arrived = []
+        self.subscriptions = {}
+        # context subscriptions as (cmd id, object id, domain) -> (radius, variables)
+        self.context_subscriptions = {}
+        # min gap of the known vehicle types
+        self.type_min_gaps = {"DEFAULT_VEHTYPE": StubVehicle.min_gap}
+
+    def save_state(self, state_path):
+        # the stub writes its own json format instead of a sumo state file
+        vehicles = [{"id": vehicle.id, "route": vehicle.route_id, "min_gap": vehicle.min_gap,
+                     "distance": vehicle.distance, "speed": vehicle.speed, "stops": vehicle.stops,
+                     "stopped_until": vehicle.stopped_until} for vehicle in self.vehicles.values()]
+        with open(state_path, "w") as state_file:
+            json.dump({"time": self.time, "vehicles": vehicles, "pending": self.pending,
+                       "type_min_gaps": self.type_min_gaps}, state_file)
+
+    def load_state(self, state_path):
+        with open(state_path) as state_file:
+            state = json.load(state_file)
+        self.time = state["time"]
+        self.pending = state["pending"]
+        self.type_min_gaps = state["type_min_gaps"]
+        for saved in state["vehicles"]:
+            self.insert_vehicle(saved["id"], saved["route"], saved["min_gap"])
+            vehicle = self.vehicles[saved["id"]]
+            vehicle.distance = saved["distance"]
+            vehicle.speed = saved["speed"]
+            vehicle.stops = saved["stops"]
+            vehicle.stopped_until = saved["stopped_until"]
+        # restored vehicles did not depart in this simulation
+        self.departed = []
+
+    def listen(self, port=0, host="localhost"):
+        # the host may also name a unix socket or shared memory transport, see libraries/traci/transport.py
+        self._socket = transport.createListener(host, port)
+        address = self._socket.getsockname()
+        return address[1] if isinstance(address, tuple) else address
+
+    def start(self, host="localhost"):
+        address = self.listen(0, host)
+        thread = threading.Thread(target=self.serve)
+        thread.daemon = True
+        thread.start()
+        return address
+
+    def serve(self):
+        conn = transport.accept(self._socket)
+        running = True
+        while running:
+            header = self.receive(conn, 4)
+            if header is None:
+                break
+            data = self.receive(conn, struct.unpack("!i", header)[0] - 4)
+            if data is None:
+                break
+            response, running = self.handle_message(data)
+            conn.sendall(struct.pack("!i", len(response) + 4) + response)
+            self.requests += 1
+        conn.close()
+        self._socket.close()
+
+    def receive(self, conn, size):
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def handle_message(self, data):
+        pos = 0
+        response = b""
+        running = True
+        while pos < len(data):
+            length = data[pos]
+            header = 1
+            if length == 0:
+                length = struct.unpack_from("!i", data, pos + 1)[0]
+                header = 5
+            cmd_id = data[pos + header]
+            content = data[pos + header + 1:pos + length]
+            pos += length
+            if cmd_id == tc.CMD_CLOSE:
+                running = False
+            response += self.handle_command(cmd_id, content)
+        return response, running
+
+    def handle_command(self, cmd_id, content):
+        if cmd_id == tc.CMD_GETVERSION:
+            return pack_status(cmd_id) + pack_command(cmd_id, struct.pack("!i", 20) + pack_string("SUMO stub"))
+        elif cmd_id == tc.CMD_SIMSTEP:
+            self.step(struct.unpack("!d", content)[0])
+            results = self.subscription_results()
+            return pack_status(cmd_id) + struct.pack("!i", len(results)) + b"".join(results)
+        elif cmd_id == tc.CMD_LOAD:
+            self.configure(self.read_string_list(content))
+            return pack_status(cmd_id)
+        elif cmd_id in (tc.CMD_CLOSE, tc.CMD_SETORDER):
+            return pack_status(cmd_id)
+        elif tc.CMD_GET_INDUCTIONLOOP_VARIABLE <= cmd_id <= tc.CMD_GET_PERSON_VARIABLE:
+            var_id, obj_id, _ = self.read_object(content)
+            try:
+                value = self.get_value(cmd_id, var_id, obj_id)
+            except (LookupError, NotImplementedError) as e:
+                return pack_status(cmd_id, 0xFF, str(e))
+            return pack_status(cmd_id) + pack_command(cmd_id + 0x10,
+                                                      struct.pack("!B", var_id) + pack_string(obj_id) + value)
+        elif tc.CMD_SET_TL_VARIABLE <= cmd_id <= tc.CMD_SET_PERSON_VARIABLE:
+            var_id, obj_id, pos = self.read_object(content)
+            error = self.set_value(cmd_id, var_id, obj_id, content, pos)
+            if error:
+                return pack_status(cmd_id, 0xFF, error)
+            return pack_status(cmd_id)
+        elif tc.CMD_SUBSCRIBE_INDUCTIONLOOP_VARIABLE <= cmd_id <= tc.CMD_SUBSCRIBE_PERSON_VARIABLE:
+            return self.subscribe(cmd_id, content)
+        elif tc.CMD_SUBSCRIBE_INDUCTIONLOOP_CONTEXT <= cmd_id <= tc.CMD_SUBSCRIBE_PERSON_CONTEXT:
+            return self.subscribe_context(cmd_id, content)
+        return pack_status(cmd_id, 0x01, "Command %02x is not implemented by the stub." % cmd_id)
+
+    def read_string_list(self, content, pos=0):
+        strings = []
+        for _ in range(struct.unpack_from("!xi", content, pos)[0]):
+            length = struct.unpack_from("!i", content, pos + 5)[0]
+            strings.append(content[pos + 9:pos + 9 + length].decode("latin1"))
+            pos += 4 + length
+        return strings
+
+    def read_object(self, content):
+        var_id = content[0]
+        length = struct.unpack_from("!i", content, 1)[0]
+        return var_id, content[5:5 + length].decode("latin1"), 5 + length
+
+    def step(self, target_time):
+        end_time = max(target_time, self.time + self.step_length)
+        self.departed = []
+        self.arrived = []
+        while self.time + 1e-9 < end_time:
+            self.time = round(self.time + self.step_length, 6)
+            self.move_vehicles()
+            for vehicle_id, route_id, min_gap in self.pending:
+                self.insert_vehicle(vehicle_id, route_id, min_gap)
+            self.pending = []
+
+    def insert_vehicle(self, vehicle_id, route_id, min_gap):
+        edges = self.routes[route_id]
+        shape = []
+        edge_ends = []
+        edge_lengths = []
+        distance = 0.0
+        for edge_id in edges:
+            lane = self.net.getEdge(edge_id).getLanes()[0]
+            lane_shape = lane.getShape()
+            if shape:
+                # distance across the junction
+                distance += sumolib.geomhelper.distance(shape[-1], lane_shape[0])
+            shape.extend(lane_shape)
+            distance += lane.getLength()
+            edge_ends.append(distance)
+            edge_lengths.append(lane.getLength())
+        speed = self.net.getEdge(edges[0]).getSpeed()
+        self.vehicles[vehicle_id] = StubVehicle(vehicle_id, route_id, edges, shape, edge_lengths, edge_ends, speed)
+        self.vehicles[vehicle_id].min_gap = min_gap
+        self.departed.append(vehicle_id)
+
+    def move_vehicles(self):
+        by_road = {}
+        for vehicle in self.vehicles.values():
+            by_road.setdefault(vehicle.road_id(), []).append(vehicle)
+        for vehicle in self.vehicles.values():
+            if vehicle.stopped_until is not None:
+                if self.time < vehicle.stopped_until:
+                    continue
+                vehicle.stopped_until = None
+            target = vehicle.distance + vehicle.max_speed * self.step_length
+            if vehicle.stops:
+                edge_idx, pos, duration = vehicle.stops[0]
+                stop_distance = vehicle.route_distance(edge_idx, pos)
+                if target >= stop_distance:
+                    target = stop_distance
+                    vehicle.stops.pop(0)
+                    vehicle.stopped_until = self.time + duration
+            # keep the minimum gap to the leaders on the same road, using their positions of the last step
+            lane_position = vehicle.lane_position()
+            for leader in by_road[vehicle.road_id()]:
+                gap = leader.lane_position() - lane_position
+                if gap > 0:
+                    target = min(target, vehicle.distance + gap - leader.length - vehicle.min_gap)
+            target = max(target, vehicle.distance)
+            vehicle.speed = (target - vehicle.distance) / self.step_length
+            vehicle.distance = target
+        for vehicle_id in list(self.vehicles):
+            vehicle = self.vehicles[vehicle_id]
+            if vehicle.distance >= vehicle.edge_ends[-1]:
+                del self.vehicles[vehicle_id]
+                self.arrived.append(vehicle_id)
+
+    def get_value(self, cmd_id, var_id, obj_id):
+        if cmd_id == tc.CMD_GET_SIM_VARIABLE:
+            if var_id == tc.VAR_TIME:
+                return struct.pack("!Bd", tc.TYPE_DOUBLE, self.time)
+            elif var_id == tc.VAR_DELTA_T:
+                return struct.pack("!Bd", tc.TYPE_DOUBLE, self.step_length)
+            elif var_id == tc.VAR_DEPARTED_VEHICLES_IDS:
+                return struct.pack("!B", tc.TYPE_STRINGLIST) + pack_string_list(self.departed)
+            elif var_id == tc.VAR_ARRIVED_VEHICLES_IDS:
+                return struct.pack("!B", tc.TYPE_STRINGLIST) + pack_string_list(self.arrived)
+            elif var_id == tc.VAR_MIN_EXPECTED_VEHICLES:
+                return struct.pack("!Bi", tc.TYPE_INTEGER, len(self.vehicles) + len(self.pending))
+        elif cmd_id == tc.CMD_GET_VEHICLE_VARIABLE:
+            if var_id == tc.TRACI_ID_LIST:
+                return struct.pack("!B", tc.TYPE_STRINGLIST) + pack_string_list(list(self.vehicles))
+            elif var_id == tc.ID_COUNT:
+                return struct.pack("!Bi", tc.TYPE_INTEGER, len(self.vehicles))
+            if obj_id not in self.vehicles:
+                raise LookupError("Vehicle '%s' is not known" % obj_id)
+            vehicle = self.vehicles[obj_id]
+            if var_id == tc.VAR_POSITION:
+                return struct.pack("!Bdd", tc.POSITION_2D, *vehicle.position())
+            elif var_id == tc.VAR_ROAD_ID:
+                return struct.pack("!B", tc.TYPE_STRING) + pack_string(vehicle.road_id())
+            elif var_id == tc.VAR_LANE_ID:
+                return struct.pack("!B", tc.TYPE_STRING) + pack_string(vehicle.road_id() + "_0")
+            elif var_id == tc.VAR_ROUTE_ID:
+                return struct.pack("!B", tc.TYPE_STRING) + pack_string(vehicle.route_id)
+            elif var_id == tc.VAR_SPEED:
+                return struct.pack("!Bd", tc.TYPE_DOUBLE, vehicle.speed)
+            elif var_id == tc.VAR_LANEPOSITION:
+                return struct.pack("!Bd", tc.TYPE_DOUBLE, vehicle.lane_position())
+            elif var_id == tc.VAR_LANE_INDEX:
+                return struct.pack("!Bi", tc.TYPE_INTEGER, 0)
+        elif cmd_id == tc.CMD_GET_ROUTE_VARIABLE:
+            if var_id == tc.TRACI_ID_LIST:
+                return struct.pack("!B", tc.TYPE_STRINGLIST) + pack_string_list(list(self.routes))
+            elif var_id == tc.VAR_EDGES:
+                return struct.pack("!B", tc.TYPE_STRINGLIST) + pack_string_list(self.routes[obj_id])
+        elif cmd_id == tc.CMD_GET_LANE_VARIABLE:
+            if var_id == tc.TRACI_ID_LIST:
+                lane_ids = [lane.getID() for edge in self.net.getEdges() for lane in edge.getLanes()]
+                return struct.pack("!B", tc.TYPE_STRINGLIST) + pack_string_list(lane_ids)
+            lane = self.net.getLane(obj_id)
+            if var_id == tc.VAR_LENGTH:
+                return struct.pack("!Bd", tc.TYPE_DOUBLE, lane.getLength())
+            elif var_id == tc.VAR_SHAPE:
+                shape = lane.getShape()
+                return struct.pack("!BB", tc.TYPE_POLYGON, len(shape)) + b"".join(
+                    struct.pack("!dd", x, y) for x, y in shape)
+        elif cmd_id == tc.CMD_GET_JUNCTION_VARIABLE:
+            if var_id == tc.TRACI_ID_LIST:
+                return struct.pack("!B", tc.TYPE_STRINGLIST) + pack_string_list([node.getID() for node in
+                                                                                 self.net.getNodes()])
+            elif var_id == tc.VAR_POSITION:
+                return struct.pack("!Bdd", tc.POSITION_2D, *self.junction_position(obj_id))
+        elif var_id == tc.TRACI_ID_LIST:
+            return struct.pack("!B", tc.TYPE_STRINGLIST) + pack_string_list([])
+        raise NotImplementedError("Variable %02x of domain %02x is not implemented by the stub." % (var_id, cmd_id))
+
+    def junction_position(self, junction_id):
+        if not self.net.hasNode(junction_id):
+            raise LookupError("Junction '%s' is not known" % junction_id)
+        return tuple(self.net.getNode(junction_id).getCoord()[:2])
+
+    def set_value(self, cmd_id, var_id, obj_id, content, pos):
+        if cmd_id == tc.CMD_SET_SIM_VARIABLE and var_id == tc.CMD_SAVE_SIMSTATE:
+            length = struct.unpack_from("!xi", content, pos)[0]
+            try:
+                self.save_state(content[pos + 5:pos + 5 + length].decode("latin1"))
+            except IOError as e:
+                return str(e)
+            return None
+        if cmd_id == tc.CMD_SET_VEHICLETYPE_VARIABLE:
+            return self.set_type_value(var_id, obj_id, content, pos)
+        if cmd_id != tc.CMD_SET_VEHICLE_VARIABLE:
+            return None
+        if var_id == tc.ADD_FULL:
+            # the route id and the type id are the first strings of the compound
+            length = struct.unpack_from("!i", content, pos + 6)[0]
+            route_id = content[pos + 10:pos + 10 + length].decode("latin1")
+            type_length = struct.unpack_from("!i", content, pos + 11 + length)[0]
+            type_id = content[pos + 15 + length:pos + 15 + length + type_length].decode("latin1")
+            if route_id not in self.routes:
+                return "Invalid route '%s' for vehicle '%s'." % (route_id, obj_id)
+            if type_id not in self.type_min_gaps:
+                return "Invalid type '%s' for vehicle '%s'." % (type_id, obj_id)
+            self.pending.append([obj_id, route_id, self.type_min_gaps[type_id]])
+            return None
+        if obj_id not in self.vehicles:
+            for pending in self.pending:
+                if pending[0] == obj_id:
+                    if var_id == tc.VAR_MINGAP:
+                        pending[2] = struct.unpack_from("!xd", content, pos)[0]
+                    return None
+            return "Vehicle '%s' is not known" % obj_id
+        vehicle = self.vehicles[obj_id]
+        if var_id == tc.CMD_STOP:
+            length = struct.unpack_from("!i", content, pos + 6)[0]
+            edge_id = content[pos + 10:pos + 10 + length].decode("latin1")
+            stop_pos, _, duration = struct.unpack_from("!xdxBxd", content, pos + 10 + length)
+            if edge_id not in vehicle.edges:
+                return "Stop edge '%s' is not on the route of vehicle '%s'." % (edge_id, obj_id)
+            edge_idx = vehicle.edges.index(edge_id)
+            if vehicle.route_distance(edge_idx, stop_pos) < vehicle.distance:
+                return "Stop for vehicle '%s' on lane '%s_0' is too close to break." % (obj_id, edge_id)
+            vehicle.stops = [[edge_idx, stop_pos, duration]]
+        elif var_id == tc.VAR_MINGAP:
+            vehicle.min_gap = struct.unpack_from("!xd", content, pos)[0]
+        return None
+
+    def set_type_value(self, var_id, type_id, content, pos):
+        if var_id == tc.COPY:
+            length = struct.unpack_from("!xi", content, pos)[0]
+            new_type_id = content[pos + 5:pos + 5 + length].decode("latin1")
+            if type_id not in self.type_min_gaps:
+                return "Vehicle type '%s' is not known" % type_id
+            self.type_min_gaps[new_type_id] = self.type_min_gaps[type_id]
+        elif type_id not in self.type_min_gaps:
+            return "Vehicle type '%s' is not known" % type_id
+        elif var_id == tc.VAR_MINGAP:
+            self.type_min_gaps[type_id] = struct.unpack_from("!xd", content, pos)[0]
+        return None
+
+    def subscribe(self, cmd_id, content):
+        end = struct.unpack_from("!d", content, 8)[0]
+        length = struct.unpack_from("!i", content, 16)[0]
+        obj_id = content[20:20 + length].decode("latin1")
+        num_vars = content[20 + length]
+        var_ids = list(content[21 + length:21 + length + num_vars])
+        response = pack_status(cmd_id)
+        if not var_ids:
+            self.subscriptions.pop((cmd_id, obj_id), None)
+            return response
+        result = self.subscription_result(cmd_id, obj_id, var_ids)
+        if result is None:
+            self.subscriptions.pop((cmd_id, obj_id), None)
+            return pack_status(cmd_id, 0xFF, "Object '%s' is not known" % obj_id)
+        if end != tc.INVALID_DOUBLE_VALUE and end <= self.time:
+            # the subscription ends with this answer
+            self.subscriptions.pop((cmd_id, obj_id), None)
+        else:
+            self.subscriptions[(cmd_id, obj_id)] = var_ids
+        return response + result
+
+    def subscription_result(self, cmd_id, obj_id, var_ids):
+        body = pack_string(obj_id) + struct.pack("!B", len(var_ids))
+        for var_id in var_ids:
+            try:
+                body += struct.pack("!BB", var_id, 0x00) + self.get_value(cmd_id - 0x30, var_id, obj_id)
+            except LookupError:
+                return None
+            except NotImplementedError as e:
+                body += struct.pack("!BBB", var_id, 0xFF, tc.TYPE_STRING) + pack_string(str(e))
+        return pack_command(cmd_id + 0x10, body)
+
+    def subscribe_context(self, cmd_id, content):
+        length = struct.unpack_from("!i", content, 16)[0]
+        obj_id = content[20:20 + length].decode("latin1")
+        domain, radius, num_vars = struct.unpack_from("!BdB", content, 20 + length)
+        var_ids = list(content[30 + length:30 + length + num_vars])
+        if not var_ids:
+            self.context_subscriptions.pop((cmd_id, obj_id, domain), None)
+            return pack_status(cmd_id)
+        result = self.context_subscription_result(cmd_id, obj_id, domain, radius, var_ids)
+        if result is None:
+            return pack_status(cmd_id, 0xFF, "Object '%s' is not known" % obj_id)
+        self.context_subscriptions[(cmd_id, obj_id, domain)] = (radius, var_ids)
+        return pack_status(cmd_id) + result
+
+    def context_subscription_result(self, cmd_id, obj_id, domain, radius, var_ids):
+        # only junctions and vehicles can be the center and only vehicles are found around it
+        try:
+            if cmd_id == tc.CMD_SUBSCRIBE_JUNCTION_CONTEXT:
+                x, y = self.junction_position(obj_id)
+            elif cmd_id == tc.CMD_SUBSCRIBE_VEHICLE_CONTEXT and obj_id in self.vehicles:
+                x, y = self.vehicles[obj_id].position()
+            else:
+                return None
+        except LookupError:
+            return None
+        objects = []
+        if domain == tc.CMD_GET_VEHICLE_VARIABLE:
+            for vehicle in self.vehicles.values():
+                vx, vy = vehicle.position()
+                if ((vx - x) ** 2 + (vy - y) ** 2) ** 0.5 <= radius:
+                    objects.append(vehicle.id)
+        body = pack_string(obj_id) + struct.pack("!BBi", domain, len(var_ids), len(objects))
+        for object_id in objects:
+            body += pack_string(object_id)
+            for var_id in var_ids:
+                try:
+                    body += struct.pack("!BB", var_id, 0x00) + self.get_value(domain, var_id, object_id)
+                except NotImplementedError as e:
+                    body += struct.pack("!BBB", var_id, 0xFF, tc.TYPE_STRING) + pack_string(str(e))
+        return pack_command(cmd_id + 0x10, body)
+
+    def subscription_results(self):
+        results = []
+        for (cmd_id, obj_id), var_ids in list(self.subscriptions.items()):
+            result = self.subscription_result(cmd_id, obj_id, var_ids)
+            if result is None:
+                # the object left the simulation, sumo drops its subscription
+                del self.subscriptions[(cmd_id, obj_id)]
+            else:
+                results.append(result)
+        for (cmd_id, obj_id, domain), (radius, var_ids) in list(self.context_subscriptions.items()):
+            result = self.context_subscription_result(cmd_id, obj_id, domain, radius, var_ids)
+            if result is None:
+                del self.context_subscriptions[(cmd_id, obj_id, domain)]
+            else:
+                results.append(result)
+        return results
+
+
+def connect(sumo_cmd, label="default", record_file=None):
+    # starts a stub server for the given sumo command and connects traci to it, optionally recording the session
+    stub = SumoStub(sumo_cmd)
+    traci.init(stub.start(), label=label, recordFile=record_file)
+    return stub
+
+
+if __name__ == "__main__":
+    # serves one simulation like a sumo process, e.g. for a connection pool:
+    #   python SumoStub.py -c networks/test.sumocfg --remote-port 8813
+    # the stub also serves other transports with --remote-host unix:/tmp/stub.sock or shm:/tmp/stub.shm
+    args = sys.argv[1:]
+    stub = SumoStub(args)
+    stub.listen(int(args[args.index("--remote-port") + 1]) if "--remote-port" in args else 8813,
+                args[args.index("--remote-host") + 1] if "--remote-host" in args else "localhost")
+    stub.serve()
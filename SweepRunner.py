@@ -0,0 +1,82 @@
+import sys
+import itertools
+import multiprocessing
+from Main import Main
+import libraries.traci as traci
+from libraries.traci.pool import ConnectionPool
+from libraries.sumolib.scenario.runsdb import RunsDB
+
+# sumo process of the worker, kept running between the runs of the worker
+worker_pool = None
+
+
+def run_configuration(configuration):
+    # runs in a worker process, every run gets its own connection label and loads into the warm sumo of the worker
+    global worker_pool
+    main = Main(configuration["run_mode"], configuration["cs_id"], configuration["vehicle_appearance_probability"],
+                configuration["step_length"], configuration["num_steps"], configuration["seed"])
+    if worker_pool is None:
+        worker_pool = ConnectionPool(main.server_cmd(), maxSize=1)
+    try:
+        results = main.run(configuration["label"], pool=worker_pool)
+    except (traci.TraCIException, traci.FatalTraCIError) as e:
+        print("ERR: Run " + configuration["label"] + " failed: " + str(e))
+        if configuration["label"] in traci.main._connections:
+            worker_pool.discard(traci.detach())
+        results = {}
+    return configuration, results
+
+
+class SweepRunner:
+
+    def __init__(self, run_mode="headless", num_steps=10000, db_name="sweep.db", processes=None):
+        self.run_mode = run_mode
+        self.num_steps = num_steps
+        self.db_name = db_name
+        # number of worker processes, None uses all cores
+        self.processes = processes
+        # swept parameters, every combination is run once
+        #   0: FIFO, 1: RHP, 2: Traffic Light, 3: Grid, 4: None
+        self.cs_ids = [0, 1, 2, 3, 4]
+        self.vehicle_appearance_probabilities = [0.002, 0.005, 0.01]
+        self.step_lengths = [0.01]
+        self.seeds = [1, 2, 3]
+
+    def configurations(self):
+        configurations = []
+        for cs_id, vehicle_appearance_probability, step_length, seed in itertools.product(
+                self.cs_ids, self.vehicle_appearance_probabilities, self.step_lengths, self.seeds):
+            configuration = {"run_mode": self.run_mode,
+                             "cs_id": cs_id,
+                             "vehicle_appearance_probability": vehicle_appearance_probability,
+                             "step_length": step_length,
+                             "num_steps": self.num_steps,
+                             "seed": seed,
+                             "label": "sweep_" + str(len(configurations))}
+            # skip combinations Main would refuse to run
+            main = Main(self.run_mode, cs_id, vehicle_appearance_probability, step_length, self.num_steps, seed)
+            if main.check_setup():
+                configurations.append(configuration)
+        return configurations
+
+    def run(self):
+        configurations = self.configurations()
+        db = RunsDB()
+        db.buildDB(self.db_name)
+        pool = multiprocessing.Pool(self.processes)
+        # results are written as soon as a run finishes, in order of completion
+        for configuration, results in pool.imap_unordered(run_configuration, configurations):
+            run_id = db.addRun(self.run_mode, configuration)
+            db.addResults([(run_id, 0, key, value) for key, value in results.items()])
+            print("Finished " + configuration["label"] + " (" + str(run_id + 1) + "/" + str(len(configurations)) +
+                  ")")
+        pool.close()
+        pool.join()
+        db.conn.close()
+
+
+if __name__ == "__main__":
+    # the run mode can be given as first argument and the number of steps per run as second argument
+    sweep_runner = SweepRunner(sys.argv[1] if len(sys.argv) > 1 else "headless",
+                               int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
+    sweep_runner.run()
@@ -1,11 +1,14 @@
 import random
 import math
+import numpy as np
 import libraries.traci as traci
+from VehicleRegistry import VehicleRegistry
 
 
 class TrafficGenerator:
-    def __init__(self, vap=0.0, routes=[], tau=0.0, speed_mode=7, imperfection=0.0, min_gap=2.0):
-        self.current_id = 0
+    def __init__(self, vap=0.0, routes=[], tau=0.0, speed_mode=7, imperfection=0.0, min_gap=2.0, registry=None):
+        # allocates the ids of the inserted vehicles, shared with the simulation state which frees them on arrival
+        self.registry = registry if registry is not None else VehicleRegistry()
         self.routes = routes
 
         self.vehicle_appearance_probability = vap
@@ -14,15 +17,88 @@ class TrafficGenerator:
         self.imperfection = imperfection
         self.min_gap = min_gap
 
-    def generate_traffic_flow(self):
-        # vehicle generator based on routes and probability
-        if random.random() < self.vehicle_appearance_probability:
-            route_id = self.routes[math.floor(random.random() * len(self.routes))]
-            vehicle_id = "000000" + str(self.current_id)
-            self.current_id = self.current_id + 1
-            vehicle_id = vehicle_id[-6:]
-            traci.vehicle.add(vehicle_id, route_id)
-            traci.vehicle.setMinGap(vehicle_id, self.min_gap)
-            traci.vehicle.setSpeedMode(vehicle_id, self.sm)
-            traci.vehicle.setTau(vehicle_id, self.tau)
-            traci.vehicle.setImperfection(vehicle_id, self.imperfection)
+    def register(self, scheduler):
+        # instead of a random draw every step the step of the next insertion is drawn in advance
+        self.scheduler = scheduler
+        self.schedule_insertion(0)
+
+    def schedule_insertion(self, step):
+        if self.vehicle_appearance_probability <= 0.0:
+            return
+        elif self.vehicle_appearance_probability >= 1.0:
+            delay = 0
+        else:
+            # number of failed per-step draws before the next insertion, geometrically distributed
+            delay = int(math.log(1.0 - random.random()) / math.log(1.0 - self.vehicle_appearance_probability))
+        self.scheduler.add_timer(step + delay, self.on_insertion)
+
+    def on_insertion(self, step):
+        self.insert_vehicle()
+        self.schedule_insertion(step + 1)
+
+    def insert_vehicle(self):
+        route_id = self.routes[math.floor(random.random() * len(self.routes))]
+        vehicle_id = self.registry.allocate()
+        # send the insertion and its setters as a single message
+        try:
+            with traci.batch():
+                traci.vehicle.add(vehicle_id, route_id)
+                traci.vehicle.setMinGap(vehicle_id, self.min_gap)
+                traci.vehicle.setSpeedMode(vehicle_id, self.sm)
+                traci.vehicle.setTau(vehicle_id, self.tau)
+                traci.vehicle.setImperfection(vehicle_id, self.imperfection)
+        except Exception:
+            # a rejected insertion must not keep its slot, a vehicle inserted anyway is registered on its departure
+            self.registry.release(vehicle_id)
+            raise
+
+
+class ScheduledTrafficGenerator(TrafficGenerator):
+    # draws all departures of a run in advance, at most one per step, and inserts each vehicle with a single message
+    def __init__(self, vap=0.0, routes=[], num_steps=0, tau=0.0, speed_mode=7, imperfection=0.0, min_gap=2.0,
+                 type_id="generated", registry=None):
+        TrafficGenerator.__init__(self, vap, routes, tau, speed_mode, imperfection, min_gap, registry)
+        self.num_steps = num_steps
+        self.type_id = type_id
+        self.departure_steps = np.empty(0, dtype=np.int64)
+        self.departure_routes = np.empty(0, dtype=np.int64)
+        self.next_departure = 0
+
+    def precompute_schedule(self):
+        # one bernoulli draw per step, seeded from the seeded python generator
+        rng = np.random.RandomState(random.getrandbits(32))
+        self.departure_steps = np.flatnonzero(rng.random_sample(self.num_steps) < self.vehicle_appearance_probability)
+        self.departure_routes = rng.randint(len(self.routes), size=len(self.departure_steps))
+        self.next_departure = 0
+
+    def register_vehicle_type(self):
+        # vehicle type parameters are set once instead of per vehicle, the speed mode only exists per vehicle
+        with traci.batch():
+            traci.vehicletype.copy("DEFAULT_VEHTYPE", self.type_id)
+            traci.vehicletype.setMinGap(self.type_id, self.min_gap)
+            traci.vehicletype.setTau(self.type_id, self.tau)
+            traci.vehicletype.setImperfection(self.type_id, self.imperfection)
+
+    def register(self, scheduler):
+        self.scheduler = scheduler
+        self.register_vehicle_type()
+        self.precompute_schedule()
+        self.schedule_next_departure()
+
+    def schedule_next_departure(self):
+        if self.next_departure < len(self.departure_steps):
+            self.scheduler.add_timer(int(self.departure_steps[self.next_departure]), self.on_departure_step)
+
+    def on_departure_step(self, step):
+        # the insertion and the speed mode go in one message
+        route_id = self.routes[self.departure_routes[self.next_departure]]
+        vehicle_id = self.registry.allocate()
+        try:
+            with traci.batch():
+                traci.vehicle.add(vehicle_id, route_id, self.type_id)
+                traci.vehicle.setSpeedMode(vehicle_id, self.sm)
+        except Exception:
+            self.registry.release(vehicle_id)
+            raise
+        self.next_departure = self.next_departure + 1
+        self.schedule_next_departure()
@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def closest_per_approach(positions, approach_indices, num_approaches, min_distance=0.0, max_distance=np.inf):
+    # positions: (n, 2) array of vehicle positions relative to the intersection center
+    # approach_indices: (n,) array with the approach of every vehicle, -1 for vehicles on no approach
+    # returns for every approach the index of the closest vehicle with min_distance < distance < max_distance,
+    # -1 if there is none, and the distances of those vehicles
+    if len(positions) == 0:
+        return np.full(num_approaches, -1, dtype=np.intp), np.full(num_approaches, np.inf)
+    distances = np.hypot(positions[:, 0], positions[:, 1])
+    in_band = (distances > min_distance) & (distances < max_distance)
+    on_approach = approach_indices == np.arange(num_approaches)[:, None]
+    # one row per approach, vehicles outside the band or on another approach are masked with inf
+    masked = np.where(on_approach & in_band, distances, np.inf)
+    closest = masked.argmin(axis=1)
+    closest_distances = masked[np.arange(num_approaches), closest]
+    closest[np.isinf(closest_distances)] = -1
+    return closest, closest_distances
+
+
+def queues_per_approach(positions, approach_indices, num_approaches, min_distance=0.0, max_distance=np.inf):
+    # same arguments as closest_per_approach, returns for every approach the indices of its vehicles with
+    # min_distance < distance < max_distance ordered by distance, vehicles at the same distance in input order,
+    # and the distances of all vehicles
+    distances = np.hypot(positions[:, 0], positions[:, 1]) if len(positions) else np.empty(0)
+    members = np.flatnonzero((approach_indices >= 0) & (distances > min_distance) & (distances < max_distance))
+    # lexsort is stable, the last key is the primary one
+    members = members[np.lexsort((distances[members], approach_indices[members]))]
+    bounds = np.searchsorted(approach_indices[members], np.arange(num_approaches + 1))
+    return [members[bounds[idx]:bounds[idx + 1]] for idx in range(num_approaches)], distances
@@ -0,0 +1,90 @@
+import numpy as np
+from libraries.traci.storage import internString
+
+
+class SequentialIdAllocator:
+    # zero padded running numbers "000000", "000001", ..., wider ids after 999999 instead of wrapping around
+    def __init__(self, width=6, prefix="", first=0):
+        self.format = prefix + "%0" + str(width) + "d"
+        self.next_number = first
+
+    def next_id(self):
+        vehicle_id = self.format % self.next_number
+        self.next_number = self.next_number + 1
+        return vehicle_id
+
+
+class VehicleRegistry:
+    # maps the ids of the live vehicles to dense integer slots, which can index arrays of per vehicle values,
+    # slots of arrived vehicles are reused, so the slots stay below the maximum number of live vehicles.
+    # the ids are interned with the traci string table, decoding them from a response returns the same objects
+    def __init__(self, allocator=None):
+        self.allocator = allocator if allocator is not None else SequentialIdAllocator()
+        self.slots = {}
+        # vehicle id per slot, None for free slots
+        self.ids = []
+        self.free_slots = []
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, vehicle_id):
+        return vehicle_id in self.slots
+
+    def allocate(self):
+        # id for a new vehicle, registered before its insertion
+        slots = self.slots
+        next_id = self.allocator.next_id
+        vehicle_id = next_id()
+        while vehicle_id in slots:
+            vehicle_id = next_id()
+        # the id is known to be new, it gets a slot without being looked up again
+        vehicle_id = internString(vehicle_id)
+        self.assign_slot(vehicle_id)
+        return vehicle_id
+
+    def register(self, vehicle_id):
+        # slot of the vehicle, vehicles not allocated here, e.g. from route files, get one on their departure
+        slot = self.slots.get(vehicle_id)
+        if slot is None:
+            slot = self.assign_slot(internString(vehicle_id))
+        return slot
+
+    def assign_slot(self, vehicle_id):
+        # slot for an interned id without one, a free one if there is any
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.ids[slot] = vehicle_id
+        else:
+            slot = len(self.ids)
+            self.ids.append(vehicle_id)
+        self.slots[vehicle_id] = slot
+        return slot
+
+    def release(self, vehicle_id):
+        # frees the slot of an arrived vehicle, returns the slot or None for unknown vehicles
+        slot = self.slots.pop(vehicle_id, None)
+        if slot is not None:
+            self.ids[slot] = None
+            self.free_slots.append(slot)
+        return slot
+
+    def get_slot(self, vehicle_id):
+        return self.slots[vehicle_id]
+
+    def get_id(self, slot):
+        return self.ids[slot]
+
+    def get_slot_array(self, vehicle_ids):
+        # slots of the given vehicles, e.g. to scatter per step values into arrays of size get_capacity
+        slots = self.slots
+        return np.fromiter((slots[vehicle_id] for vehicle_id in vehicle_ids), dtype=np.intp, count=len(vehicle_ids))
+
+    def get_capacity(self):
+        # number of slots in use or free, an upper bound of all slots handed out
+        return len(self.ids)
+
+    def clear(self):
+        self.slots = {}
+        self.ids = []
+        self.free_slots = []
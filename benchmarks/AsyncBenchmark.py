@@ -0,0 +1,105 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci as traci  # noqa
+import libraries.traci.aio as aio  # noqa
+import libraries.traci.constants as tc  # noqa
+from Main import Main  # noqa
+
+
+# serves one stub simulation in its own process like a sumo instance, printing its port first;
+# the step latency stands in for the time a real sumo needs to compute a step
+STUB_SERVER = """
+import sys
+import time
+sys.path.insert(0, %r)
+import SumoStub
+step_latency = float(sys.argv[1])
+stub = SumoStub.SumoStub(sys.argv[2:])
+if step_latency > 0:
+    step = stub.step
+    def delayed_step(target_time):
+        time.sleep(step_latency)
+        return step(target_time)
+    stub.step = delayed_step
+print(stub.listen())
+sys.stdout.flush()
+stub.serve()
+""" % os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_stubs(sumo_cmd, num_simulations, step_latency):
+    processes = [subprocess.Popen([sys.executable, "-c", STUB_SERVER, str(step_latency)] + sumo_cmd,
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) for _ in range(num_simulations)]
+    return processes, [int(process.stdout.readline()) for process in processes]
+
+
+def setup(connection, num_vehicles=20):
+    # gives the servers some work per step, so there is latency to overlap
+    connection.simulation.subscribe([tc.VAR_DEPARTED_VEHICLES_IDS, tc.VAR_ARRIVED_VEHICLES_IDS])
+    for idx in range(num_vehicles):
+        connection.vehicle.add("veh" + str(idx), ("du", "dl", "lr", "rd")[idx % 4])
+
+
+def run_blocking(sumo_cmd, num_simulations, num_steps, step_latency=0.):
+    # one label per simulation, stepped one after the other
+    labels = ["sim" + str(idx) for idx in range(num_simulations)]
+    processes, ports = start_stubs(sumo_cmd, num_simulations, step_latency)
+    for label, port, process in zip(labels, ports, processes):
+        traci.init(port, label=label, proc=process)
+        setup(traci.getConnection(label))
+    start = time.time()
+    for _ in range(num_steps):
+        for label in labels:
+            traci.getConnection(label).simulationStep()
+    seconds = time.time() - start
+    for label in labels:
+        traci.switch(label)
+        traci.close()
+    return seconds
+
+
+async def run_async(sumo_cmd, num_simulations, num_steps, step_latency=0.):
+    # all simulations are stepped concurrently from one event loop
+    processes, ports = start_stubs(sumo_cmd, num_simulations, step_latency)
+    connections = await asyncio.gather(*[aio.connect(port, proc=process) for port, process in zip(ports, processes)])
+    for connection in connections:
+        setup(connection)
+    start = time.time()
+    for _ in range(num_steps):
+        await asyncio.gather(*[connection.simulationStep() for connection in connections])
+    seconds = time.time() - start
+    await asyncio.gather(*[connection.close() for connection in connections])
+    return seconds
+
+
+def report(name, seconds, num_simulations, num_steps):
+    print("%-28s %8.3f s %10.0f steps/s" % (name, seconds, num_simulations * num_steps / seconds))
+
+
+def main(num_steps=200, latency_steps=50, step_latency=0.002):
+    sumo_cmd = Main("stub").sumo_cmd
+    # servers answering at once: only the client cost counts, asyncio adds its event loop to it
+    for num_simulations in (1, 8, 32):
+        report("blocking (%s sims)" % num_simulations, run_blocking(sumo_cmd, num_simulations, num_steps),
+               num_simulations, num_steps)
+        report("asyncio (%s sims)" % num_simulations,
+               asyncio.run(run_async(sumo_cmd, num_simulations, num_steps)), num_simulations, num_steps)
+    # servers needing time for a step: blocking waits for them one after the other, asyncio overlaps the waits
+    for num_simulations in (8, 32):
+        blocking = run_blocking(sumo_cmd, num_simulations, latency_steps, step_latency)
+        report("blocking (%s sims, %g ms)" % (num_simulations, step_latency * 1e3), blocking, num_simulations,
+               latency_steps)
+        concurrent = asyncio.run(run_async(sumo_cmd, num_simulations, latency_steps, step_latency))
+        report("asyncio (%s sims, %g ms)" % (num_simulations, step_latency * 1e3), concurrent, num_simulations,
+               latency_steps)
+        if concurrent > blocking:
+            print("ERR: asyncio did not overlap the step latency of %s simulations" % num_simulations)
+
+if __name__ == "__main__":
+    main()
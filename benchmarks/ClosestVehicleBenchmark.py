@@ -0,0 +1,71 @@
+import itertools
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa
+from ControlStrategy import ControlStrategy  # noqa
+from VehicleKernels import closest_per_approach  # noqa
+
+# roads of the intersection network, including internal and outgoing ones
+ROADS = ControlStrategy.incoming_edges + [":gneJ0_0", "gneE3", "-gneE4", "gneE5", "-gneE2"]
+
+
+def random_vehicles(num_vehicles, seed=42):
+    rng = random.Random(seed)
+    vehicle_ids = ["veh" + str(idx) for idx in range(num_vehicles)]
+    positions = [(rng.uniform(-100.0, 100.0), rng.uniform(-100.0, 100.0)) for _ in vehicle_ids]
+    roads = [rng.choice(ROADS) for _ in vehicle_ids]
+    return vehicle_ids, positions, roads
+
+
+def legacy_closest(vehicle_ids, positions, roads):
+    # the loop of the original TlControl.control, kept as reference
+    closest_vehicles = [['-1', 100000.0], ['-1', 100000.0], ['-1', 100000.0], ['-1', 100000.0]]
+    for vehicle, (x, y), edge in zip(vehicle_ids, positions, roads):
+        if edge in getattr(ControlStrategy, 'incoming_edges'):
+            distance = math.sqrt(x ** 2 + y ** 2)
+            if 30.0 < distance < closest_vehicles[getattr(ControlStrategy, 'incoming_edges').index(edge)][1]:
+                closest_vehicles[getattr(ControlStrategy, 'incoming_edges').index(edge)] = [vehicle, distance]
+    return [vehicle for vehicle, _ in closest_vehicles]
+
+
+def kernel_closest(vehicle_ids, position_array, edge_index_array):
+    closest, _ = closest_per_approach(position_array, edge_index_array, len(ControlStrategy.incoming_edges),
+                                      30.0, 100000.0)
+    return [vehicle_ids[idx] if idx >= 0 else '-1' for idx in closest]
+
+
+def to_arrays(positions, roads):
+    edge_index = {edge: idx for idx, edge in enumerate(ControlStrategy.incoming_edges)}
+    position_array = np.fromiter(itertools.chain.from_iterable(positions), dtype=float, count=2 * len(positions))
+    return position_array.reshape(-1, 2), np.fromiter((edge_index.get(edge, -1) for edge in roads), dtype=np.intp,
+                                                      count=len(roads))
+
+
+def report(name, seconds, repeat):
+    print("%-36s %10.1f us/call" % (name, seconds / repeat * 1e6))
+
+
+def main(repeat=200):
+    for num_vehicles in (1000, 10000):
+        vehicle_ids, positions, roads = random_vehicles(num_vehicles)
+        position_array, edge_index_array = to_arrays(positions, roads)
+        if legacy_closest(vehicle_ids, positions, roads) != kernel_closest(vehicle_ids, position_array,
+                                                                           edge_index_array):
+            print("ERR: Kernel result differs from the legacy loop for " + str(num_vehicles) + " vehicles")
+        seconds = timeit.timeit(lambda: legacy_closest(vehicle_ids, positions, roads), number=repeat)
+        report("legacy loop (%s veh)" % num_vehicles, seconds, repeat)
+        seconds = timeit.timeit(lambda: kernel_closest(vehicle_ids, position_array, edge_index_array),
+                                number=repeat)
+        report("kernel (%s veh)" % num_vehicles, seconds, repeat)
+        seconds = timeit.timeit(lambda: kernel_closest(vehicle_ids, *to_arrays(positions, roads)), number=repeat)
+        report("kernel incl. array build (%s veh)" % num_vehicles, seconds, repeat)
+
+
+if __name__ == "__main__":
+    main()
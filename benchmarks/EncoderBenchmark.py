@@ -0,0 +1,102 @@
+import os
+import struct
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci.constants as tc  # noqa
+from libraries.traci.encoder import Encoder  # noqa
+import Payloads  # noqa
+
+
+def legacy_begin_message(string, cmd_id, var_id, obj_id, length=0):
+    # message building of the original Connection, kept as reference
+    length += 1 + 1 + 1 + 4 + len(obj_id)
+    if length <= 255:
+        string += struct.pack("!BB", length, cmd_id)
+    else:
+        string += struct.pack("!BiB", 0, length + 4, cmd_id)
+    return string + struct.pack("!Bi", var_id, len(obj_id)) + obj_id.encode("latin1")
+
+
+def legacy_insertion(num_vehicles):
+    # the setters TrafficGenerator sends for every inserted vehicle, without vehicle.add
+    string = bytes()
+    for idx in range(num_vehicles):
+        vehicle_id = Payloads.vehicle_id(idx)
+        string = legacy_begin_message(string, tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_MINGAP, vehicle_id, 1 + 8)
+        string += struct.pack("!Bd", tc.TYPE_DOUBLE, 2.0)
+        string = legacy_begin_message(string, tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_SPEEDSETMODE, vehicle_id, 1 + 4)
+        string += struct.pack("!Bi", tc.TYPE_INTEGER, 7)
+        string = legacy_begin_message(string, tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_TAU, vehicle_id, 1 + 8)
+        string += struct.pack("!Bd", tc.TYPE_DOUBLE, 0.0)
+        string = legacy_begin_message(string, tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_IMPERFECTION, vehicle_id, 1 + 8)
+        string += struct.pack("!Bd", tc.TYPE_DOUBLE, 0.0)
+    return struct.pack("!i", len(string) + 4) + string
+
+
+def encoder_insertion(encoder, num_vehicles):
+    # as Connection sends the setters, each one written with a single call
+    encoder.reset()
+    for idx in range(num_vehicles):
+        vehicle_id = Payloads.vehicle_id(idx)
+        encoder.packSetter(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_MINGAP, vehicle_id, tc.TYPE_DOUBLE, 2.0)
+        encoder.packSetter(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_SPEEDSETMODE, vehicle_id, tc.TYPE_INTEGER, 7)
+        encoder.packSetter(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_TAU, vehicle_id, tc.TYPE_DOUBLE, 0.0)
+        encoder.packSetter(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_IMPERFECTION, vehicle_id, tc.TYPE_DOUBLE, 0.0)
+    return encoder.getMessage()
+
+
+def legacy_string_list(strings):
+    string = struct.pack("!Bi", tc.TYPE_STRINGLIST, len(strings))
+    for s in strings:
+        string += struct.pack("!i", len(s)) + s.encode("latin1")
+    return string
+
+
+def legacy_double_list(values):
+    string = struct.pack("!Bi", tc.TYPE_DOUBLELIST, len(values))
+    for x in values:
+        string += struct.pack("!d", x)
+    return string
+
+
+def encode_list(encoder, pack, values):
+    encoder.reset()
+    pack(values)
+    return encoder.getMessage()
+
+
+def report(name, seconds, repeat):
+    print("%-32s %10.1f us/msg %10.0f msg/s" % (name, seconds / repeat * 1e6, repeat / seconds))
+
+
+def best(function, repeat):
+    # fastest of five runs, small messages are too short for a single timing on a busy machine
+    return min(timeit.repeat(function, number=repeat, repeat=5))
+
+
+def main(repeat=500):
+    encoder = Encoder()
+    for num_vehicles in (1, 100):
+        assert bytes(encoder_insertion(encoder, num_vehicles)) == legacy_insertion(num_vehicles)
+        number = repeat * 100 // num_vehicles
+        report("legacy setters (%s veh)" % num_vehicles, best(lambda: legacy_insertion(num_vehicles), number),
+               number)
+        report("encoder setters (%s veh)" % num_vehicles,
+               best(lambda: encoder_insertion(encoder, num_vehicles), number), number)
+
+    strings = [Payloads.vehicle_id(i) for i in range(1000)]
+    report("legacy string list (1000)", timeit.timeit(lambda: legacy_string_list(strings), number=repeat), repeat)
+    report("encoder string list (1000)",
+           timeit.timeit(lambda: encode_list(encoder, encoder.packStringList, strings), number=repeat), repeat)
+
+    values = [float(i) for i in range(1000)]
+    report("legacy double list (1000)", timeit.timeit(lambda: legacy_double_list(values), number=repeat), repeat)
+    report("encoder double list (1000)",
+           timeit.timeit(lambda: encode_list(encoder, encoder.packDoubleList, values), number=repeat), repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci as traci  # noqa
+import SumoStub  # noqa
+from Main import Main  # noqa
+
+
+def control_step(connection, lanes, routes):
+    # what strategy code without own caching does: geometry and routes every step, then the vehicles
+    for lane in lanes:
+        connection.lane.getLength(lane)
+        connection.lane.getShape(lane)
+    for route in routes:
+        connection.route.getEdges(route)
+    for vehicle in connection.vehicle.getIDList():
+        connection.vehicle.getSpeed(vehicle)
+        connection.vehicle.getSpeed(vehicle)
+        connection.vehicle.getRoadID(vehicle)
+    connection.simulation.getDeltaT()
+
+
+def run(main, use_cache, num_steps):
+    label = "cached" if use_cache else "uncached"
+    SumoStub.connect(main.sumo_cmd, label)
+    connection = traci.getConnection(label)
+    cache = connection.enableGetterCache() if use_cache else None
+    lanes = connection.lane.getIDList()
+    routes = connection.route.getIDList()
+    for step, route in enumerate(routes * 3):
+        connection.vehicle.add("veh%s" % step, route)
+    round_trips = connection.getRoundTrips()
+    start = time.time()
+    for _ in range(num_steps):
+        control_step(connection, lanes, routes)
+        connection.simulationStep()
+    seconds = time.time() - start
+    round_trips = connection.getRoundTrips() - round_trips
+    traci.close()
+    return seconds, round_trips, cache
+
+
+def main(num_steps=200):
+    sim = Main("stub", step_length=0.1)
+    for use_cache in (False, True):
+        seconds, round_trips, cache = run(sim, use_cache, num_steps)
+        print("%-8s %8.2f ms/step %8.1f round trips/step" % ("cached" if use_cache else "uncached",
+                                                             seconds / num_steps * 1e3, round_trips / num_steps))
+        if cache is not None:
+            print("cache hits %s misses %s uncached %s" % (cache.hits, cache.misses, cache.uncached))
+
+
+if __name__ == "__main__":
+    main()
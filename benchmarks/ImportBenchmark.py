@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the import used to load all domains, sumolib, subprocess and numpy eagerly; the lazy import is compared with
+# loading all of them in the same run, so a slow machine slows down both, it takes about a third of it
+EAGER_CASE = "import traci eagerly"
+MAX_RATIO = 0.6
+# modules which import traci must not load
+LAZY_MODULES = ["numpy", "sumolib", "subprocess", "libraries.traci._vehicle"]
+
+# every statement runs in a fresh interpreter, so nothing is cached in sys.modules,
+# sumolib is imported from the libraries directory like traci does
+CASES = [("import traci", "import libraries.traci as traci"),
+         ("import traci, use vehicle", "import libraries.traci as traci; traci.vehicle"),
+         ("import traci, use all domains",
+          "import libraries.traci as traci; [getattr(traci, name) for name in traci.main._DOMAIN_MODULES]"),
+         ("import sumolib", "import sumolib"),
+         ("import sumolib, use net", "import sumolib; sumolib.net"),
+         (EAGER_CASE, "import libraries.traci as traci; [getattr(traci, name) for name in traci.main._DOMAIN_MODULES]; "
+                      "import sumolib; sumolib.net; import subprocess; import numpy")]
+
+TIMER = """
+import sys, time
+sys.path[:0] = [%r, %r]
+start = time.perf_counter()
+%s
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def measure(statement, repeat):
+    times = []
+    for _ in range(repeat):
+        timer = TIMER % (ROOT, os.path.join(ROOT, "libraries"), statement)
+        output = subprocess.check_output([sys.executable, "-c", timer])
+        times.append(float(output.decode().split()[-1]))
+    return sorted(times)[len(times) // 2]
+
+
+def loaded_modules(statement, modules):
+    timer = "import sys\nsys.path[:0] = [%r, %r]\n%s\nprint(' '.join(m for m in %r if m in sys.modules))" % (
+        ROOT, os.path.join(ROOT, "libraries"), statement, modules)
+    return subprocess.check_output([sys.executable, "-c", timer]).decode().split()
+
+
+def main(repeat=11):
+    results = {}
+    for name, statement in CASES:
+        results[name] = measure(statement, repeat)
+        print("%-32s %8.1f ms" % (name, results[name]))
+    failed = False
+    loaded = loaded_modules(CASES[0][1], LAZY_MODULES)
+    if loaded:
+        print("ERR: importing traci loaded %s" % ", ".join(loaded))
+        failed = True
+    ratio = results["import traci"] / results[EAGER_CASE]
+    print("%-32s %8.2f" % ("lazy / eager", ratio))
+    if ratio > MAX_RATIO:
+        print("ERR: importing traci took %.0f%% of the eager import, more than %.0f%%" % (
+            ratio * 100, MAX_RATIO * 100))
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
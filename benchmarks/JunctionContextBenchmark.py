@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci as traci  # noqa
+import SumoStub  # noqa
+from ControlStrategy import ControlStrategy  # noqa
+from JunctionContext import JunctionContext  # noqa
+from Main import Main  # noqa
+
+
+def sweep_queues(connection):
+    # what a strategy without the context does: getters for every vehicle, filtered and sorted in python
+    queues = dict((edge, []) for edge in ControlStrategy.incoming_edges)
+    for vehicle in connection.vehicle.getIDList():
+        road = connection.vehicle.getRoadID(vehicle)
+        if road in queues:
+            x, y = connection.vehicle.getPosition(vehicle)
+            queues[road].append(((x ** 2 + y ** 2) ** 0.5, vehicle))
+    # vehicles at the same distance stay in the order of the id list like in the context
+    return [[vehicle for _, vehicle in sorted(queues[edge], key=lambda item: item[0])]
+            for edge in ControlStrategy.incoming_edges]
+
+
+def context_queues(junction_context):
+    junction_context.update()
+    return [list(junction_context.get_queue(edge)["ids"]) for edge in ControlStrategy.incoming_edges]
+
+
+def run(main, use_context, num_steps, num_vehicles):
+    label = "context" if use_context else "sweep"
+    SumoStub.connect(main.sumo_cmd, label)
+    traci.switch(label)
+    connection = traci.getConnection(label)
+    junction_context = None
+    if use_context:
+        junction_context = JunctionContext(ControlStrategy.junction_id, ControlStrategy.incoming_edges,
+                                           ControlStrategy.context_radius, with_queue_vars=False)
+        junction_context.subscribe()
+    for idx in range(num_vehicles):
+        connection.vehicle.add("veh%s" % idx, ControlStrategy.routes[idx % len(ControlStrategy.routes)])
+    round_trips = connection.getRoundTrips()
+    queues = []
+    start = time.time()
+    for _ in range(num_steps):
+        connection.simulationStep()
+        queues.append(context_queues(junction_context) if use_context else sweep_queues(connection))
+    seconds = time.time() - start
+    round_trips = connection.getRoundTrips() - round_trips
+    traci.close()
+    return seconds, round_trips, queues
+
+
+def main(num_steps=100, num_vehicles=48):
+    sim = Main("stub", step_length=0.1)
+    results = {}
+    for use_context in (False, True):
+        seconds, round_trips, queues = run(sim, use_context, num_steps, num_vehicles)
+        results[use_context] = queues
+        print("%-8s %8.2f ms/step %8.1f round trips/step" % ("context" if use_context else "sweep",
+                                                             seconds / num_steps * 1e3, round_trips / num_steps))
+    if results[False] != results[True]:
+        print("ERR: Approach queues of the context differ from the getter sweep")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import struct
+import libraries.traci.constants as tc
+
+# road ids of the intersection network in networks/intersection.net.xml
+edges = ['gneE2', '-gneE3', 'gneE4', '-gneE5']
+routes = ['du', 'dl', 'dr', 'ld', 'lr', 'lu', 'ul', 'ud', 'ur', 'ru', 'rl', 'rd']
+
+
+def pack_string(s):
+    return struct.pack("!i", len(s)) + s.encode("latin1")
+
+
+def pack_string_list(strings):
+    return struct.pack("!i", len(strings)) + b"".join(pack_string(s) for s in strings)
+
+
+def pack_command(cmd_id, body):
+    # short commands carry their length in one byte, long ones use the extended length field
+    if len(body) + 2 <= 255:
+        return struct.pack("!BB", len(body) + 2, cmd_id) + body
+    return struct.pack("!BiB", 0, len(body) + 6, cmd_id) + body
+
+
+def pack_status(cmd_id):
+    return struct.pack("!BBB", 1 + 1 + 1 + 4, cmd_id, 0) + pack_string("")
+
+
+def vehicle_id(idx):
+    return ("000000" + str(idx))[-6:]
+
+
+def vehicle_subscription(idx, t=0.0):
+    # the variables subscribed by SimulationState plus speed and lane position
+    body = pack_string(vehicle_id(idx)) + struct.pack("!B", 5)
+    body += struct.pack("!BBBdd", tc.VAR_POSITION, 0, tc.POSITION_2D, idx * 0.5, t)
+    body += struct.pack("!BBB", tc.VAR_ROAD_ID, 0, tc.TYPE_STRING) + pack_string(edges[idx % len(edges)])
+    body += struct.pack("!BBB", tc.VAR_ROUTE_ID, 0, tc.TYPE_STRING) + pack_string(routes[idx % len(routes)])
+    body += struct.pack("!BBBd", tc.VAR_SPEED, 0, tc.TYPE_DOUBLE, 13.89)
+    body += struct.pack("!BBBd", tc.VAR_LANEPOSITION, 0, tc.TYPE_DOUBLE, idx * 0.1)
+    return pack_command(tc.RESPONSE_SUBSCRIBE_VEHICLE_VARIABLE, body)
+
+
+def subscription_step(num_vehicles, t=0.0):
+    # body of a simulation step answer after the status has been read
+    return struct.pack("!i", num_vehicles) + b"".join(vehicle_subscription(i, t) for i in range(num_vehicles))
+
+
+def simulation_step_response(num_vehicles, t=0.0):
+    # complete simulation step message as sent by sumo, including the length header
+    content = pack_status(tc.CMD_SIMSTEP) + subscription_step(num_vehicles, t)
+    return struct.pack("!i", len(content) + 4) + content
+
+
+def shape(num_points):
+    values = []
+    for i in range(num_points):
+        values.extend((float(i), float(-i)))
+    if num_points < 256:
+        header = struct.pack("!B", num_points)
+    else:
+        header = struct.pack("!Bi", 0, num_points)
+    return header + struct.pack("!%sd" % len(values), *values)
+
+
+def string_list(num_strings):
+    return pack_string_list([vehicle_id(i) for i in range(num_strings)])
@@ -0,0 +1,70 @@
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci.constants as tc  # noqa
+from libraries.traci.connection import Connection  # noqa
+from libraries.traci.storage import Storage  # noqa
+from ReplayServer import ReplayServer  # noqa
+import Payloads  # noqa
+
+
+def legacy_recv_exact(conn):
+    # receive loop of the original Connection._recvExact, kept as reference
+    result = bytes()
+    while len(result) < 4:
+        result += conn._transport.recv(4 - len(result))
+    length = struct.unpack("!i", result)[0] - 4
+    result = bytes()
+    while len(result) < length:
+        result += conn._transport.recv(length - len(result))
+    return Storage(result)
+
+
+def request(conn, recv):
+    # send a step command and read the status of the answer, the subscriptions are not decoded
+    conn._transport.send(struct.pack("!iBBd", 4 + 1 + 1 + 8, 1 + 1 + 8, tc.CMD_SIMSTEP, 0.))
+    result = recv()
+    result.read("!BBB")
+    result.readString()
+
+
+def measure(num_vehicles, repeat, legacy, chunk_size):
+    # the server runs in its own process like sumo, so the cpu time of this process is the cost of receiving
+    response = Payloads.simulation_step_response(num_vehicles)
+    server = ReplayServer([response], chunk_size)
+    conn = Connection("localhost", server.start_process(), None)
+    recv = (lambda: legacy_recv_exact(conn)) if legacy else conn._recvExact
+    request(conn, recv)
+    start = time.perf_counter()
+    start_cpu = time.process_time()
+    for _ in range(repeat):
+        request(conn, recv)
+    cpu_seconds = time.process_time() - start_cpu
+    seconds = time.perf_counter() - start
+    conn._transport.close()
+    return len(response), seconds / repeat, cpu_seconds / repeat
+
+
+def main(repeat=200, rounds=5):
+    for chunk_size in (None, 1460):
+        for num_vehicles in (100, 1000, 10000):
+            # alternating runs, the best of each
+            best = {}
+            for _ in range(rounds):
+                for legacy in (True, False):
+                    size, seconds, cpu_seconds = measure(num_vehicles, repeat, legacy, chunk_size)
+                    previous = best.get(legacy, (float("inf"), float("inf")))
+                    best[legacy] = (min(previous[0], seconds), min(previous[1], cpu_seconds))
+            for legacy in (True, False):
+                seconds, cpu_seconds = best[legacy]
+                print("%-8s chunk %5s %6s veh %9s bytes %10.1f us/msg %10.1f us cpu/msg %8.1f MB/s" % (
+                    "legacy" if legacy else "buffer", chunk_size, num_vehicles, size, seconds * 1e6,
+                    cpu_seconds * 1e6, size / seconds / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci as traci  # noqa
+from libraries.traci.exceptions import FatalTraCIError  # noqa
+from Main import Main  # noqa
+
+RESULT_KEYS = ["round_trips", "idle_steps", "departed", "arrived", "mean_travel_time"]
+
+
+def record(session_file, cs_id, num_steps, seed):
+    # the stub stands in for sumo while recording, a session of a real sumo run is recorded the same way
+    main = Main("stub", cs_id, step_length=0.1, vehicle_appearance_probability=0.05, num_steps=num_steps, seed=seed)
+    main.enable_recording(session_file)
+    return main.run("record")
+
+
+def replay(session_file, cs_id, num_steps, seed):
+    main = Main("replay", cs_id, step_length=0.1, vehicle_appearance_probability=0.05, num_steps=num_steps,
+                seed=seed)
+    main.enable_replay(session_file)
+    return main, main.run("replay")
+
+
+def main(num_steps=5000, seed=7, repeat=3):
+    directory = tempfile.mkdtemp()
+    for cs_id in range(5):
+        session_file = os.path.join(directory, "session%s.trs.gz" % cs_id)
+        recorded = record(session_file, cs_id, num_steps, seed)
+        # client side cost only: decoding, subscription handling and control strategy
+        seconds = min(replay(session_file, cs_id, num_steps, seed)[1]["wall_clock_time"] for _ in range(repeat))
+        replay_main, replayed = replay(session_file, cs_id, num_steps, seed)
+        print("cs %s %8.1f steps/s recorded %8.1f steps/s replayed %8.1f us/round trip %8.1f kB session" % (
+            cs_id, recorded["steps_per_second"], num_steps / seconds, seconds / recorded["round_trips"] * 1e6,
+            os.path.getsize(session_file) / 1e3))
+        if [recorded[key] for key in RESULT_KEYS] != [replayed[key] for key in RESULT_KEYS]:
+            print("ERR: Replayed results of control strategy %s differ from the recorded ones" % cs_id)
+        if replay_main.replay_server.mismatch is not None:
+            print("ERR: Replay of control strategy %s diverged at request %s" % (
+                cs_id, replay_main.replay_server.mismatch))
+        os.remove(session_file)
+    # a run which issues other requests than the recorded one has to be detected
+    session_file = os.path.join(directory, "session.trs")
+    record(session_file, 2, num_steps, seed)
+    try:
+        replay(session_file, 2, num_steps, seed + 1)
+        print("ERR: Replay of a run with another seed did not fail")
+    except FatalTraCIError as e:
+        # the replay server tells which request diverged and how
+        if "differs from the recorded session" not in str(e):
+            print("ERR: Replay of a run with another seed failed without a description: %s" % e)
+        traci.close(False)
+    os.remove(session_file)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
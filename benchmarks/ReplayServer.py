@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libraries.traci import replay  # noqa
+
+
+class ReplayServer(replay.ReplayServer):
+    # local stand-in for sumo which answers every request with the next of the given recorded
+    # responses (complete messages including the length header), cycling through them;
+    # with a chunk size the answers are written in several pieces like a busy server would,
+    # with a latency every answer is delayed by that many seconds like by the computation of a step;
+    # the host may name another transport than TCP, e.g. unix:/tmp/replay.sock or shm:/tmp/replay.shm
+
+    def __init__(self, responses, chunk_size=None, host="localhost", latency=0.):
+        replay.ReplayServer.__init__(self, [(None, response) for response in responses], host, cycle=True,
+                                     chunkSize=chunk_size, latency=latency)
+        self.responses = responses
+        self.chunk_size = chunk_size
+
+    def start_process(self):
+        return self.startProcess()
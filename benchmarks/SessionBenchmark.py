@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci as traci  # noqa
+from libraries.traci.session import SimulationSession  # noqa
+from Main import Main  # noqa
+
+ROUTES = ["du", "dl", "lr", "rd", "ud", "ur"]
+
+
+def warm_up(connection, seconds):
+    # one vehicle per second, so the network is filled when the experiments start
+    for second in range(int(seconds)):
+        connection.vehicle.add("warm" + str(second), ROUTES[second % len(ROUTES)])
+        connection.simulationStep(float(second + 1))
+
+
+def experiment(connection, seconds=10.0):
+    connection.simulationStep(connection.simulation.getTime() + seconds)
+    return len(connection.vehicle.getIDList())
+
+
+def run_fresh(main, num_runs, warm_up_seconds):
+    # every run starts its own server and simulates the warm-up again
+    start = time.time()
+    for run in range(num_runs):
+        label = "fresh" + str(run)
+        traci.start(main.server_cmd() + main.sumo_cmd[1:], label=label)
+        warm_up(traci.getConnection(label), warm_up_seconds)
+        experiment(traci.getConnection(label))
+        traci.close()
+    return time.time() - start
+
+
+def run_session(main, num_runs, warm_up_seconds):
+    # one server, the warm-up is simulated once and restored for every run
+    start = time.time()
+    session = SimulationSession(main.server_cmd(), main.sumo_cmd[1:])
+    warm_up(session.getConnection(), warm_up_seconds)
+    session.checkpoint("warm")
+    session.fork("warm", [experiment] * num_runs)
+    session.close()
+    return time.time() - start
+
+
+def main(num_runs=5):
+    sim = Main("stub", step_length=0.1)
+    for warm_up_seconds in (10.0, 60.0):
+        for name, runner in (("fresh start", run_fresh), ("session restore", run_session)):
+            seconds = runner(sim, num_runs, warm_up_seconds)
+            print("%-16s warm-up %4.0f s %8.2f s total %8.2f s/run" % (name, warm_up_seconds, seconds,
+                                                                      seconds / num_runs))
+
+
+if __name__ == "__main__":
+    main()
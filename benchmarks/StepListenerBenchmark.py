@@ -0,0 +1,89 @@
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci as traci  # noqa
+from libraries.traci.connection import Connection  # noqa
+from ReplayServer import ReplayServer  # noqa
+import Payloads  # noqa
+
+
+class MetricsLogger(traci.StepListener):
+    # serializes the subscription results of every step on the main thread
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.lines = []
+
+    def step(self, t=0):
+        self.lines.append(json.dumps(self.connection.vehicle.getAllSubscriptionResults()))
+        return True
+
+
+class ReadOnlyMetricsLogger(traci.ReadOnlyStepListener):
+    # the same work on a snapshot, overlapping with the next step
+
+    def __init__(self):
+        self.lines = []
+
+    def step(self, t=0, snapshot=None):
+        self.lines.append(json.dumps(dict(snapshot.getSubscriptionResults("vehicle"))))
+        return True
+
+
+class Controller(traci.StepListener):
+    # a cheap listener with a higher priority, e.g. the control strategy
+
+    def step(self, t=0):
+        return True
+
+
+def run(read_only, num_steps, num_vehicles, step_latency=0.):
+    # the server answers every step with the same subscription results of num_vehicles vehicles,
+    # so the client side work is measured without the cost of a simulation sharing the machine
+    server = ReplayServer([Payloads.simulation_step_response(num_vehicles)], latency=step_latency)
+    connection = Connection("localhost", server.start_process(), None)
+    connection.addStepListener(Controller(), priority=-1)
+    logger = ReadOnlyMetricsLogger() if read_only else MetricsLogger(connection)
+    connection.addStepListener(logger, priority=10)
+    start = time.time()
+    for _ in range(num_steps):
+        connection.simulationStep()
+    connection._stepListeners.wait()
+    seconds = time.time() - start
+    stats = connection.getStepListenerStats()
+    # the replayed answers do not fit a close command, the server stops when the client disconnects
+    connection._transport.close()
+    return seconds, stats, logger.lines
+
+
+def main(num_steps=200, num_vehicles=300, step_latency=0.002, rounds=3):
+    # without latency the logger competes with the main thread for the GIL, with a server needing time
+    # for its steps it runs while the main thread waits for the next step
+    for latency in (0., step_latency):
+        # fastest of alternating runs, so that a busy phase of the machine does not favour one of them
+        best = {}
+        lines = {}
+        for _ in range(rounds):
+            for read_only in (False, True):
+                seconds, stats, lines[read_only] = run(read_only, num_steps, num_vehicles, latency)
+                if read_only not in best or seconds < best[read_only][0]:
+                    best[read_only] = (seconds, stats)
+        for read_only in (False, True):
+            seconds, stats = best[read_only]
+            print("%-10s %4g ms latency %8.2f ms/step" % ("read-only" if read_only else "serial", latency * 1e3,
+                                                          seconds / num_steps * 1e3))
+            for listener_stats in stats:
+                print("    %-24s %8s calls %8.1f us/call" % (listener_stats.name, listener_stats.calls,
+                                                           listener_stats.getMeanTime() * 1e6))
+        if lines[False] != lines[True]:
+            print("ERR: The read-only listener logged other results than the serial one")
+        # on a single core the worker thread delays the server process instead of overlapping with it
+        if latency and best[True][0] > best[False][0] and (os.cpu_count() or 1) > 1:
+            print("ERR: The read-only listener did not overlap with the step latency")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import os
+import struct
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci.constants as tc  # noqa
+from libraries.traci.connection import Connection  # noqa
+from libraries.traci.domain import _getDefaultDomain, _DOMAIN_MODULES  # noqa
+from libraries.traci.storage import Storage  # noqa
+import Payloads  # noqa
+
+
+def offline_connection():
+    # a connection without socket, only used for decoding subscription answers
+    conn = Connection.__new__(Connection)
+    conn._subscriptionMapping = {}
+    conn._subscriptionManager = None
+    # all domains up front, so that generic_connection reaches the results of every one
+    for name in _DOMAIN_MODULES:
+        _getDefaultDomain(name)._register(conn, conn._subscriptionMapping)
+    return conn
+
+
+def generic_connection():
+    # decodes every value with its return value function, as before the compiled record decoders
+    conn = offline_connection()
+    for subscription_results in conn._subscriptionMapping.values():
+        subscription_results.learnRecord = lambda varIDs: None
+    return conn
+
+
+# numeric variables of Payloads.vehicle_subscription
+COLUMNS = [tc.VAR_POSITION, tc.VAR_SPEED, tc.VAR_LANEPOSITION]
+
+
+def missing_speed(idx):
+    # a vehicle which only delivers its position, appended to a step of idx vehicles
+    body = Payloads.pack_string(Payloads.vehicle_id(idx)) + struct.pack("!B", 1)
+    body += struct.pack("!BBBdd", tc.VAR_POSITION, 0, tc.POSITION_2D, 1., 2.)
+    return Payloads.pack_command(tc.RESPONSE_SUBSCRIBE_VEHICLE_VARIABLE, body)
+
+
+def parse_step(conn, payload):
+    conn._readSimulationStep(Storage(payload))
+
+
+def position_array(conn):
+    # what control code without columnar results has to do for vectorized access
+    results = conn.vehicle.getAllSubscriptionResults()
+    return list(results), np.array([values[tc.VAR_POSITION] for values in results.values()])
+
+
+def report(name, seconds, repeat, items):
+    per_call = seconds / repeat
+    print("%-28s %10.1f us/call %12.0f items/s" % (name, per_call * 1e6, items / per_call))
+
+
+def best(functions, repeat, rounds=7):
+    # fastest run of every function, the runs alternate so that a busy phase of the machine
+    # does not favour one of them
+    seconds = [float("inf")] * len(functions)
+    for _ in range(rounds):
+        for index, function in enumerate(functions):
+            seconds[index] = min(seconds[index], timeit.timeit(function, "gc.enable()", number=repeat))
+    return seconds
+
+
+def main(repeat=200):
+    conn = offline_connection()
+    generic = generic_connection()
+    columnar = offline_connection()
+    columnar.vehicle.enableColumnarSubscriptionResults(COLUMNS)
+    for num_vehicles in (10, 100, 1000, 10000):
+        payload = Payloads.subscription_step(num_vehicles)
+        number = max(1, repeat * 100 // num_vehicles)
+        seconds = best([lambda: parse_step(generic, payload),
+                        lambda: parse_step(conn, payload),
+                        lambda: parse_step(columnar, payload),
+                        lambda: (parse_step(conn, payload), position_array(conn)),
+                        lambda: (parse_step(columnar, payload),
+                                 columnar.vehicle.getAllSubscriptionResultsArray(tc.VAR_POSITION))], number)
+        for name, result in zip(("generic values (%s veh)", "compiled records (%s veh)", "columnar (%s veh)",
+                                 "+ positions from dicts (%s)", "+ positions from columns (%s)"), seconds):
+            report(name % num_vehicles, result, number, num_vehicles)
+        if conn.vehicle.getAllSubscriptionResults() != generic.vehicle.getAllSubscriptionResults():
+            print("ERR: Compiled record decoders differ from the generic decoding")
+        if columnar.vehicle.getAllSubscriptionResults() != generic.vehicle.getAllSubscriptionResults():
+            print("ERR: Columnar results differ from the generic decoding")
+        ids, positions = columnar.vehicle.getAllSubscriptionResultsArray(tc.VAR_POSITION)
+        if ids != list(generic.vehicle.getAllSubscriptionResults()) or positions.tolist() != position_array(
+                generic)[1].tolist():
+            print("ERR: Position array differs from the generic decoding")
+
+    # a vehicle without speed in this step must not show the speed of the last one
+    parse_step(columnar, struct.pack("!i", 4) + Payloads.subscription_step(3)[4:] + missing_speed(3))
+    ids = columnar.vehicle.getAllSubscriptionResultsArray(tc.VAR_SPEED)[0]
+    if Payloads.vehicle_id(3) in ids or Payloads.vehicle_id(3) not in columnar.vehicle.getAllSubscriptionResults():
+        print("ERR: Columnar results contain a speed the vehicle did not deliver")
+
+    # getter responses (after the status) of variables with a generated decoder
+    for var_id, value in ((tc.VAR_SPEED, struct.pack("!Bd", tc.TYPE_DOUBLE, 13.89)),
+                          (tc.VAR_POSITION, struct.pack("!Bdd", tc.POSITION_2D, 1., 2.)),
+                          (tc.VAR_ROAD_ID, struct.pack("!B", tc.TYPE_STRING) + Payloads.pack_string("gneE2"))):
+        body = struct.pack("!B", var_id) + Payloads.pack_string(Payloads.vehicle_id(0)) + value
+        payload = Payloads.pack_command(tc.RESPONSE_GET_VEHICLE_VARIABLE, body)
+        value_func = conn.vehicle._retValFunc[var_id]
+        args = (tc.CMD_GET_VEHICLE_VARIABLE, var_id, Payloads.vehicle_id(0))
+        seconds = best([lambda: value_func(conn._checkResponse(Storage(payload), *args)),
+                        lambda: conn._readValue(Storage(payload), *args, value_func)], repeat * 10)
+        for name, result in zip(("generic getter %02x", "compiled getter %02x"), seconds):
+            report(name % var_id, result, repeat * 10, 1)
+        if conn._readValue(Storage(payload), *args, value_func) != value_func(
+                conn._checkResponse(Storage(payload), *args)):
+            print("ERR: Compiled getter decoder of %02x differs from the generic decoding" % var_id)
+
+    for num_points in (10, 1000):
+        payload = Payloads.shape(num_points)
+        seconds = timeit.timeit(lambda: Storage(payload).readShape(), number=repeat)
+        report("shape (%s points)" % num_points, seconds, repeat, num_points)
+
+    for num_strings in (10, 1000):
+        payload = Payloads.string_list(num_strings)
+        seconds = timeit.timeit(lambda: Storage(payload).readStringList(), number=repeat)
+        report("string list (%s)" % num_strings, seconds, repeat, num_strings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os
+import struct
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci as traci  # noqa
+import libraries.traci.constants as tc  # noqa
+from libraries.traci.subscriptions import compileSubscription  # noqa
+import SumoStub  # noqa
+from Main import Main  # noqa
+from SimulationState import SimulationState  # noqa
+
+VARIABLES = SimulationState.vehicle_vars + SimulationState.departure_vars
+
+
+def legacy_subscribe(cmd_id, begin, end, obj_id, var_ids):
+    # encoding of the original Connection._encodeSubscribe, kept as reference
+    length = 1 + 1 + 8 + 8 + 4 + len(obj_id) + 1 + len(var_ids)
+    if length <= 255:
+        string = struct.pack("!B", length)
+    else:
+        string = struct.pack("!Bi", 0, length + 4)
+    string += struct.pack("!Bddi", cmd_id, begin, end, len(obj_id)) + obj_id.encode("latin1")
+    string += struct.pack("!B", len(var_ids))
+    for v in var_ids:
+        string += struct.pack("!B", v)
+    return string
+
+
+def template_subscribe(cmd_id, begin, end, obj_id, var_ids):
+    return compileSubscription(cmd_id, begin, end, var_ids).encode(obj_id)
+
+
+def subscribe_departures(connection, vehicle_ids, batched):
+    if batched:
+        with connection.batch():
+            for vehicle_id in vehicle_ids:
+                connection.vehicle.subscribe(vehicle_id, VARIABLES)
+    else:
+        for vehicle_id in vehicle_ids:
+            connection.vehicle.subscribe(vehicle_id, VARIABLES)
+
+
+def run(main, batched, num_steps, departures_per_step):
+    label = "batched" if batched else "single"
+    SumoStub.connect(main.sumo_cmd, label)
+    connection = traci.getConnection(label)
+    round_trips = 0
+    seconds = 0.0
+    for step in range(num_steps):
+        vehicle_ids = ["veh%s_%s" % (step, idx) for idx in range(departures_per_step)]
+        for vehicle_id in vehicle_ids:
+            connection.vehicle.add(vehicle_id, "du")
+        connection.simulationStep()
+        start_round_trips = connection.getRoundTrips()
+        start = time.time()
+        subscribe_departures(connection, vehicle_ids, batched)
+        seconds += time.time() - start
+        round_trips += connection.getRoundTrips() - start_round_trips
+    traci.close()
+    return seconds, round_trips
+
+
+def main(num_steps=50, departures_per_step=20, repeat=20000):
+    args = (tc.CMD_SUBSCRIBE_VEHICLE_VARIABLE, 0, 2 ** 31 - 1, "veh12345", VARIABLES)
+    if legacy_subscribe(*args) != template_subscribe(*args):
+        print("ERR: Template encoding differs from the legacy encoding")
+    for name, encode in (("legacy encoding", legacy_subscribe), ("template encoding", template_subscribe)):
+        seconds = timeit.timeit(lambda: encode(*args), number=repeat)
+        print("%-24s %8.2f us/subscription" % (name, seconds / repeat * 1e6))
+    sim = Main("stub", step_length=0.1)
+    for batched in (False, True):
+        seconds, round_trips = run(sim, batched, num_steps, departures_per_step)
+        print("%-24s %8.2f ms/step %8.1f round trips/step" % ("batched" if batched else "one by one",
+                                                             seconds / num_steps * 1e3, round_trips / num_steps))
+
+
+if __name__ == "__main__":
+    main()
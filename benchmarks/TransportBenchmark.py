@@ -0,0 +1,49 @@
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import libraries.traci.constants as tc  # noqa
+from libraries.traci.connection import Connection  # noqa
+from ReplayServer import ReplayServer  # noqa
+import Payloads  # noqa
+
+TRANSPORTS = [("tcp", "localhost"),
+              ("unix", "unix:" + os.path.join(tempfile.gettempdir(), "traci_benchmark.sock")),
+              ("shm", "shm:" + os.path.join(tempfile.gettempdir(), "traci_benchmark_shm.sock"))]
+
+
+def measure(host, num_vehicles, repeat, decode):
+    # the server runs in its own process like sumo; the client either does complete simulation steps
+    # or only receives the answers, which measures the transport alone
+    response = Payloads.simulation_step_response(num_vehicles)
+    server = ReplayServer([response], host=host)
+    conn = Connection(host, server.start_process(), None)
+    conn.simulationStep()
+    request = struct.pack("!iBBd", 4 + 1 + 1 + 8, 1 + 1 + 8, tc.CMD_SIMSTEP, 0.)
+    start = time.time()
+    for _ in range(repeat):
+        if decode:
+            conn.simulationStep()
+        else:
+            conn._transport.sendall(request)
+            conn._recvExact()
+    seconds = time.time() - start
+    # the replayed answers do not fit a close command, the server stops when the client disconnects
+    conn._transport.close()
+    return len(response), seconds / repeat
+
+
+def main():
+    for num_vehicles, repeat in ((0, 5000), (100, 2000), (10000, 100)):
+        for decode in (False, True):
+            for name, host in TRANSPORTS:
+                size, seconds = measure(host, num_vehicles, repeat, decode)
+                print("%-5s %-8s %6s veh %9s bytes %10.1f us/step %8.1f MB/s" % (
+                    name, "step" if decode else "transfer", num_vehicles, size, seconds * 1e6, size / seconds / 1e6))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import os
+import struct
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libraries.traci.storage import Storage  # noqa
+from VehicleRegistry import VehicleRegistry  # noqa
+
+
+def legacy_allocate(current_id):
+    # id of the original TrafficGenerator, kept as reference
+    return ("000000" + str(current_id))[-6:]
+
+
+def legacy_read_string_list(storage):
+    # decoding of Storage.readStringList without interning, kept as reference
+    content = storage._content
+    pos = storage._pos
+    n = struct.unpack_from("!i", content, pos)[0]
+    pos += 4
+    result = []
+    for _ in range(n):
+        end = pos + 4 + struct.unpack_from("!i", content, pos)[0]
+        result.append(str(content[pos + 4:end].tobytes().decode("latin1")))
+        pos = end
+    storage._pos = pos
+    return tuple(result)
+
+
+def encode_id_list(vehicle_ids):
+    # a TRACI_ID_LIST answer as sumo sends it every step, in a reused receive buffer like Connection._recvExact
+    data = [struct.pack("!i", len(vehicle_ids))]
+    for vehicle_id in vehicle_ids:
+        data.append(struct.pack("!i", len(vehicle_id)) + vehicle_id.encode("latin1"))
+    return bytearray(b"".join(data))
+
+
+def measure(function, *args, repeat=3):
+    # seconds of the fastest run and bytes kept by the result of a traced run
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    result = function(*args)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return seconds, memory, result
+
+
+def allocate_legacy(num_vehicles):
+    return [legacy_allocate(idx) for idx in range(num_vehicles)]
+
+
+def allocate_registry(num_vehicles):
+    registry = VehicleRegistry()
+    for _ in range(num_vehicles):
+        registry.allocate()
+    return registry
+
+
+def decode_steps(message, num_steps, read):
+    # keeps the decoded ids of all steps like a result history would
+    return [read(Storage(message)) for _ in range(num_steps)]
+
+
+def lookup_slots(registry, steps):
+    slots = registry.slots
+    return sum(slots[vehicle_id] for vehicle_ids in steps for vehicle_id in vehicle_ids)
+
+
+def main(num_vehicles=100000, num_steps=10):
+    seconds, memory, legacy_ids = measure(allocate_legacy, num_vehicles)
+    print("%-28s %8.1f ms %8.1f MB" % ("allocate legacy", seconds * 1e3, memory / 1e6))
+    seconds, memory, registry = measure(allocate_registry, num_vehicles)
+    print("%-28s %8.1f ms %8.1f MB" % ("allocate registry", seconds * 1e3, memory / 1e6))
+    if legacy_ids != registry.ids:
+        print("ERR: Registry ids differ from the legacy ids")
+    if legacy_allocate(1000000) != legacy_allocate(0) or registry.allocator.next_id() == legacy_allocate(0):
+        print("ERR: Expected the legacy ids to wrap around after 999999 and the registry ids not to")
+    message = encode_id_list(registry.ids)
+    results = {}
+    for name, read in (("decode legacy", legacy_read_string_list), ("decode interned", Storage.readStringList)):
+        seconds, memory, results[name] = measure(decode_steps, message, num_steps, read)
+        print("%-28s %8.1f ms/step %8.1f MB for %s steps" % (name, seconds / num_steps * 1e3, memory / 1e6,
+                                                             num_steps))
+        start = time.perf_counter()
+        lookup_slots(registry, results[name])
+        print("%-28s %8.1f ms/step" % ("    slot lookup", (time.perf_counter() - start) / num_steps * 1e3))
+    if results["decode legacy"] != results["decode interned"]:
+        print("ERR: Interned ids differ from the legacy decoding")
+    if any(vehicle_id is not registry_id for vehicle_id, registry_id in zip(results["decode interned"][-1],
+                                                                            registry.ids)):
+        print("ERR: Decoded ids are not the registry's objects")
+    # half of the vehicles arrive and as many depart, the slots stay dense
+    for vehicle_id in registry.ids[::2]:
+        registry.release(vehicle_id)
+    for _ in range(num_vehicles // 2):
+        registry.allocate()
+    if registry.get_capacity() != num_vehicles or len(registry) != num_vehicles:
+        print("ERR: Slots of arrived vehicles were not reused")
+    start = time.perf_counter()
+    slots = registry.get_slot_array(list(registry.slots))
+    print("%-28s %8.1f ms" % ("slot array", (time.perf_counter() - start) * 1e3))
+    if sorted(slots) != list(range(num_vehicles)):
+        print("ERR: Slots are not dense")
+
+
+if __name__ == "__main__":
+    main()
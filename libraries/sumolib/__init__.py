@@ -19,16 +19,38 @@ import os
 import sys
 import subprocess
 import warnings
+import importlib
 from xml.sax import parseString, handler
 from optparse import OptionParser, OptionGroup, Option
 
-try:
-    from . import visualization  # noqa
-except ImportError as e:
-    warnings.warn(str(e))
-from . import files, net, output, sensors, shapes  # noqa
-from . import color, geomhelper, miscutils, options, route  # noqa
-from .xml import writeHeader as writeXMLHeader  # noqa
+# submodules are imported on first access (sumolib.net, ...), most users need only a few of them
+_SUBMODULES = ("files", "net", "output", "sensors", "shapes", "color", "geomhelper", "miscutils", "options",
+               "route", "visualization", "xml")
+
+
+def __getattr__(name):
+    if name == "writeXMLHeader":
+        return __getattr__("xml").writeHeader
+    if name not in _SUBMODULES:
+        raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+    try:
+        return importlib.import_module("." + name, __name__)
+    except ImportError as e:
+        if name != "visualization":
+            raise
+        warnings.warn(str(e))
+        raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # no module level __getattr__
+    try:
+        from . import visualization  # noqa
+    except ImportError as e:
+        warnings.warn(str(e))
+    from . import files, net, output, sensors, shapes  # noqa
+    from . import color, geomhelper, miscutils, options, route  # noqa
+    from .xml import writeHeader as writeXMLHeader  # noqa
 
 
 class ConfigurationReader(handler.ContentHandler):
@@ -20,11 +20,27 @@ from __future__ import absolute_import
 import os
 import warnings
 
+_main = None
 if 'LIBSUMO_AS_TRACI' not in os.environ:
     from .main import *  # noqa
+    from . import main as _main
 else:
     try:
         from libsumo import *  # noqa
     except ImportError:
         warnings.warn("Could not import libsumo, falling back to standard traci.")
         from .main import *  # noqa
+        from . import main as _main
+
+
+def __getattr__(name):
+    # the domains (traci.vehicle, ...) are loaded on first access, see main.__getattr__
+    if _main is None or name not in _main._DOMAIN_MODULES:
+        raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+    domain = getattr(_main, name)
+    globals()[name] = domain
+    return domain
+
+
+def __dir__():
+    return sorted(set(globals()) | (set() if _main is None else set(_main._DOMAIN_MODULES)))
@@ -14,7 +14,6 @@
 # @version $Id$
 
 from __future__ import absolute_import
-import struct
 from . import constants as tc
 from .domain import Domain
 from .storage import Storage
@@ -61,7 +60,7 @@ class EdgeDomain(Domain):
         """
         self._connection._beginMessage(tc.CMD_GET_EDGE_VARIABLE, tc.VAR_EDGE_TRAVELTIME,
                                        edgeID, 1 + 8)
-        self._connection._string += struct.pack(
+        self._connection._message.pack(
             "!Bd", tc.TYPE_DOUBLE, time)
         return self._connection._checkResult(tc.CMD_GET_EDGE_VARIABLE,
                                              tc.VAR_EDGE_TRAVELTIME, edgeID).readDouble()
@@ -81,7 +80,7 @@ class EdgeDomain(Domain):
         """
         self._connection._beginMessage(tc.CMD_GET_EDGE_VARIABLE, tc.VAR_EDGE_EFFORT,
                                        edgeID, 1 + 8)
-        self._connection._string += struct.pack(
+        self._connection._message.pack(
             "!Bd", tc.TYPE_DOUBLE, time)
         return self._connection._checkResult(tc.CMD_GET_EDGE_VARIABLE,
                                              tc.VAR_EDGE_EFFORT, edgeID).readDouble()
@@ -224,18 +223,18 @@ class EdgeDomain(Domain):
         if begin is None and end is None:
             self._connection._beginMessage(
                 tc.CMD_SET_EDGE_VARIABLE, tc.VAR_EDGE_TRAVELTIME, edgeID, 1 + 4 + 1 + 8)
-            self._connection._string += struct.pack("!BiBd",
-                                                    tc.TYPE_COMPOUND, 1, tc.TYPE_DOUBLE, time)
-            self._connection._sendExact()
+            self._connection._message.pack("!BiBd",
+                                           tc.TYPE_COMPOUND, 1, tc.TYPE_DOUBLE, time)
+            self._connection._sendDeferrable()
         elif begin is not None and end is not None:
             self._connection._beginMessage(
                 tc.CMD_SET_EDGE_VARIABLE, tc.VAR_EDGE_TRAVELTIME, edgeID, 1 + 4 + 1 + 8 + 1 + 8 + 1 + 8)
-            self._connection._string += struct.pack("!BiBdBdBd",
-                                                    tc.TYPE_COMPOUND, 3,
-                                                    tc.TYPE_DOUBLE, begin,
-                                                    tc.TYPE_DOUBLE, end,
-                                                    tc.TYPE_DOUBLE, time)
-            self._connection._sendExact()
+            self._connection._message.pack("!BiBdBdBd",
+                                           tc.TYPE_COMPOUND, 3,
+                                           tc.TYPE_DOUBLE, begin,
+                                           tc.TYPE_DOUBLE, end,
+                                           tc.TYPE_DOUBLE, time)
+            self._connection._sendDeferrable()
         else:
             raise TraCIException("Both, begin time and end time must be specified")
 
@@ -250,18 +249,18 @@ class EdgeDomain(Domain):
         if begin is None and end is None:
             self._connection._beginMessage(
                 tc.CMD_SET_EDGE_VARIABLE, tc.VAR_EDGE_EFFORT, edgeID, 1 + 4 + 1 + 8)
-            self._connection._string += struct.pack("!BiBd",
-                                                    tc.TYPE_COMPOUND, 1, tc.TYPE_DOUBLE, effort)
-            self._connection._sendExact()
+            self._connection._message.pack("!BiBd",
+                                           tc.TYPE_COMPOUND, 1, tc.TYPE_DOUBLE, effort)
+            self._connection._sendDeferrable()
         elif begin is not None and end is not None:
             self._connection._beginMessage(
                 tc.CMD_SET_EDGE_VARIABLE, tc.VAR_EDGE_EFFORT, edgeID, 1 + 4 + 1 + 8 + 1 + 8 + 1 + 8)
-            self._connection._string += struct.pack("!BiBdBdBd",
-                                                    tc.TYPE_COMPOUND, 3,
-                                                    tc.TYPE_DOUBLE, begin,
-                                                    tc.TYPE_DOUBLE, end,
-                                                    tc.TYPE_DOUBLE, effort)
-            self._connection._sendExact()
+            self._connection._message.pack("!BiBdBdBd",
+                                           tc.TYPE_COMPOUND, 3,
+                                           tc.TYPE_DOUBLE, begin,
+                                           tc.TYPE_DOUBLE, end,
+                                           tc.TYPE_DOUBLE, effort)
+            self._connection._sendDeferrable()
         else:
             raise TraCIException("Both, begin time and end time must be specified")
 
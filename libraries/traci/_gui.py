@@ -14,7 +14,6 @@
 # @version $Id$
 
 from __future__ import absolute_import
-import struct
 from .domain import Domain
 from .storage import Storage
 from . import constants as tc
@@ -79,8 +78,8 @@ class GuiDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_GUI_VARIABLE, tc.VAR_VIEW_OFFSET, viewID, 1 + 8 + 8)
-        self._connection._string += struct.pack("!Bdd", tc.POSITION_2D, x, y)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bdd", tc.POSITION_2D, x, y)
+        self._connection._sendDeferrable()
 
     def setSchema(self, viewID, schemeName):
         """setSchema(string, string) -> None
@@ -98,8 +97,8 @@ class GuiDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_GUI_VARIABLE, tc.VAR_VIEW_BOUNDARY, viewID, 1 + 1 + 8 + 8 + 8 + 8)
-        self._connection._string += struct.pack("!BBdddd", tc.TYPE_POLYGON, 2, xmin, ymin, xmax, ymax)
-        self._connection._sendExact()
+        self._connection._message.pack("!BBdddd", tc.TYPE_POLYGON, 2, xmin, ymin, xmax, ymax)
+        self._connection._sendDeferrable()
 
     def screenshot(self, viewID, filename, width=-1, height=-1):
         """screenshot(string, string, int, int) -> None
@@ -112,10 +111,10 @@ class GuiDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_GUI_VARIABLE, tc.VAR_SCREENSHOT, viewID, 1 + 4 + 1 + 4 + len(filename) + 1 + 4 + 1 + 4)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 3)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 3)
         self._connection._packString(filename)
-        self._connection._string += struct.pack("!BiBi", tc.TYPE_INTEGER, width, tc.TYPE_INTEGER, height)
-        self._connection._sendExact()
+        self._connection._message.pack("!BiBi", tc.TYPE_INTEGER, width, tc.TYPE_INTEGER, height)
+        self._connection._sendDeferrable()
 
     def trackVehicle(self, viewID, vehID):
         """trackVehicle(string, string) -> None
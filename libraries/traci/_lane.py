@@ -293,7 +293,7 @@ class LaneDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_LANE_VARIABLE, tc.LANE_ALLOWED, laneID,
                                        1 + 4 + sum(map(len, allowedClasses)) + 4 * len(allowedClasses))
         self._connection._packStringList(allowedClasses)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def setDisallowed(self, laneID, disallowedClasses):
         """setDisallowed(string, list) -> None
@@ -305,7 +305,7 @@ class LaneDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_LANE_VARIABLE, tc.LANE_DISALLOWED, laneID,
                                        1 + 4 + sum(map(len, disallowedClasses)) + 4 * len(disallowedClasses))
         self._connection._packStringList(disallowedClasses)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def setMaxSpeed(self, laneID, speed):
         """setMaxSpeed(string, double) -> None
@@ -13,7 +13,6 @@
 # @version $Id$
 
 from __future__ import absolute_import
-import struct
 from .domain import Domain
 from .storage import Storage
 from . import constants as tc
@@ -164,8 +163,8 @@ class PersonDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_GET_PERSON_VARIABLE, tc.VAR_EDGES, personID, 1 + 4)
-        self._connection._string += struct.pack("!Bi",
-                                                tc.TYPE_INTEGER, nextStageIndex)
+        self._connection._message.pack("!Bi",
+                                       tc.TYPE_INTEGER, nextStageIndex)
         return self._connection._checkResult(tc.CMD_GET_PERSON_VARIABLE,
                                              tc.VAR_EDGES, personID).readStringList()
 
@@ -183,8 +182,8 @@ class PersonDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_GET_PERSON_VARIABLE, tc.VAR_STAGE, personID, 1 + 4)
-        self._connection._string += struct.pack("!Bi",
-                                                tc.TYPE_INTEGER, nextStageIndex)
+        self._connection._message.pack("!Bi",
+                                       tc.TYPE_INTEGER, nextStageIndex)
         return simulation._readStage(self._connection._checkResult(tc.CMD_GET_PERSON_VARIABLE,
                                                                    tc.VAR_STAGE, personID))
 
@@ -220,12 +219,12 @@ class PersonDomain(Domain):
         """
         self._connection._beginMessage(tc.CMD_SET_PERSON_VARIABLE, tc.ADD, personID,
                                        1 + 4 + 1 + 4 + len(typeID) + 1 + 4 + len(edgeID) + 1 + 8 + 1 + 8)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 4)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 4)
         self._connection._packString(typeID)
         self._connection._packString(edgeID)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, depart)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, pos)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, depart)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, pos)
+        self._connection._sendDeferrable()
 
     def appendWaitingStage(self, personID, duration, description="waiting", stopID=""):
         """appendWaitingStage(string, float, string, string)
@@ -237,14 +236,14 @@ class PersonDomain(Domain):
                                        1 + 8 +  # duration
                                        1 + 4 + len(description) +
                                        1 + 4 + len(stopID))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 4)
-        self._connection._string += struct.pack(
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 4)
+        self._connection._message.pack(
             "!Bi", tc.TYPE_INTEGER, tc.STAGE_WAITING)
-        self._connection._string += struct.pack("!Bd",
-                                                tc.TYPE_DOUBLE, duration)
+        self._connection._message.pack("!Bd",
+                                       tc.TYPE_DOUBLE, duration)
         self._connection._packString(description)
         self._connection._packString(stopID)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def appendWalkingStage(self, personID, edges, arrivalPos, duration=-1, speed=-1, stopID=""):
         """appendWalkingStage(string, stringList, double, double, double, string)
@@ -264,17 +263,17 @@ class PersonDomain(Domain):
                                        1 + 8 +  # speed
                                        1 + 4 + len(stopID)
                                        )
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 6)
-        self._connection._string += struct.pack(
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 6)
+        self._connection._message.pack(
             "!Bi", tc.TYPE_INTEGER, tc.STAGE_WALKING)
         self._connection._packStringList(edges)
-        self._connection._string += struct.pack("!Bd",
-                                                tc.TYPE_DOUBLE, arrivalPos)
-        self._connection._string += struct.pack("!Bd",
-                                                tc.TYPE_DOUBLE, duration)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, speed)
+        self._connection._message.pack("!Bd",
+                                       tc.TYPE_DOUBLE, arrivalPos)
+        self._connection._message.pack("!Bd",
+                                       tc.TYPE_DOUBLE, duration)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, speed)
         self._connection._packString(stopID)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def appendStage(self, personID, stage):
         """appendStage(string, stage)
@@ -284,7 +283,7 @@ class PersonDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_PERSON_VARIABLE, tc.APPEND_STAGE,
                                        personID, simulation._stageSize(stage))
         simulation._writeStage(stage, self._connection)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def replaceStage(self, personID, stageIndex, stage):
         """replaceStage(string, int, stage)
@@ -296,10 +295,10 @@ class PersonDomain(Domain):
                    + simulation._stageSize(stage))
 
         self._connection._beginMessage(tc.CMD_SET_PERSON_VARIABLE, tc.REPLACE_STAGE, personID, msgSize)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, stageIndex)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, stageIndex)
         simulation._writeStage(stage, self._connection)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def appendDrivingStage(self, personID, toEdge, lines, stopID=""):
         """appendDrivingStage(string, string, string, string)
@@ -312,13 +311,13 @@ class PersonDomain(Domain):
                                        1 + 4 + len(toEdge) +
                                        1 + 4 + len(lines) +
                                        1 + 4 + len(stopID))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 4)
-        self._connection._string += struct.pack(
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 4)
+        self._connection._message.pack(
             "!Bi", tc.TYPE_INTEGER, tc.STAGE_DRIVING)
         self._connection._packString(toEdge)
         self._connection._packString(lines)
         self._connection._packString(stopID)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def removeStage(self, personID, nextStageIndex):
         """removeStage(string, int)
@@ -328,17 +327,17 @@ class PersonDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_PERSON_VARIABLE, tc.REMOVE_STAGE, personID, 1 + 4)
-        self._connection._string += struct.pack("!Bi",
-                                                tc.TYPE_INTEGER, nextStageIndex)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bi",
+                                       tc.TYPE_INTEGER, nextStageIndex)
+        self._connection._sendDeferrable()
 
     def rerouteTraveltime(self, personID):
         """rerouteTraveltime(string) -> None Reroutes a pedestrian (walking person).
         """
         self._connection._beginMessage(
             tc.CMD_SET_PERSON_VARIABLE, tc.CMD_REROUTE_TRAVELTIME, personID, 1 + 4)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 0)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 0)
+        self._connection._sendDeferrable()
 
     def moveToXY(self, personID, edgeID, x, y, angle=tc.INVALID_DOUBLE_VALUE, keepRoute=1):
         '''Place person at the given x,y coordinates and force it's angle to
@@ -353,13 +352,13 @@ class PersonDomain(Domain):
         edgeID is an optional placement hint to resolve ambiguities'''
         self._connection._beginMessage(tc.CMD_SET_PERSON_VARIABLE, tc.MOVE_TO_XY,
                                        personID, 1 + 4 + 1 + 4 + len(edgeID) + 1 + 8 + 1 + 8 + 1 + 8 + 1 + 1)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 5)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 5)
         self._connection._packString(edgeID)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, x)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, y)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, angle)
-        self._connection._string += struct.pack("!BB", tc.TYPE_BYTE, keepRoute)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, x)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, y)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, angle)
+        self._connection._message.pack("!BB", tc.TYPE_BYTE, keepRoute)
+        self._connection._sendDeferrable()
 
     def setSpeed(self, personID, speed):
         """setSpeed(string, double) -> None
@@ -417,6 +416,6 @@ class PersonDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_PERSON_VARIABLE, tc.VAR_COLOR, personID, 1 + 1 + 1 + 1 + 1)
-        self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
-                                                int(color[3]) if len(color) > 3 else 255)
-        self._connection._sendExact()
+        self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
+                                       int(color[3]) if len(color) > 3 else 255)
+        self._connection._sendDeferrable()
@@ -14,7 +14,6 @@
 # @version $Id$
 
 from __future__ import absolute_import
-import struct
 from .domain import Domain
 from .storage import Storage
 from . import constants as tc
@@ -96,7 +95,7 @@ class PoiDomain(Domain):
         self._connection._beginMessage(
             tc.CMD_SET_POI_VARIABLE, tc.VAR_TYPE, poiID, 1 + 4 + len(poiType))
         self._connection._packString(poiType)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def setPosition(self, poiID, x, y):
         """setPosition(string, (double, double)) -> None
@@ -105,8 +104,8 @@ class PoiDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_POI_VARIABLE, tc.VAR_POSITION, poiID, 1 + 8 + 8)
-        self._connection._string += struct.pack("!Bdd", tc.POSITION_2D, x, y)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bdd", tc.POSITION_2D, x, y)
+        self._connection._sendDeferrable()
 
     def setColor(self, poiID, color):
         """setColor(string, (integer, integer, integer, integer)) -> None
@@ -116,9 +115,9 @@ class PoiDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_POI_VARIABLE, tc.VAR_COLOR, poiID, 1 + 1 + 1 + 1 + 1)
-        self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
-                                                int(color[3]) if len(color) > 3 else 255)
-        self._connection._sendExact()
+        self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
+                                       int(color[3]) if len(color) > 3 else 255)
+        self._connection._sendDeferrable()
 
     def setWidth(self, poiID, width):
         """setWidth(string, double) -> None
@@ -127,8 +126,8 @@ class PoiDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_POI_VARIABLE, tc.VAR_WIDTH, poiID, 1 + 8)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, width)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, width)
+        self._connection._sendDeferrable()
 
     def setHeight(self, poiID, height):
         """setHeight(string, double) -> None
@@ -136,8 +135,8 @@ class PoiDomain(Domain):
         Sets the height of the poi.
         """
         self._connection._beginMessage(tc.CMD_SET_POI_VARIABLE, tc.VAR_HEIGHT, poiID, 1 + 8)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, height)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, height)
+        self._connection._sendDeferrable()
 
     def setAngle(self, poiID, angle):
         """setAngle(string, double) -> None
@@ -145,8 +144,8 @@ class PoiDomain(Domain):
         Sets the angle of the poi.
         """
         self._connection._beginMessage(tc.CMD_SET_POI_VARIABLE, tc.VAR_ANGLE, poiID, 1 + 8)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, angle)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, angle)
+        self._connection._sendDeferrable()
 
     def setImageFile(self, poiID, imageFile):
         """setImageFile(string, string) -> None
@@ -156,28 +155,28 @@ class PoiDomain(Domain):
         self._connection._beginMessage(
             tc.CMD_SET_POI_VARIABLE, tc.VAR_IMAGEFILE, poiID, 1 + 4 + len(imageFile))
         self._connection._packString(imageFile)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def add(self, poiID, x, y, color, poiType="", layer=0, imgFile="", width=1, height=1, angle=0):
         self._connection._beginMessage(tc.CMD_SET_POI_VARIABLE, tc.ADD, poiID, 1 + 4 + 1 + 4 + len(poiType) +
                                        1 + 1 + 1 + 1 + 1 + 1 + 4 + 1 + 8 + 8 + 1 + 4 + len(imgFile) +
                                        1 + 8 + 1 + 8 + 1 + 8)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 8)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 8)
         self._connection._packString(poiType)
-        self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
-                                                int(color[3]) if len(color) > 3 else 255)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, layer)
-        self._connection._string += struct.pack("!Bdd", tc.POSITION_2D, x, y)
+        self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
+                                       int(color[3]) if len(color) > 3 else 255)
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, layer)
+        self._connection._message.pack("!Bdd", tc.POSITION_2D, x, y)
         self._connection._packString(imgFile)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, width)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, height)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, angle)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, width)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, height)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, angle)
+        self._connection._sendDeferrable()
 
     def remove(self, poiID, layer=0):
         self._connection._beginMessage(tc.CMD_SET_POI_VARIABLE, tc.REMOVE, poiID, 1 + 4)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, layer)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, layer)
+        self._connection._sendDeferrable()
 
     def highlight(self, poiID, color=(255, 0, 0, 255), size=-1, alphaMax=-1, duration=-1, type=0):
         """ highlight(string, color, float, ubyte) -> void
@@ -221,15 +220,15 @@ class PoiDomain(Domain):
             color = (255, 0, 0, 255)
 
         self._connection._beginMessage(tc.CMD_SET_POI_VARIABLE, tc.VAR_HIGHLIGHT, poiID, msg_length)
-        self._connection._string += struct.pack("!BB", tc.TYPE_COMPOUND, compoundLength)
+        self._connection._message.pack("!BB", tc.TYPE_COMPOUND, compoundLength)
         if compoundLength >= 1:
-            self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]),
-                                                    int(color[2]), int(color[3]) if len(color) > 3 else 255)
+            self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]),
+                                           int(color[2]), int(color[3]) if len(color) > 3 else 255)
         if compoundLength >= 2:
-            self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, size)
+            self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, size)
         if compoundLength >= 3:
-            self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, alphaMax)
-            self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, duration)
+            self._connection._message.pack("!BB", tc.TYPE_UBYTE, alphaMax)
+            self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, duration)
         if compoundLength >= 5:
-            self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, type)
-        self._connection._sendExact()
+            self._connection._message.pack("!BB", tc.TYPE_UBYTE, type)
+        self._connection._sendDeferrable()
@@ -13,7 +13,6 @@
 # @version $Id$
 
 from __future__ import absolute_import
-import struct
 from .domain import Domain
 from .storage import Storage
 from . import constants as tc
@@ -74,7 +73,7 @@ class PolygonDomain(Domain):
         self._connection._beginMessage(
             tc.CMD_SET_POLYGON_VARIABLE, tc.VAR_TYPE, polygonID, 1 + 4 + len(polygonType))
         self._connection._packString(polygonType)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def setShape(self, polygonID, shape):
         """setShape(string, list((double, double))) -> None
@@ -83,11 +82,11 @@ class PolygonDomain(Domain):
         """
         self._connection._beginMessage(tc.CMD_SET_POLYGON_VARIABLE,
                                        tc.VAR_SHAPE, polygonID, 1 + 1 + len(shape) * (8 + 8))
-        self._connection._string += struct.pack("!BB",
-                                                tc.TYPE_POLYGON, len(shape))
+        self._connection._message.pack("!BB",
+                                       tc.TYPE_POLYGON, len(shape))
         for p in shape:
-            self._connection._string += struct.pack("!dd", *p)
-        self._connection._sendExact()
+            self._connection._message.pack("!dd", *p)
+        self._connection._sendDeferrable()
 
     def setColor(self, polygonID, color):
         """setColor(string, (integer, integer, integer, integer)) -> None
@@ -97,9 +96,9 @@ class PolygonDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_POLYGON_VARIABLE, tc.VAR_COLOR, polygonID, 1 + 1 + 1 + 1 + 1)
-        self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
-                                                int(color[3]) if len(color) > 3 else 255)
-        self._connection._sendExact()
+        self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
+                                       int(color[3]) if len(color) > 3 else 255)
+        self._connection._sendDeferrable()
 
     def setFilled(self, polygonID, filled):
         """setFilled(string, bool) -> None
@@ -120,19 +119,19 @@ class PolygonDomain(Domain):
                                        len(polygonType) + 1 + 1 + 1 + 1 + 1 + 1 + 1 + 1 + 4 + 1 + 1 +
                                        len(shape) * (8 + 8) +
                                        1 + 8)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 6)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 6)
         self._connection._packString(polygonType)
-        self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
-                                                int(color[3]) if len(color) > 3 else 255)
-        self._connection._string += struct.pack("!BB",
-                                                tc.TYPE_UBYTE, int(fill))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, layer)
-        self._connection._string += struct.pack("!BB",
-                                                tc.TYPE_POLYGON, len(shape))
+        self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
+                                       int(color[3]) if len(color) > 3 else 255)
+        self._connection._message.pack("!BB",
+                                       tc.TYPE_UBYTE, int(fill))
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, layer)
+        self._connection._message.pack("!BB",
+                                       tc.TYPE_POLYGON, len(shape))
         for p in shape:
-            self._connection._string += struct.pack("!dd", *p)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, lineWidth)
-        self._connection._sendExact()
+            self._connection._message.pack("!dd", *p)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, lineWidth)
+        self._connection._sendDeferrable()
 
     def addDynamics(self, polygonID, trackedObjectID="", timeSpan=(), alphaSpan=(), looped=False, rotate=True):
         """ addDynamics(string, string, list(float), list(float), bool) -> void
@@ -156,16 +155,16 @@ class PolygonDomain(Domain):
             + 1 + 1 \
             + 1 + 1
         self._connection._beginMessage(tc.CMD_SET_POLYGON_VARIABLE, tc.VAR_ADD_DYNAMICS, polygonID, msg_length)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 5)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 5)
         self._connection._packString(trackedObjectID)
         self._connection._packDoubleList(timeSpan)
         self._connection._packDoubleList(alphaSpan)
-        self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, looped)
-        self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, rotate)
-        self._connection._sendExact()
+        self._connection._message.pack("!BB", tc.TYPE_UBYTE, looped)
+        self._connection._message.pack("!BB", tc.TYPE_UBYTE, rotate)
+        self._connection._sendDeferrable()
 
     def remove(self, polygonID, layer=0):
         self._connection._beginMessage(
             tc.CMD_SET_POLYGON_VARIABLE, tc.REMOVE, polygonID, 1 + 4)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, layer)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, layer)
+        self._connection._sendDeferrable()
@@ -44,4 +44,4 @@ class RouteDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_ROUTE_VARIABLE, tc.ADD, routeID,
                                        1 + 4 + sum(map(len, edges)) + 4 * len(edges))
         self._connection._packStringList(edges)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
@@ -15,7 +15,6 @@
 # @version $Id$
 
 from __future__ import absolute_import
-import struct
 import warnings
 from . import constants as tc
 from .domain import Domain
@@ -104,19 +103,19 @@ def _stageSize(stage):
 
 
 def _writeStage(stage, connection):
-    connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 13)
-    connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, stage.type)
+    connection._message.pack("!Bi", tc.TYPE_COMPOUND, 13)
+    connection._message.pack("!Bi", tc.TYPE_INTEGER, stage.type)
     connection._packString(stage.vType)
     connection._packString(stage.line)
     connection._packString(stage.destStop)
     connection._packStringList(stage.edges)
-    connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, stage.travelTime)
-    connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, stage.cost)
-    connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, stage.length)
+    connection._message.pack("!Bd", tc.TYPE_DOUBLE, stage.travelTime)
+    connection._message.pack("!Bd", tc.TYPE_DOUBLE, stage.cost)
+    connection._message.pack("!Bd", tc.TYPE_DOUBLE, stage.length)
     connection._packString(stage.intended)
-    connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, stage.depart)
-    connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, stage.departPos)
-    connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, stage.arrivalPos)
+    connection._message.pack("!Bd", tc.TYPE_DOUBLE, stage.depart)
+    connection._message.pack("!Bd", tc.TYPE_DOUBLE, stage.departPos)
+    connection._message.pack("!Bd", tc.TYPE_DOUBLE, stage.arrivalPos)
     connection._packString(stage.description)
 
 
@@ -393,10 +392,10 @@ class SimulationDomain(Domain):
             posType = tc.POSITION_LON_LAT
         self._connection._beginMessage(tc.CMD_GET_SIM_VARIABLE, tc.POSITION_CONVERSION,
                                        "", 1 + 4 + 1 + 4 + len(edgeID) + 8 + 1 + 1 + 1)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
         self._connection._packString(edgeID, tc.POSITION_ROADMAP)
-        self._connection._string += struct.pack("!dBBB",
-                                                pos, laneIndex, tc.TYPE_UBYTE, posType)
+        self._connection._message.pack("!dBBB",
+                                       pos, laneIndex, tc.TYPE_UBYTE, posType)
         return self._connection._checkResult(tc.CMD_GET_SIM_VARIABLE, tc.POSITION_CONVERSION, "").read("!dd")
 
     def convert3D(self, edgeID, pos, laneIndex=0, toGeo=False):
@@ -405,10 +404,10 @@ class SimulationDomain(Domain):
             posType = tc.POSITION_LON_LAT_ALT
         self._connection._beginMessage(tc.CMD_GET_SIM_VARIABLE, tc.POSITION_CONVERSION,
                                        "", 1 + 4 + 1 + 4 + len(edgeID) + 8 + 1 + 1 + 1)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
         self._connection._packString(edgeID, tc.POSITION_ROADMAP)
-        self._connection._string += struct.pack("!dBBB",
-                                                pos, laneIndex, tc.TYPE_UBYTE, posType)
+        self._connection._message.pack("!dBBB",
+                                       pos, laneIndex, tc.TYPE_UBYTE, posType)
         return self._connection._checkResult(tc.CMD_GET_SIM_VARIABLE, tc.POSITION_CONVERSION, "").read("!ddd")
 
     def convertRoad(self, x, y, isGeo=False, vClass="ignoring"):
@@ -417,9 +416,9 @@ class SimulationDomain(Domain):
             posType = tc.POSITION_LON_LAT
         self._connection._beginMessage(
             tc.CMD_GET_SIM_VARIABLE, tc.POSITION_CONVERSION, "", 1 + 4 + 1 + 8 + 8 + 1 + 1 + 1 + 4 + len(vClass))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 3)
-        self._connection._string += struct.pack("!Bdd", posType, x, y)
-        self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, tc.POSITION_ROADMAP)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 3)
+        self._connection._message.pack("!Bdd", posType, x, y)
+        self._connection._message.pack("!BB", tc.TYPE_UBYTE, tc.POSITION_ROADMAP)
         self._connection._packString(vClass)
         result = self._connection._checkResult(
             tc.CMD_GET_SIM_VARIABLE, tc.POSITION_CONVERSION, "")
@@ -433,9 +432,9 @@ class SimulationDomain(Domain):
             toType = tc.POSITION_2D
         self._connection._beginMessage(
             tc.CMD_GET_SIM_VARIABLE, tc.POSITION_CONVERSION, "", 1 + 4 + 1 + 8 + 8 + 1 + 1)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
-        self._connection._string += struct.pack("!Bdd", fromType, x, y)
-        self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, toType)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
+        self._connection._message.pack("!Bdd", fromType, x, y)
+        self._connection._message.pack("!BB", tc.TYPE_UBYTE, toType)
         return self._connection._checkResult(tc.CMD_GET_SIM_VARIABLE, tc.POSITION_CONVERSION, "").read("!dd")
 
     def getDistance2D(self, x1, y1, x2, y2, isGeo=False, isDriving=False):
@@ -458,9 +457,9 @@ class SimulationDomain(Domain):
             distType = tc.REQUEST_DRIVINGDIST
         self._connection._beginMessage(
             tc.CMD_GET_SIM_VARIABLE, tc.DISTANCE_REQUEST, "", 1 + 4 + 1 + 8 + 8 + 1 + 8 + 8 + 1)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 3)
-        self._connection._string += struct.pack("!Bdd", posType, x1, y1)
-        self._connection._string += struct.pack(
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 3)
+        self._connection._message.pack("!Bdd", posType, x1, y1)
+        self._connection._message.pack(
             "!BddB", posType, x2, y2, distType)
         return self._connection._checkResult(tc.CMD_GET_SIM_VARIABLE, tc.DISTANCE_REQUEST, "").readDouble()
 
@@ -475,22 +474,22 @@ class SimulationDomain(Domain):
             distType = tc.REQUEST_DRIVINGDIST
         self._connection._beginMessage(tc.CMD_GET_SIM_VARIABLE, tc.DISTANCE_REQUEST, "",
                                        1 + 4 + 1 + 4 + len(edgeID1) + 8 + 1 + 1 + 4 + len(edgeID2) + 8 + 1 + 1)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 3)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 3)
         self._connection._packString(edgeID1, tc.POSITION_ROADMAP)
-        self._connection._string += struct.pack("!dB", pos1, 0)
+        self._connection._message.pack("!dB", pos1, 0)
         self._connection._packString(edgeID2, tc.POSITION_ROADMAP)
-        self._connection._string += struct.pack("!dBB", pos2, 0, distType)
+        self._connection._message.pack("!dBB", pos2, 0, distType)
         return self._connection._checkResult(tc.CMD_GET_SIM_VARIABLE, tc.DISTANCE_REQUEST, "").readDouble()
 
     def findRoute(self, fromEdge, toEdge, vType="", depart=-1., routingMode=0):
         self._connection._beginMessage(tc.CMD_GET_SIM_VARIABLE, tc.FIND_ROUTE, "",
                                        (1 + 4 + 1 + 4 + len(fromEdge) + 1 + 4 + len(toEdge) + 1 + 4 + len(vType) +
                                         1 + 8 + 1 + 4))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 5)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 5)
         self._connection._packString(fromEdge)
         self._connection._packString(toEdge)
         self._connection._packString(vType)
-        self._connection._string += struct.pack("!BdBi", tc.TYPE_DOUBLE, depart, tc.TYPE_INTEGER, routingMode)
+        self._connection._message.pack("!BdBi", tc.TYPE_DOUBLE, depart, tc.TYPE_INTEGER, routingMode)
         return _readStage(self._connection._checkResult(tc.CMD_GET_SIM_VARIABLE, tc.FIND_ROUTE, ""))
 
     def findIntermodalRoute(self, fromEdge, toEdge, modes="", depart=-1., routingMode=0, speed=-1.,
@@ -500,14 +499,14 @@ class SimulationDomain(Domain):
                                        1 + 4 + 1 + 4 + len(fromEdge) + 1 + 4 + len(toEdge) + 1 + 4 + len(modes) +
                                        1 + 8 + 1 + 4 + 1 + 8 + 1 + 8 + 1 + 8 + 1 + 8 + 1 + 8 + 1 + 4 + len(pType) +
                                        1 + 4 + len(vType) + 1 + 4 + len(destStop))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 13)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 13)
         self._connection._packString(fromEdge)
         self._connection._packString(toEdge)
         self._connection._packString(modes)
-        self._connection._string += struct.pack("!BdBi", tc.TYPE_DOUBLE, depart, tc.TYPE_INTEGER, routingMode)
-        self._connection._string += struct.pack("!BdBd", tc.TYPE_DOUBLE, speed, tc.TYPE_DOUBLE, walkFactor)
-        self._connection._string += struct.pack("!BdBd", tc.TYPE_DOUBLE, departPos, tc.TYPE_DOUBLE, arrivalPos)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, departPosLat)
+        self._connection._message.pack("!BdBi", tc.TYPE_DOUBLE, depart, tc.TYPE_INTEGER, routingMode)
+        self._connection._message.pack("!BdBd", tc.TYPE_DOUBLE, speed, tc.TYPE_DOUBLE, walkFactor)
+        self._connection._message.pack("!BdBd", tc.TYPE_DOUBLE, departPos, tc.TYPE_DOUBLE, arrivalPos)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, departPosLat)
         self._connection._packString(pType)
         self._connection._packString(vType)
         self._connection._packString(destStop)
@@ -522,20 +521,20 @@ class SimulationDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_SIM_VARIABLE, tc.CMD_CLEAR_PENDING_VEHICLES, "",
                                        1 + 4 + len(routeID))
         self._connection._packString(routeID)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def saveState(self, fileName):
         self._connection._beginMessage(tc.CMD_SET_SIM_VARIABLE, tc.CMD_SAVE_SIMSTATE, "",
                                        1 + 4 + len(fileName))
         self._connection._packString(fileName)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def subscribe(self, varIDs=(tc.VAR_DEPARTED_VEHICLES_IDS,), begin=0, end=2**31 - 1):
         """subscribe(list(integer), double, double) -> None
 
         Subscribe to one or more simulation values for the given interval.
         """
-        Domain.subscribe(self, "", varIDs, begin, end)
+        return Domain.subscribe(self, "", varIDs, begin, end)
 
     def getSubscriptionResults(self):
         """getSubscriptionResults() -> dict(integer: <value_type>)
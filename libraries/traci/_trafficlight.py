@@ -13,7 +13,6 @@
 # @version $Id$
 
 from __future__ import absolute_import
-import struct
 from .domain import Domain
 from .storage import Storage
 from . import constants as tc
@@ -282,21 +281,21 @@ class TrafficLightDomain(Domain):
             length += 1 + 4 + 4 + len(k) + 4 + len(v)
         self._connection._beginMessage(
             tc.CMD_SET_TL_VARIABLE, tc.TL_COMPLETE_PROGRAM_RYG, tlsID, length)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 5)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 5)
         self._connection._packString(tls.programID)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, tls.type)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, tls.currentPhaseIndex)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, len(tls.phases))
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, tls.type)
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, tls.currentPhaseIndex)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, len(tls.phases))
         for p in tls.phases:
-            self._connection._string += struct.pack("!BiBd", tc.TYPE_COMPOUND, 6, tc.TYPE_DOUBLE, p.duration)
+            self._connection._message.pack("!BiBd", tc.TYPE_COMPOUND, 6, tc.TYPE_DOUBLE, p.duration)
             self._connection._packString(p.state)
-            self._connection._string += struct.pack("!BdBd", tc.TYPE_DOUBLE, p.minDur, tc.TYPE_DOUBLE, p.maxDur)
-            self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, len(p.next))
+            self._connection._message.pack("!BdBd", tc.TYPE_DOUBLE, p.minDur, tc.TYPE_DOUBLE, p.maxDur)
+            self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, len(p.next))
             for n in p.next:
-                self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, n)
+                self._connection._message.pack("!Bi", tc.TYPE_INTEGER, n)
             self._connection._packString(p.name)
         # subparams
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, len(tls.subParameter))
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, len(tls.subParameter))
         for par in tls.subParameter.items():
             self._connection._packStringList(par)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
@@ -405,7 +405,7 @@ class VehicleDomain(Domain):
         """
         self._connection._beginMessage(tc.CMD_GET_VEHICLE_VARIABLE,
                                        tc.VAR_EDGE_TRAVELTIME, vehID, 1 + 4 + 1 + 8 + 1 + 4 + len(edgeID))
-        self._connection._string += struct.pack(
+        self._connection._message.pack(
             "!BiBd", tc.TYPE_COMPOUND, 2, tc.TYPE_DOUBLE, time)
         self._connection._packString(edgeID)
         return self._connection._checkResult(tc.CMD_GET_VEHICLE_VARIABLE, tc.VAR_EDGE_TRAVELTIME, vehID).readDouble()
@@ -417,7 +417,7 @@ class VehicleDomain(Domain):
         """
         self._connection._beginMessage(tc.CMD_GET_VEHICLE_VARIABLE,
                                        tc.VAR_EDGE_EFFORT, vehID, 1 + 4 + 1 + 8 + 1 + 4 + len(edgeID))
-        self._connection._string += struct.pack(
+        self._connection._message.pack(
             "!BiBd", tc.TYPE_COMPOUND, 2, tc.TYPE_DOUBLE, time)
         self._connection._packString(edgeID)
         return self._connection._checkResult(tc.CMD_GET_VEHICLE_VARIABLE, tc.VAR_EDGE_EFFORT, vehID).readDouble()
@@ -664,7 +664,7 @@ class VehicleDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_GET_VEHICLE_VARIABLE, tc.VAR_LEADER, vehID, 1 + 8)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, dist)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, dist)
         return _readLeader(self._connection._checkResult(tc.CMD_GET_VEHICLE_VARIABLE, tc.VAR_LEADER, vehID))
 
     def getRightFollowers(self, vehID, blockingOnly=False):
@@ -725,7 +725,7 @@ class VehicleDomain(Domain):
         none is returned (in case !LCA_BLOCKED).
         """
         self._connection._beginMessage(tc.CMD_GET_VEHICLE_VARIABLE, tc.VAR_NEIGHBORS, vehID, 2)
-        self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, mode)
+        self._connection._message.pack("!BB", tc.TYPE_UBYTE, mode)
         return _readNeighbors(self._connection._checkResult(tc.CMD_GET_VEHICLE_VARIABLE, tc.VAR_NEIGHBORS, vehID))
 
     def getNextTLS(self, vehID):
@@ -758,8 +758,8 @@ class VehicleDomain(Domain):
         Subscribe for the leading vehicle id together with the distance.
         The dist parameter defines the maximum lookahead, 0 calculates a lookahead from the brake gap.
         """
-        self._connection._subscribe(tc.CMD_SUBSCRIBE_VEHICLE_VARIABLE, begin, end, vehID,
-                                    (tc.VAR_LEADER,), {tc.VAR_LEADER: struct.pack("!Bd", tc.TYPE_DOUBLE, dist)})
+        return self._connection._subscribe(tc.CMD_SUBSCRIBE_VEHICLE_VARIABLE, begin, end, vehID, (tc.VAR_LEADER,),
+                                           {tc.VAR_LEADER: struct.pack("!Bd", tc.TYPE_DOUBLE, dist)})
 
     def getDrivingDistance(self, vehID, edgeID, pos, laneIndex=0):
         """getDrivingDistance(string, string, double, integer) -> double
@@ -768,10 +768,10 @@ class VehicleDomain(Domain):
         """
         self._connection._beginMessage(tc.CMD_GET_VEHICLE_VARIABLE, tc.DISTANCE_REQUEST,
                                        vehID, 1 + 4 + 1 + 4 + len(edgeID) + 8 + 1 + 1)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
         self._connection._packString(edgeID, tc.POSITION_ROADMAP)
-        self._connection._string += struct.pack("!dBB",
-                                                pos, laneIndex, tc.REQUEST_DRIVINGDIST)
+        self._connection._message.pack("!dBB",
+                                       pos, laneIndex, tc.REQUEST_DRIVINGDIST)
         return self._connection._checkResult(tc.CMD_GET_VEHICLE_VARIABLE, tc.DISTANCE_REQUEST, vehID).readDouble()
 
     def getDrivingDistance2D(self, vehID, x, y):
@@ -781,8 +781,8 @@ class VehicleDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_GET_VEHICLE_VARIABLE, tc.DISTANCE_REQUEST, vehID, 1 + 4 + 1 + 8 + 8 + 1)
-        self._connection._string += struct.pack("!BiBddB", tc.TYPE_COMPOUND, 2,
-                                                tc.POSITION_2D, x, y, tc.REQUEST_DRIVINGDIST)
+        self._connection._message.pack("!BiBddB", tc.TYPE_COMPOUND, 2,
+                                       tc.POSITION_2D, x, y, tc.REQUEST_DRIVINGDIST)
         return self._connection._checkResult(tc.CMD_GET_VEHICLE_VARIABLE, tc.DISTANCE_REQUEST, vehID).readDouble()
 
     def getDistance(self, vehID):
@@ -839,7 +839,7 @@ class VehicleDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_GET_VEHICLE_VARIABLE, tc.CMD_CHANGELANE, vehID, 1 + 4)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, direction)
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, direction)
         result = self._connection._checkResult(tc.CMD_GET_VEHICLE_VARIABLE, tc.CMD_CHANGELANE, vehID)
         return result.read("!iBiBi")[2::2]  # ignore num compounds and type int
 
@@ -931,9 +931,9 @@ class VehicleDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_REROUTE_TO_PARKING, vehID,
                                        1 + 4 +  # compound
                                        1 + 4 + len(parkingAreaID))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 1)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 1)
         self._connection._packString(parkingAreaID)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def setStop(self, vehID, edgeID, pos=1., laneIndex=0, duration=tc.INVALID_DOUBLE_VALUE,
                 flags=tc.STOP_DEFAULT, startPos=tc.INVALID_DOUBLE_VALUE, until=tc.INVALID_DOUBLE_VALUE):
@@ -947,13 +947,13 @@ class VehicleDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_STOP,
                                        vehID, (1 + 4 + 1 + 4 + len(edgeID) + 1 + 8 + 1 + 1 +
                                                1 + 8 + 1 + 1 + 1 + 8 + 1 + 8))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 7)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 7)
         self._connection._packString(edgeID)
-        self._connection._string += struct.pack("!BdBBBdBB", tc.TYPE_DOUBLE, pos,
-                                                tc.TYPE_BYTE, laneIndex, tc.TYPE_DOUBLE, duration, tc.TYPE_BYTE, flags)
-        self._connection._string += struct.pack("!BdBd",
-                                                tc.TYPE_DOUBLE, startPos, tc.TYPE_DOUBLE, until)
-        self._connection._sendExact()
+        self._connection._message.pack("!BdBBBdBB", tc.TYPE_DOUBLE, pos,
+                                       tc.TYPE_BYTE, laneIndex, tc.TYPE_DOUBLE, duration, tc.TYPE_BYTE, flags)
+        self._connection._message.pack("!BdBd",
+                                       tc.TYPE_DOUBLE, startPos, tc.TYPE_DOUBLE, until)
+        self._connection._sendDeferrable()
 
     def setBusStop(self, vehID, stopID, duration=tc.INVALID_DOUBLE_VALUE,
                    until=tc.INVALID_DOUBLE_VALUE, flags=tc.STOP_DEFAULT):
@@ -1002,8 +1002,8 @@ class VehicleDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_RESUME, vehID, 1 + 4)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 0)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 0)
+        self._connection._sendDeferrable()
 
     def changeLane(self, vehID, laneIndex, duration):
         """changeLane(string, int, double) -> None
@@ -1015,9 +1015,9 @@ class VehicleDomain(Domain):
             warnings.warn("API change now handles duration as floating point seconds", stacklevel=2)
         self._connection._beginMessage(
             tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_CHANGELANE, vehID, 1 + 4 + 1 + 1 + 1 + 8)
-        self._connection._string += struct.pack(
+        self._connection._message.pack(
             "!BiBBBd", tc.TYPE_COMPOUND, 2, tc.TYPE_BYTE, laneIndex, tc.TYPE_DOUBLE, duration)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def changeLaneRelative(self, vehID, indexOffset, duration):
         """changeLaneRelative(string, int, double) -> None
@@ -1030,9 +1030,9 @@ class VehicleDomain(Domain):
             warnings.warn("API change now handles duration as floating point seconds", stacklevel=2)
         self._connection._beginMessage(
             tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_CHANGELANE, vehID, 1 + 4 + 1 + 1 + 1 + 8 + 1 + 1)
-        self._connection._string += struct.pack(
+        self._connection._message.pack(
             "!BiBbBdBB", tc.TYPE_COMPOUND, 3, tc.TYPE_BYTE, indexOffset, tc.TYPE_DOUBLE, duration, tc.TYPE_BYTE, 1)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def changeSublane(self, vehID, latDist):
         """changeLane(string, double) -> None
@@ -1053,9 +1053,9 @@ class VehicleDomain(Domain):
             warnings.warn("API change now handles duration as floating point seconds", stacklevel=2)
         self._connection._beginMessage(
             tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_SLOWDOWN, vehID, 1 + 4 + 1 + 8 + 1 + 8)
-        self._connection._string += struct.pack(
+        self._connection._message.pack(
             "!BiBdBd", tc.TYPE_COMPOUND, 2, tc.TYPE_DOUBLE, speed, tc.TYPE_DOUBLE, duration)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def openGap(self, vehID, newTimeHeadway, newSpaceHeadway, duration, changeRate, maxDecel=-1, referenceVehID=None):
         """openGap(string, double, double, double, double, double, string) -> None
@@ -1081,13 +1081,13 @@ class VehicleDomain(Domain):
             nParams = 6
             msgLength += 1 + 4 + len(referenceVehID)  # TYPE_STRING, len, referenceVehID
         self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_OPENGAP, vehID, msgLength)
-        self._connection._string += struct.pack("!BiBdBdBdBdBd", tc.TYPE_COMPOUND, nParams,
-                                                tc.TYPE_DOUBLE, newTimeHeadway, tc.TYPE_DOUBLE, newSpaceHeadway,
-                                                tc.TYPE_DOUBLE, duration, tc.TYPE_DOUBLE, changeRate,
-                                                tc.TYPE_DOUBLE, maxDecel)
+        self._connection._message.pack("!BiBdBdBdBdBd", tc.TYPE_COMPOUND, nParams,
+                                       tc.TYPE_DOUBLE, newTimeHeadway, tc.TYPE_DOUBLE, newSpaceHeadway,
+                                       tc.TYPE_DOUBLE, duration, tc.TYPE_DOUBLE, changeRate,
+                                       tc.TYPE_DOUBLE, maxDecel)
         if nParams == 6:
             self._connection._packString(referenceVehID)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def deactivateGapControl(self, vehID):
         """deactivateGapControl(string) -> None
@@ -1144,7 +1144,7 @@ class VehicleDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_ROUTE, vehID,
                                        1 + 4 + sum(map(len, edgeList)) + 4 * len(edgeList))
         self._connection._packStringList(edgeList)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def updateBestLanes(self, vehID):
         """ updateBestLanes(string) -> None
@@ -1173,25 +1173,25 @@ class VehicleDomain(Domain):
             # reset
             self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_EDGE_TRAVELTIME,
                                            vehID, 1 + 4 + 1 + 4 + len(edgeID))
-            self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 1)
+            self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 1)
             self._connection._packString(edgeID)
-            self._connection._sendExact()
+            self._connection._sendDeferrable()
         elif begTime is None:
             # set value for the whole simulation
             self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_EDGE_TRAVELTIME,
                                            vehID, 1 + 4 + 1 + 4 + len(edgeID) + 1 + 8)
-            self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
+            self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
             self._connection._packString(edgeID)
-            self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, time)
-            self._connection._sendExact()
+            self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, time)
+            self._connection._sendDeferrable()
         else:
             self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_EDGE_TRAVELTIME,
                                            vehID, 1 + 4 + 1 + 8 + 1 + 8 + 1 + 4 + len(edgeID) + 1 + 8)
-            self._connection._string += struct.pack("!BiBdBd", tc.TYPE_COMPOUND, 4, tc.TYPE_DOUBLE, begTime,
-                                                    tc.TYPE_DOUBLE, endTime)
+            self._connection._message.pack("!BiBdBd", tc.TYPE_COMPOUND, 4, tc.TYPE_DOUBLE, begTime,
+                                           tc.TYPE_DOUBLE, endTime)
             self._connection._packString(edgeID)
-            self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, time)
-            self._connection._sendExact()
+            self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, time)
+            self._connection._sendDeferrable()
 
     def setEffort(self, vehID, edgeID, effort=None, begTime=None, endTime=None):
         """setEffort(string, string, double, double, double) -> None
@@ -1213,25 +1213,25 @@ class VehicleDomain(Domain):
             # reset
             self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_EDGE_EFFORT,
                                            vehID, 1 + 4 + 1 + 4 + len(edgeID))
-            self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 1)
+            self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 1)
             self._connection._packString(edgeID)
-            self._connection._sendExact()
+            self._connection._sendDeferrable()
         elif begTime is None:
             # set value for the whole simulation
             self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_EDGE_EFFORT,
                                            vehID, 1 + 4 + 1 + 4 + len(edgeID) + 1 + 8)
-            self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
+            self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
             self._connection._packString(edgeID)
-            self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, effort)
-            self._connection._sendExact()
+            self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, effort)
+            self._connection._sendDeferrable()
         else:
             self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_EDGE_EFFORT,
                                            vehID, 1 + 4 + 1 + 8 + 1 + 8 + 1 + 4 + len(edgeID) + 1 + 8)
-            self._connection._string += struct.pack("!BiBdBd", tc.TYPE_COMPOUND, 4, tc.TYPE_DOUBLE, begTime,
-                                                    tc.TYPE_DOUBLE, endTime)
+            self._connection._message.pack("!BiBdBd", tc.TYPE_COMPOUND, 4, tc.TYPE_DOUBLE, begTime,
+                                           tc.TYPE_DOUBLE, endTime)
             self._connection._packString(edgeID)
-            self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, effort)
-            self._connection._sendExact()
+            self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, effort)
+            self._connection._sendDeferrable()
 
     LAST_TRAVEL_TIME_UPDATE = -1
 
@@ -1263,14 +1263,14 @@ class VehicleDomain(Domain):
                         edge, self._connection.edge.getTraveltime(edge))
         self._connection._beginMessage(
             tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_REROUTE_TRAVELTIME, vehID, 1 + 4)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 0)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 0)
+        self._connection._sendDeferrable()
 
     def rerouteEffort(self, vehID):
         self._connection._beginMessage(
             tc.CMD_SET_VEHICLE_VARIABLE, tc.CMD_REROUTE_EFFORT, vehID, 1 + 4)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 0)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 0)
+        self._connection._sendDeferrable()
 
     def setSignals(self, vehID, signals):
         """setSignals(string, integer) -> None
@@ -1283,10 +1283,10 @@ class VehicleDomain(Domain):
     def moveTo(self, vehID, laneID, pos):
         self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE,
                                        tc.VAR_MOVE_TO, vehID, 1 + 4 + 1 + 4 + len(laneID) + 1 + 8)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
         self._connection._packString(laneID)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, pos)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, pos)
+        self._connection._sendDeferrable()
 
     def setSpeed(self, vehID, speed):
         """setSpeed(string, double) -> None
@@ -1305,9 +1305,9 @@ class VehicleDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_COLOR, vehID, 1 + 1 + 1 + 1 + 1)
-        self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
-                                                int(color[3]) if len(color) > 3 else 255)
-        self._connection._sendExact()
+        self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
+                                       int(color[3]) if len(color) > 3 else 255)
+        self._connection._sendDeferrable()
 
     def setLength(self, vehID, length):
         """setLength(string, double) -> None
@@ -1379,7 +1379,7 @@ class VehicleDomain(Domain):
         self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_VIA, vehID,
                                        1 + 4 + sum(map(len, edgeList)) + 4 * len(edgeList))
         self._connection._packStringList(edgeList)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
 
     def setMinGap(self, vehID, minGap):
         """setMinGap(string, double) -> None
@@ -1503,18 +1503,18 @@ class VehicleDomain(Domain):
             color = (255, 0, 0, 255)
 
         self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.VAR_HIGHLIGHT, vehID, msg_length)
-        self._connection._string += struct.pack("!BB", tc.TYPE_COMPOUND, compoundLength)
+        self._connection._message.pack("!BB", tc.TYPE_COMPOUND, compoundLength)
         if (compoundLength >= 1):
-            self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]),
-                                                    int(color[2]), int(color[3]) if len(color) > 3 else 255)
+            self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]),
+                                           int(color[2]), int(color[3]) if len(color) > 3 else 255)
         if (compoundLength >= 2):
-            self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, size)
+            self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, size)
         if (compoundLength >= 3):
-            self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, alphaMax)
-            self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, duration)
+            self._connection._message.pack("!BB", tc.TYPE_UBYTE, alphaMax)
+            self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, duration)
         if (compoundLength >= 5):
-            self._connection._string += struct.pack("!BB", tc.TYPE_UBYTE, type)
-        self._connection._sendExact()
+            self._connection._message.pack("!BB", tc.TYPE_UBYTE, type)
+        self._connection._sendDeferrable()
 
     def setImperfection(self, vehID, imperfection):
         """setImperfection(string, double) -> None
@@ -1578,20 +1578,18 @@ class VehicleDomain(Domain):
         """
         Add a new vehicle (new style with all possible parameters)
         """
-        messageString = struct.pack("!Bi", tc.TYPE_COMPOUND, 14)
         if depart is None:
-            depart = str(self._connection.simulation.getTime())
-        for val in (routeID, typeID, depart, departLane, departPos, departSpeed,
-                    arrivalLane, arrivalPos, arrivalSpeed, fromTaz, toTaz, line):
-            val = str(val)
-            messageString += struct.pack("!Bi", tc.TYPE_STRING, len(val)) + val.encode("latin1")
-        messageString += struct.pack("!Bi", tc.TYPE_INTEGER, personCapacity)
-        messageString += struct.pack("!Bi", tc.TYPE_INTEGER, personNumber)
-
-        self._connection._beginMessage(
-            tc.CMD_SET_VEHICLE_VARIABLE, tc.ADD_FULL, vehID, len(messageString))
-        self._connection._string += messageString
-        self._connection._sendExact()
+            # "now" avoids a getTime round trip and also works inside a batch
+            depart = "now"
+        values = [str(val) for val in (routeID, typeID, depart, departLane, departPos, departSpeed,
+                                       arrivalLane, arrivalPos, arrivalSpeed, fromTaz, toTaz, line)]
+        self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.ADD_FULL, vehID,
+                                       1 + 4 + sum([1 + 4 + len(val) for val in values]) + 2 * (1 + 4))
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 14)
+        for val in values:
+            self._connection._packString(val)
+        self._connection._message.pack("!BiBi", tc.TYPE_INTEGER, personCapacity, tc.TYPE_INTEGER, personNumber)
+        self._connection._sendDeferrable()
 
     addFull = add
 
@@ -1614,21 +1612,21 @@ class VehicleDomain(Domain):
         edgeID and lane are optional placement hints to resolve ambiguities'''
         self._connection._beginMessage(tc.CMD_SET_VEHICLE_VARIABLE, tc.MOVE_TO_XY,
                                        vehID, 1 + 4 + 1 + 4 + len(edgeID) + 1 + 4 + 1 + 8 + 1 + 8 + 1 + 8 + 1 + 1)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 6)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 6)
         self._connection._packString(edgeID)
-        self._connection._string += struct.pack("!Bi", tc.TYPE_INTEGER, lane)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, x)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, y)
-        self._connection._string += struct.pack("!Bd", tc.TYPE_DOUBLE, angle)
-        self._connection._string += struct.pack("!BB", tc.TYPE_BYTE, keepRoute)
-        self._connection._sendExact()
+        self._connection._message.pack("!Bi", tc.TYPE_INTEGER, lane)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, x)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, y)
+        self._connection._message.pack("!Bd", tc.TYPE_DOUBLE, angle)
+        self._connection._message.pack("!BB", tc.TYPE_BYTE, keepRoute)
+        self._connection._sendDeferrable()
 
     def subscribe(self, objectID, varIDs=(tc.VAR_ROAD_ID, tc.VAR_LANEPOSITION), begin=0, end=2**31 - 1):
         """subscribe(string, list(integer), int, int) -> None
 
         Subscribe to one or more object values for the given interval.
         """
-        Domain.subscribe(self, objectID, varIDs, begin, end)
+        return Domain.subscribe(self, objectID, varIDs, begin, end)
 
     def subscribeContext(self, objectID, domain, dist, varIDs=(
             tc.VAR_ROAD_ID, tc.VAR_LANEPOSITION), begin=0, end=2**31 - 1):
@@ -1637,7 +1635,7 @@ class VehicleDomain(Domain):
         Subscribe to one or more object values of the given domain around the
         given objectID in a given radius
         """
-        Domain.subscribeContext(
+        return Domain.subscribeContext(
             self, objectID, domain, dist, varIDs, begin, end)
 
     def addSubscriptionFilterLanes(self, lanes, noOpposite=False, downstreamDist=None, upstreamDist=None):
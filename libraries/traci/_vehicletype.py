@@ -16,7 +16,6 @@
 from __future__ import absolute_import
 from .domain import Domain
 from .storage import Storage
-import struct
 from . import constants as tc
 from . import exceptions
 
@@ -383,9 +382,9 @@ class VehicleTypeDomain(Domain):
         """
         self._connection._beginMessage(
             tc.CMD_SET_VEHICLETYPE_VARIABLE, tc.VAR_COLOR, typeID, 1 + 1 + 1 + 1 + 1)
-        self._connection._string += struct.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
-                                                int(color[3]) if len(color) > 3 else 255)
-        self._connection._sendExact()
+        self._connection._message.pack("!BBBBB", tc.TYPE_COLOR, int(color[0]), int(color[1]), int(color[2]),
+                                       int(color[3]) if len(color) > 3 else 255)
+        self._connection._sendDeferrable()
 
     def copy(self, origTypeID, newTypeID):
         """copy(string, string) -> None
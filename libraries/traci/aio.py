@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    aio.py
+# @date    2019-11-12
+# @version $Id$
+
+"""TraCI client on top of an asyncio protocol (Python 3.5+).
+
+An AsyncConnection uses the same domains, message encoding and decoding as Connection,
+but never blocks. Commands are queued like inside Connection.batch() and sent as one message
+when a result is awaited, so one event loop can wait for many simulations at once:
+
+    conns = await asyncio.gather(*[traci.aio.start(cmd) for cmd in cmds])
+    for step in range(1000):
+        await asyncio.gather(*[conn.simulationStep() for conn in conns])
+        speeds = await asyncio.gather(*[conn.vehicle.getSpeed("veh0") for conn in conns])
+
+Getters of the form domain.getX(objectID) return an AsyncResult which can be awaited,
+setters and subscriptions are sent with the next awaited command or flush().
+Commands which need an immediate answer outside of this scheme (e.g. getters with parameters)
+raise a TraCIException.
+
+This does not make the client faster: decoding still runs on one core and the event loop adds
+its own cost to every round trip, so with servers answering at once (e.g. the stub) blocking
+connections stepped one after the other are as fast or faster. asyncio pays off when the servers
+need time for their steps, their computation then overlaps instead of adding up
+(see benchmarks/AsyncBenchmark.py).
+"""
+
+from __future__ import print_function
+from __future__ import absolute_import
+import asyncio
+import socket
+import struct
+import subprocess
+import time
+
+from . import constants as tc
+from .connection import Connection, DeferredResult
+from .exceptions import TraCIException, FatalTraCIError
+from .storage import Storage
+from .transport import SHM_PREFIX, UNIX_PREFIX
+
+import sumolib  # noqa
+
+_LENGTH = struct.Struct("!i")
+
+
+class AsyncResult(DeferredResult):
+
+    """Result of a command on an AsyncConnection, awaiting it sends the pending commands if necessary."""
+
+    def __init__(self, connection):
+        DeferredResult.__init__(self)
+        self._connection = connection
+
+    def __await__(self):
+        if not self._done:
+            yield from self._connection.flush().__await__()
+        return self.result()
+
+
+class _MessageProtocol(asyncio.Protocol):
+
+    """Collects the bytes received from SUMO and hands out complete messages, the length prefix
+    tells when one is complete, so a round trip needs one wakeup of the waiting task.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self._buffer = bytearray()
+        self._waiter = None
+        self._closed = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self._buffer += data
+        if self._waiter is not None and self._complete():
+            self._wakeup()
+
+    def connection_lost(self, exc):
+        self._closed = True
+        self._wakeup()
+
+    def _wakeup(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+        self._waiter = None
+
+    def _complete(self):
+        return len(self._buffer) >= 4 and len(self._buffer) >= _LENGTH.unpack_from(self._buffer)[0]
+
+    async def readMessage(self):
+        """Returns the content of the next message without the length."""
+        while not self._complete():
+            if self._closed:
+                raise FatalTraCIError("connection closed by SUMO")
+            self._waiter = asyncio.get_event_loop().create_future()
+            await self._waiter
+        length = _LENGTH.unpack_from(self._buffer)[0]
+        content = self._buffer[4:length]
+        del self._buffer[:length]
+        return content
+
+
+class AsyncConnection(Connection):
+
+    def __init__(self, transport, protocol, process=None):
+        self._transport = transport
+        self._protocol = protocol
+        self._initState(process)
+        # all commands are queued as if inside a batch which never ends
+        self._batchDepth = 1
+        self._lock = asyncio.Lock()
+
+    def _createDeferredResult(self):
+        return AsyncResult(self)
+
+    def _sendExact(self):
+        queue, deferred = self._takeQueue()
+        self._abortDeferred(deferred, TraCIException("Commands were discarded by a blocking call."))
+        raise TraCIException("Command %s needs a blocking round trip which is not possible on an asyncio connection."
+                             % ",".join("%02x" % command for command in queue))
+
+    async def flush(self):
+        """Sends all queued commands as one message and waits for the answer."""
+        async with self._lock:
+            if not self._queue:
+                return
+            message = bytes(self._message.getMessage())
+            queue, deferred = self._takeQueue()
+            if self._profiler is not None:
+                start = time.perf_counter()
+            # the transport buffers what cannot be sent at once, the messages are small enough not to wait for it
+            self._transport.write(message)
+            self._roundTrips += 1
+            try:
+                content = await self._protocol.readMessage()
+            except FatalTraCIError as e:
+                self._abortDeferred(deferred, e)
+                raise
+            result = Storage(content)
+            if self._profiler is not None:
+                # includes the time other tasks ran before this one was resumed
+                self._profiler.record(message, 4 + len(content), start, time.perf_counter())
+            if self._recorder is not None:
+                self._recorder.record(message, content)
+            self._readResponses(result, queue, deferred)
+
+    async def simulationStep(self, step=0.):
+        """Awaitable version of Connection.simulationStep, returns the subscription responses."""
+        self._encodeSimulationStep(step)
+        responses = await self._deferLastCommand(self._readSimulationStep)
+        self._manageStepListeners(step)
+        return responses
+
+    async def getVersion(self):
+        self._encodeGetVersion()
+        return await self._deferLastCommand(self._readVersion)
+
+    async def load(self, args):
+        self._encodeLoad(args)
+        await self.flush()
+        if self._subscriptionManager is not None:
+            pending = self._subscriptionManager.restore()
+            await self.flush()
+            self._subscriptionManager.checkRestored(pending)
+
+    async def setOrder(self, order):
+        self._queue.append(tc.CMD_SETORDER)
+        self._message.pack("!BBi", 1 + 1 + 4, tc.CMD_SETORDER, order)
+        await self.flush()
+
+    async def close(self, wait=True):
+        for listenerID in self._stepListeners.getIDs():
+            self.removeStepListener(listenerID)
+        if self._transport is not None:
+            self._queue.append(tc.CMD_CLOSE)
+            self._message.pack("!BB", 1 + 1, tc.CMD_CLOSE)
+            await self.flush()
+            self._transport.close()
+            self._transport = None
+        self.disableProfiler()
+        self.disableRecorder()
+        if wait and self._process is not None:
+            await asyncio.get_event_loop().run_in_executor(None, self._process.wait)
+
+
+async def connect(port=8813, numRetries=10, host="localhost", proc=None, recordFile=None):
+    """Awaitable version of traci.connect, returns an AsyncConnection after checking the version."""
+    if host.startswith(SHM_PREFIX):
+        raise TraCIException("The shared memory transport cannot be used with asyncio.")
+    loop = asyncio.get_event_loop()
+    for wait in range(1, numRetries + 2):
+        try:
+            if host.startswith(UNIX_PREFIX):
+                transport, protocol = await loop.create_unix_connection(_MessageProtocol, host[len(UNIX_PREFIX):])
+            else:
+                transport, protocol = await loop.create_connection(_MessageProtocol, host, port)
+            break
+        except OSError as e:
+            if proc is not None and proc.poll() is not None:
+                raise TraCIException("TraCI server already finished")
+            if wait > 1:
+                print("Could not connect to TraCI server at %s:%s" % (host, port), e)
+            if wait == numRetries + 1:
+                raise FatalTraCIError("Could not connect in %s tries" % (numRetries + 1))
+            print(" Retrying in %s seconds" % wait)
+            await asyncio.sleep(wait)
+    if not host.startswith(UNIX_PREFIX):
+        transport.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    conn = AsyncConnection(transport, protocol, proc)
+    if recordFile is not None:
+        conn.enableRecorder(recordFile)
+    await conn.getVersion()
+    return conn
+
+
+async def start(cmd, port=None, numRetries=10, recordFile=None):
+    """Awaitable version of traci.start, starts sumo with cmd and returns an AsyncConnection to it."""
+    if port is None:
+        port = sumolib.miscutils.getFreeSocketPort()
+    sumoProcess = subprocess.Popen(cmd + ["--remote-port", str(port)])
+    return await connect(port, numRetries, "localhost", sumoProcess, recordFile)
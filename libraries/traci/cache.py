@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    cache.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Client side cache for the simple getters (Domain._getUniversal) of a connection.
+
+Every variable is static, per step or volatile:
+    static      does not change during a run (lane shapes, route edges, vehicle type parameters, ...),
+                dropped by a setter on the same object and by load
+    per step    does not change until the next simulation step (positions, detector values, ...),
+                dropped by every simulation step, every setter and load
+    volatile    everything not listed in the tables below, never cached
+The cache assumes that this client is the only one changing the simulation.
+"""
+
+from __future__ import absolute_import
+
+from . import constants as tc
+
+STATIC = "static"
+STEP = "step"
+
+# static variables per get command
+STATIC_VARIABLES = {
+    tc.CMD_GET_LANE_VARIABLE: (tc.VAR_LENGTH, tc.VAR_WIDTH, tc.VAR_SHAPE, tc.LANE_EDGE_ID, tc.LANE_LINK_NUMBER,
+                               tc.LANE_ALLOWED, tc.LANE_DISALLOWED),
+    tc.CMD_GET_EDGE_VARIABLE: (tc.VAR_LANE_INDEX, tc.VAR_NAME),
+    tc.CMD_GET_ROUTE_VARIABLE: (tc.VAR_EDGES,),
+    tc.CMD_GET_VEHICLETYPE_VARIABLE: (tc.VAR_LENGTH, tc.VAR_MAXSPEED, tc.VAR_SPEED_FACTOR, tc.VAR_SPEED_DEVIATION,
+                                      tc.VAR_ACCEL, tc.VAR_DECEL, tc.VAR_EMERGENCY_DECEL, tc.VAR_APPARENT_DECEL,
+                                      tc.VAR_ACTIONSTEPLENGTH, tc.VAR_IMPERFECTION, tc.VAR_TAU, tc.VAR_VEHICLECLASS,
+                                      tc.VAR_EMISSIONCLASS, tc.VAR_SHAPECLASS, tc.VAR_MINGAP, tc.VAR_WIDTH,
+                                      tc.VAR_HEIGHT, tc.VAR_COLOR, tc.VAR_MAXSPEED_LAT, tc.VAR_LATALIGNMENT,
+                                      tc.VAR_MINGAP_LAT, tc.VAR_PERSON_CAPACITY),
+    tc.CMD_GET_SIM_VARIABLE: (tc.VAR_DELTA_T, tc.VAR_NET_BOUNDING_BOX, tc.VAR_BUS_STOP_ID_LIST),
+    tc.CMD_GET_JUNCTION_VARIABLE: (tc.VAR_POSITION, tc.VAR_SHAPE),
+    tc.CMD_GET_TL_VARIABLE: (tc.TL_CONTROLLED_LANES, tc.TL_CONTROLLED_LINKS),
+    tc.CMD_GET_INDUCTIONLOOP_VARIABLE: (tc.VAR_POSITION, tc.VAR_LANE_ID),
+    tc.CMD_GET_LANEAREA_VARIABLE: (tc.VAR_POSITION, tc.VAR_LANE_ID, tc.VAR_LENGTH),
+}
+
+_EMISSIONS = (tc.VAR_CO2EMISSION, tc.VAR_COEMISSION, tc.VAR_HCEMISSION, tc.VAR_PMXEMISSION, tc.VAR_NOXEMISSION,
+              tc.VAR_FUELCONSUMPTION, tc.VAR_NOISEEMISSION, tc.VAR_ELECTRICITYCONSUMPTION)
+_LAST_STEP = (tc.LAST_STEP_MEAN_SPEED, tc.LAST_STEP_OCCUPANCY, tc.LAST_STEP_LENGTH, tc.LAST_STEP_VEHICLE_NUMBER,
+              tc.LAST_STEP_VEHICLE_HALTING_NUMBER, tc.LAST_STEP_VEHICLE_ID_LIST)
+
+# per step variables per get command, the id lists and counts of all domains are per step as well
+STEP_VARIABLES = {
+    tc.CMD_GET_LANE_VARIABLE: _EMISSIONS + _LAST_STEP + (tc.VAR_WAITING_TIME, tc.VAR_CURRENT_TRAVELTIME),
+    tc.CMD_GET_EDGE_VARIABLE: _EMISSIONS + _LAST_STEP + (tc.VAR_WAITING_TIME, tc.VAR_CURRENT_TRAVELTIME,
+                                                         tc.LAST_STEP_PERSON_ID_LIST),
+    tc.CMD_GET_SIM_VARIABLE: (tc.VAR_TIME, tc.VAR_TIME_STEP, tc.VAR_MIN_EXPECTED_VEHICLES,
+                              tc.VAR_LOADED_VEHICLES_NUMBER, tc.VAR_LOADED_VEHICLES_IDS,
+                              tc.VAR_DEPARTED_VEHICLES_NUMBER, tc.VAR_DEPARTED_VEHICLES_IDS,
+                              tc.VAR_ARRIVED_VEHICLES_NUMBER, tc.VAR_ARRIVED_VEHICLES_IDS,
+                              tc.VAR_PARKING_STARTING_VEHICLES_NUMBER, tc.VAR_PARKING_STARTING_VEHICLES_IDS,
+                              tc.VAR_PARKING_ENDING_VEHICLES_NUMBER, tc.VAR_PARKING_ENDING_VEHICLES_IDS,
+                              tc.VAR_STOP_STARTING_VEHICLES_NUMBER, tc.VAR_STOP_STARTING_VEHICLES_IDS,
+                              tc.VAR_STOP_ENDING_VEHICLES_NUMBER, tc.VAR_STOP_ENDING_VEHICLES_IDS,
+                              tc.VAR_COLLIDING_VEHICLES_NUMBER, tc.VAR_COLLIDING_VEHICLES_IDS,
+                              tc.VAR_EMERGENCYSTOPPING_VEHICLES_NUMBER, tc.VAR_EMERGENCYSTOPPING_VEHICLES_IDS,
+                              tc.VAR_TELEPORT_STARTING_VEHICLES_NUMBER, tc.VAR_TELEPORT_STARTING_VEHICLES_IDS,
+                              tc.VAR_TELEPORT_ENDING_VEHICLES_NUMBER, tc.VAR_TELEPORT_ENDING_VEHICLES_IDS,
+                              tc.VAR_BUS_STOP_WAITING, tc.VAR_BUS_STOP_WAITING_IDS),
+    tc.CMD_GET_TL_VARIABLE: (tc.TL_RED_YELLOW_GREEN_STATE, tc.TL_COMPLETE_DEFINITION_RYG, tc.TL_CURRENT_PROGRAM,
+                             tc.TL_CURRENT_PHASE, tc.TL_NEXT_SWITCH, tc.TL_PHASE_DURATION),
+    tc.CMD_GET_INDUCTIONLOOP_VARIABLE: (tc.LAST_STEP_VEHICLE_NUMBER, tc.LAST_STEP_MEAN_SPEED,
+                                        tc.LAST_STEP_VEHICLE_ID_LIST, tc.LAST_STEP_OCCUPANCY, tc.LAST_STEP_LENGTH,
+                                        tc.LAST_STEP_TIME_SINCE_DETECTION, tc.LAST_STEP_VEHICLE_DATA),
+    tc.CMD_GET_LANEAREA_VARIABLE: (tc.JAM_LENGTH_VEHICLE, tc.JAM_LENGTH_METERS, tc.LAST_STEP_MEAN_SPEED,
+                                   tc.LAST_STEP_VEHICLE_ID_LIST, tc.LAST_STEP_OCCUPANCY, tc.LAST_STEP_VEHICLE_NUMBER,
+                                   tc.LAST_STEP_VEHICLE_HALTING_NUMBER),
+    tc.CMD_GET_MULTIENTRYEXIT_VARIABLE: (tc.LAST_STEP_VEHICLE_NUMBER, tc.LAST_STEP_MEAN_SPEED,
+                                         tc.LAST_STEP_VEHICLE_ID_LIST, tc.LAST_STEP_VEHICLE_HALTING_NUMBER),
+    # the type, route and parameters of a vehicle may change, so none of its variables is static
+    tc.CMD_GET_VEHICLE_VARIABLE: _EMISSIONS + (
+        tc.VAR_SPEED, tc.VAR_SPEED_LAT, tc.VAR_ACCELERATION, tc.VAR_SPEED_WITHOUT_TRACI, tc.VAR_POSITION,
+        tc.VAR_POSITION3D, tc.VAR_ANGLE, tc.VAR_ROAD_ID, tc.VAR_LANE_ID, tc.VAR_LANE_INDEX, tc.VAR_TYPE,
+        tc.VAR_ROUTE_ID, tc.VAR_ROUTE_INDEX, tc.VAR_EDGES, tc.VAR_LANEPOSITION, tc.VAR_COLOR,
+        tc.VAR_PERSON_CAPACITY, tc.VAR_PERSON_NUMBER, tc.LAST_STEP_PERSON_ID_LIST, tc.VAR_ROUTE_VALID,
+        tc.VAR_SIGNALS, tc.VAR_LENGTH, tc.VAR_MAXSPEED, tc.VAR_LANEPOSITION_LAT, tc.VAR_MAXSPEED_LAT,
+        tc.VAR_LATALIGNMENT, tc.VAR_MINGAP_LAT, tc.VAR_ALLOWED_SPEED, tc.VAR_VEHICLECLASS, tc.VAR_SPEED_FACTOR,
+        tc.VAR_SPEED_DEVIATION, tc.VAR_EMISSIONCLASS, tc.VAR_WAITING_TIME, tc.VAR_ACCUMULATED_WAITING_TIME,
+        tc.VAR_LANECHANGE_MODE, tc.VAR_SPEEDSETMODE, tc.VAR_SLOPE, tc.VAR_WIDTH, tc.VAR_HEIGHT, tc.VAR_LINE,
+        tc.VAR_VIA, tc.VAR_MINGAP, tc.VAR_SHAPECLASS, tc.VAR_ACCEL, tc.VAR_DECEL, tc.VAR_EMERGENCY_DECEL,
+        tc.VAR_APPARENT_DECEL, tc.VAR_ACTIONSTEPLENGTH, tc.VAR_LASTACTIONTIME, tc.VAR_IMPERFECTION, tc.VAR_TAU,
+        tc.VAR_BEST_LANES, tc.VAR_NEXT_TLS, tc.VAR_NEXT_STOPS, tc.VAR_DISTANCE, tc.VAR_STOPSTATE,
+        tc.VAR_ROUTING_MODE),
+}
+
+
+def _classify():
+    kinds = {}
+    for name in dir(tc):
+        if name.startswith("CMD_GET_") and name.endswith("_VARIABLE"):
+            cmdGetID = getattr(tc, name)
+            kinds[(cmdGetID, tc.TRACI_ID_LIST)] = STEP
+            kinds[(cmdGetID, tc.ID_COUNT)] = STEP
+    for kind, table in ((STEP, STEP_VARIABLES), (STATIC, STATIC_VARIABLES)):
+        for cmdGetID, varIDs in table.items():
+            for varID in varIDs:
+                kinds[(cmdGetID, varID)] = kind
+    return kinds
+
+
+_KINDS = _classify()
+# get command of the domain of every set command
+_GET_COMMANDS = dict((getattr(tc, name), getattr(tc, name.replace("CMD_SET_", "CMD_GET_")))
+                     for name in dir(tc) if name.startswith("CMD_SET_") and name.endswith("_VARIABLE"))
+
+
+class GetterCache:
+
+    """Values of the static and per step getters of one connection, see the module documentation.
+    hits and misses count the calls of cached getters, uncached the calls of volatile ones.
+    """
+
+    def __init__(self):
+        # (get command, object) -> {variable: value}
+        self._static = {}
+        # (get command, variable, object) -> value
+        self._step = {}
+        # increased by every invalidation, values requested before are not stored anymore
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def getKind(self, cmdGetID, varID):
+        """getKind(integer, integer) -> string
+
+        Returns STATIC, STEP or None for volatile variables.
+        """
+        return _KINDS.get((cmdGetID, varID))
+
+    def get(self, connection, cmdGetID, varID, objectID, valueFunc):
+        """Returns the value of the getter from the cache or requests it over the connection.
+        Inside a batch (and on an asyncio connection) the value is returned as deferred result.
+        """
+        kind = _KINDS.get((cmdGetID, varID))
+        if kind is None:
+            self.uncached += 1
+            if connection._batchDepth:
+                return connection._deferReadOneStringCmd(cmdGetID, varID, objectID, valueFunc)
+            return connection._sendReadOneValueCmd(cmdGetID, varID, objectID, valueFunc)
+        if kind == STATIC:
+            entries = self._static.setdefault((cmdGetID, objectID), {})
+            key = varID
+        else:
+            entries = self._step
+            key = (cmdGetID, varID, objectID)
+        if key in entries:
+            self.hits += 1
+            value = entries[key]
+            # callers may modify the lists they get
+            if type(value) is list:
+                value = list(value)
+            if connection._batchDepth:
+                future = connection._createDeferredResult()
+                future._setResult(value)
+                return future
+            return value
+        self.misses += 1
+        version = self._version
+
+        def store(value):
+            if self._version == version:
+                entries[key] = list(value) if type(value) is list else value
+            return value
+        if connection._batchDepth:
+            return connection._deferReadOneStringCmd(cmdGetID, varID, objectID, valueFunc, store)
+        return store(connection._sendReadOneValueCmd(cmdGetID, varID, objectID, valueFunc))
+
+    def commandSent(self, cmdID, objectID):
+        """Drops the values a command may change, called for every get and set command which is sent."""
+        cmdGetID = _GET_COMMANDS.get(cmdID)
+        if cmdGetID is None:
+            return
+        self._version += 1
+        self._step.clear()
+        self._static.pop((cmdGetID, objectID), None)
+
+    def nextStep(self):
+        self._version += 1
+        self._step.clear()
+
+    def clear(self):
+        self._version += 1
+        self._step.clear()
+        self._static.clear()
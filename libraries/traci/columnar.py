@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    columnar.py
+# @date    2019-11-12
+# @version $Id$
+
+from __future__ import absolute_import
+
+from .exceptions import TraCIException
+from .layouts import LAYOUTS
+from .storage import _decodeString
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# numpy types of the numeric layouts (see layouts.py), all of them repeat one struct type
+_TYPES = {"d": ">f8", "i": ">i4", "B": "u1"}
+
+
+def createColumn(length, value):
+    """Returns an array with length rows which can hold values like the given one."""
+    sample = np.asarray(value)
+    if sample.dtype.kind == "f":
+        return np.zeros((length,) + sample.shape)
+    elif sample.dtype.kind in "biu":
+        return np.zeros((length,) + sample.shape, dtype=np.int64)
+    return np.empty(length, dtype=object)
+
+
+def _isFixed(layout):
+    return layout is not None and layout[0] in _TYPES and layout == layout[0] * len(layout)
+
+
+def _readBytes(message, positions, size=1):
+    # the bytes at the given positions as one row each, positions outside of the message (after a length
+    # read from a response which does not match) give other bytes, which fail the checks of the caller
+    positions = np.clip(positions, 0, len(message) - size)
+    if size == 1:
+        return message[positions]
+    return message[positions[:, None] + np.arange(size)]
+
+
+def _readInts(message, positions):
+    return _readBytes(message, positions, 4).view(">i4")[:, 0]
+
+
+def _readValues(message, positions, layout):
+    # numeric values of the given layout, scalars as 1d and tuples as 2d array
+    dtype = np.dtype(_TYPES[layout[0]])
+    values = _readBytes(message, positions, dtype.itemsize * len(layout)).view(dtype)
+    return values[:, 0] if len(layout) == 1 else values
+
+
+def _readStrings(content, starts, ends):
+    return [_decodeString(content[start:end].tobytes()) for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+class ColumnarResults:
+
+    """Keeps the subscription values of the given variables in preallocated numpy arrays.
+    Every object gets a slot (row) which stays the same as long as the object delivers results.
+    Slots of objects without results in a step are released on the next reset.
+    Numeric values are stored in float or integer columns, scalars as 1d and tuples (positions) as 2d arrays,
+    all other values in object columns.
+    Runs of subscription responses with the same variables are read at once by readRun, which copies
+    the numeric values from the message into the columns instead of decoding them one by one.
+    """
+
+    def __init__(self, varIDs, capacity=1024):
+        if np is None:
+            raise TraCIException("Columnar subscription results need numpy.")
+        self.varIDs = frozenset(varIDs)
+        self._capacity = capacity
+        self._slots = {}
+        self._objectIDs = [None] * capacity
+        self._free = []
+        self._used = 0
+        self._assigned = np.zeros(capacity, dtype=bool)
+        self._present = np.zeros(capacity, dtype=bool)
+        self._columns = {}
+        # slots with a value of the variable in the last step, an object may deliver only some variables
+        self._hasValue = {}
+        # slots and values received since the last flush per variable,
+        # they are written to the columns with one assignment per variable
+        self._pending = {}
+        # slots and values of the records added one by one in this step per tuple of variables,
+        # with the number of them already written per column (None for the presence)
+        self._pendingRecords = {}
+        self._runLayouts = {}
+        self._presentSlots = None
+
+    def reset(self):
+        # values nobody asked for are dropped, only the presence is needed to release stale slots
+        self._flushPresence()
+        for slots, values in self._pending.values():
+            if slots:
+                self._present[slots] = True
+                del slots[:]
+                del values[:]
+        self._pendingRecords.clear()
+        if np.count_nonzero(self._present[:self._used]) < len(self._slots):
+            stale = np.flatnonzero(self._assigned[:self._used] & ~self._present[:self._used])
+            for slot in stale.tolist():
+                del self._slots[self._objectIDs[slot]]
+                self._objectIDs[slot] = None
+                self._free.append(slot)
+            self._assigned[stale] = False
+        self._present[:self._used] = False
+        for hasValue in self._hasValue.values():
+            hasValue[:self._used] = False
+        self._presentSlots = None
+
+    def _grow(self):
+        capacity = 2 * self._capacity
+        self._objectIDs.extend([None] * self._capacity)
+        for name in ("_assigned", "_present"):
+            grown = np.zeros(capacity, dtype=bool)
+            grown[:self._capacity] = getattr(self, name)
+            setattr(self, name, grown)
+        for arrays in (self._columns, self._hasValue):
+            for varID, column in arrays.items():
+                grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+                grown[:self._capacity] = column
+                arrays[varID] = grown
+        self._capacity = capacity
+
+    def _newSlot(self, objectID):
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self._used == self._capacity:
+                self._grow()
+            slot = self._used
+            self._used += 1
+        self._slots[objectID] = slot
+        self._objectIDs[slot] = objectID
+        self._assigned[slot] = True
+        return slot
+
+    def _createColumn(self, varID, value):
+        column = createColumn(self._capacity, value)
+        self._columns[varID] = column
+        self._hasValue[varID] = np.zeros(self._capacity, dtype=bool)
+        return column
+
+    def add(self, objectID, varID, value):
+        slot = self._slots.get(objectID)
+        if slot is None:
+            slot = self._newSlot(objectID)
+        pending = self._pending.get(varID)
+        if pending is None:
+            pending = self._pending[varID] = ([], [])
+        pending[0].append(slot)
+        pending[1].append(value)
+
+    def addRecord(self, objectID, varIDs, values):
+        slot = self._slots.get(objectID)
+        if slot is None:
+            slot = self._newSlot(objectID)
+        pending = self._pendingRecords.get(varIDs)
+        if pending is None:
+            pending = self._pendingRecords[varIDs] = ([], [], {})
+        pending[0].append(slot)
+        pending[1].append(values)
+
+    def _getRunLayouts(self, cmdGetID, varIDs):
+        # layouts of the variables if all of them are numbers or strings, None otherwise
+        key = (cmdGetID, varIDs)
+        if key not in self._runLayouts:
+            layouts = [LAYOUTS.get(cmdGetID, {}).get(varID) for varID in varIDs]
+            if not all(layout == "s" or _isFixed(layout) for layout in layouts):
+                layouts = None
+            self._runLayouts[key] = layouts
+        return self._runLayouts[key]
+
+    def readRun(self, data, responseID, minObjects, maxObjects, cmdGetID, varIDs):
+        """readRun(Storage, integer, integer, integer, integer, tuple(integer)) -> (list(string), list)
+
+        Reads up to maxObjects variable subscription responses following in data with records of the given
+        variables. Numeric values of column variables are copied from the message into the columns,
+        the values of the other variables are returned as list of (variable, list of values) in the order of
+        the returned object ids. Returns None and leaves data unchanged if less than minObjects responses of
+        the domain follow or the first one has other variables.
+        """
+        layouts = self._getRunLayouts(cmdGetID, varIDs)
+        if layouts is None:
+            return None
+        content = data._content
+        length = len(content)
+        pos = data._pos
+        starts = []
+        # short responses start with their length, which leads to the next one
+        while len(starts) < maxObjects and pos + 1 < length and content[pos] and content[pos + 1] == responseID:
+            starts.append(pos)
+            pos += content[pos]
+        if pos > length:
+            starts.pop()
+        if len(starts) < minObjects:
+            return None
+        message = np.frombuffer(content, dtype=np.uint8)
+        starts = np.array(starts, dtype=np.intp)
+        ends = starts + message[starts]
+        idStarts = starts + 6
+        idEnds = idStarts + _readInts(message, starts + 2)
+        valid = _readBytes(message, idEnds) == len(varIDs)
+        pos = idEnds + 1
+        # positions of the values of every variable, with the lengths for strings
+        positions = []
+        for varID, layout in zip(varIDs, layouts):
+            valid &= (_readBytes(message, pos) == varID) & (_readBytes(message, pos + 1) == 0)
+            if layout == "s":
+                lengths = _readInts(message, pos + 3)
+                positions.append((varID, layout, pos + 7, lengths))
+                pos = pos + 7 + lengths
+            else:
+                positions.append((varID, layout, pos + 3, None))
+                pos = pos + 3 + np.dtype(_TYPES[layout[0]]).itemsize * len(layout)
+        valid &= pos == ends
+        # the responses up to the first one with other variables or an error status
+        count = len(starts) if valid.all() else int(np.argmin(valid))
+        if count == 0:
+            return None
+        data._pos = int(ends[count - 1])
+        objectIDs = _readStrings(content, idStarts[:count], idEnds[:count])
+        slotMap = self._slots
+        slots = []
+        for objectID in objectIDs:
+            slot = slotMap.get(objectID)
+            if slot is None:
+                slot = self._newSlot(objectID)
+            slots.append(slot)
+        self._present[slots] = True
+        self._presentSlots = None
+        values = []
+        for varID, layout, valueStarts, lengths in positions:
+            valueStarts = valueStarts[:count]
+            if lengths is not None:
+                strings = _readStrings(content, valueStarts, valueStarts + lengths[:count])
+                if varID in self.varIDs:
+                    pending = self._pending.setdefault(varID, ([], []))
+                    pending[0].extend(slots)
+                    pending[1].extend(strings)
+                else:
+                    values.append((varID, strings))
+                continue
+            numbers = _readValues(message, valueStarts, layout)
+            if varID in self.varIDs:
+                column = self._columns.get(varID)
+                if column is None:
+                    column = self._createColumn(varID, numbers[0])
+                column[slots] = numbers
+                self._hasValue[varID][slots] = True
+            elif numbers.ndim > 1:
+                values.append((varID, [tuple(value) for value in numbers.tolist()]))
+            else:
+                values.append((varID, numbers.tolist()))
+        return objectIDs, values
+
+    def _write(self, varID, slots, values):
+        column = self._columns.get(varID)
+        if column is None:
+            column = self._createColumn(varID, values[0])
+        if column.dtype == object:
+            for slot, value in zip(slots, values):
+                column[slot] = value
+        else:
+            column[slots] = values
+        self._hasValue[varID][slots] = True
+
+    def _flushPresence(self):
+        for slots, _, written in self._pendingRecords.values():
+            if written.get(None, 0) < len(slots):
+                self._present[slots[written.get(None, 0):]] = True
+                written[None] = len(slots)
+                self._presentSlots = None
+
+    def _flush(self, varIDs):
+        # writes the values of the given variables added since the last flush to their columns,
+        # records added one by one are only written for the variables somebody asks for
+        self._flushPresence()
+        for recordVarIDs, (slots, records, written) in self._pendingRecords.items():
+            for index, varID in enumerate(recordVarIDs):
+                start = written.get(varID, 0)
+                if varID in varIDs and start < len(slots):
+                    self._write(varID, slots[start:], [record[index] for record in records[start:]])
+                    written[varID] = len(slots)
+        for varID, (slots, values) in self._pending.items():
+            if slots:
+                self._write(varID, slots, values)
+                self._present[slots] = True
+                self._presentSlots = None
+                del slots[:]
+                del values[:]
+
+    def _getPresentSlots(self):
+        self._flush(())
+        if self._presentSlots is None:
+            self._presentSlots = np.flatnonzero(self._present[:self._used])
+        return self._presentSlots
+
+    def getIDs(self):
+        return [self._objectIDs[slot] for slot in self._getPresentSlots().tolist()]
+
+    def getArray(self, varID):
+        """Returns the ids of all objects with a value of the given variable in the last step and
+        the values as array in the same order.
+        """
+        if varID not in self.varIDs:
+            raise TraCIException("Variable %02x is not stored in columns." % varID)
+        self._flush((varID,))
+        column = self._columns.get(varID)
+        if column is None:
+            return [], np.zeros(0)
+        slots = np.flatnonzero(self._hasValue[varID][:self._used])
+        return [self._objectIDs[slot] for slot in slots.tolist()], column[slots]
+
+    def fill(self, results):
+        """Adds the values of the last step to the given dict of dicts."""
+        self._flush(self.varIDs)
+        objectIDs = self._objectIDs
+        for varID, column in self._columns.items():
+            slots = np.flatnonzero(self._hasValue[varID][:self._used])
+            values = column[slots].tolist()
+            if column.ndim > 1:
+                values = [tuple(value) for value in values]
+            for slot, value in zip(slots.tolist(), values):
+                results.setdefault(objectIDs[slot], {})[varID] = value
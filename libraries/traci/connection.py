@@ -20,139 +20,259 @@ from __future__ import print_function
 from __future__ import absolute_import
 import socket
 import struct
-import sys
+import time
 import warnings
 import abc
 
 from . import constants as tc
 from .exceptions import TraCIException, FatalTraCIError
-from .domain import _defaultDomains
+from .domain import _defaultDomains, _getDefaultDomain, _DOMAIN_IDS, _DOMAIN_MODULES, _MIN_COLUMN_RUN
+from .encoder import Encoder
+from .listeners import StepListenerPipeline
+from .records import compileGetterDecoder
 from .storage import Storage
+from .subscriptions import SubscriptionManager, compileSubscription
+from .transport import createTransport
 
 _RESULTS = {0x00: "OK", 0x01: "Not implemented", 0xFF: "Error"}
+_RECV_BUFFER_SIZE = 1 << 16
 
 
 class Connection:
 
-    """Contains the socket, the composed message string
+    """Contains the transport, the composed message string
     together with a list of TraCI commands which are inside.
     """
 
     def __init__(self, host, port, process):
-        if sys.platform.startswith('java'):
-            # working around jython 2.7.0 bug #2273
-            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
-        else:
-            self._socket = socket.socket()
-        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-        self._socket.connect((host, port))
+        # a TCP socket unless the host names another transport, see transport.py
+        self._transport = createTransport(host, port)
+        self._initState(process)
+
+    def _initState(self, process):
         self._process = process
-        self._string = bytes()
+        self._message = Encoder()
         self._queue = []
+        # receive buffer and the view the transport writes to, replaced by larger ones whenever a message does not fit
+        self._recvBuffer = bytearray(_RECV_BUFFER_SIZE)
+        self._recvView = memoryview(self._recvBuffer)
+        self._batchDepth = 0
+        self._deferred = {}
+        self._roundTrips = 0
+        self._profiler = None
+        self._recorder = None
+        self._getterCache = None
+        self._subscriptionManager = None
         self._subscriptionMapping = {}
-        self._stepListeners = {}
-        self._nextStepListenerID = 0
+        self._stepListeners = StepListenerPipeline()
+        # the other domains are registered when they are used first
         for domain in _defaultDomains:
             domain._register(self, self._subscriptionMapping)
 
+    def __getattr__(self, name):
+        if name not in _DOMAIN_MODULES:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        _getDefaultDomain(name)._register(self, self._subscriptionMapping)
+        return self.__dict__[name]
+
     def _packString(self, s, pre=tc.TYPE_STRING):
-        self._string += struct.pack("!Bi", pre, len(s)) + s.encode("latin1")
+        self._message.packString(s, pre)
 
     def _packStringList(self, l):
-        self._string += struct.pack("!Bi", tc.TYPE_STRINGLIST, len(l))
-        for s in l:
-            self._string += struct.pack("!i", len(s)) + s.encode("latin1")
+        self._message.packStringList(l)
 
     def _packDoubleList(self, l):
-        self._string += struct.pack("!Bi", tc.TYPE_DOUBLELIST, len(l))
-        for x in l:
-            self._string += struct.pack("!d", x)
+        self._message.packDoubleList(l)
 
     def _recvExact(self):
+        """Receives the next message into the reusable buffer.
+        The returned Storage is a view on this buffer and only valid until the next message arrives,
+        which overwrites it. Everything needed from it has to be decoded before the next round trip
+        (deferred readers run and the recorder writes the message out while the answer is read).
+        """
         try:
-            result = bytes()
-            while len(result) < 4:
-                t = self._socket.recv(4 - len(result))
+            view = self._recvView
+            received = 0
+            length = None
+            while length is None or received < length:
+                # the server sends nothing but the answer, so the first call may fill the whole buffer,
+                # only the following ones need a view behind the received bytes
+                t = self._transport.recv_into(view[received:] if received else view)
                 if not t:
                     return None
-                result += t
-            length = struct.unpack("!i", result)[0] - 4
-            result = bytes()
-            while len(result) < length:
-                t = self._socket.recv(length - len(result))
-                if not t:
-                    return None
-                result += t
-            return Storage(result)
+                received += t
+                if length is None and received >= 4:
+                    length = struct.unpack_from("!i", view)[0]
+                    if length > len(view):
+                        view = self._growRecvBuffer(length, received)
+            return Storage(view[4:length])
         except socket.error:
             return None
 
+    def _growRecvBuffer(self, length, received):
+        # a bytearray with exported views cannot be resized in place, so a larger one replaces it
+        buffer = bytearray(max(length, 2 * len(self._recvBuffer)))
+        buffer[:received] = self._recvView[:received]
+        self._recvBuffer = buffer
+        self._recvView = memoryview(buffer)
+        return self._recvView
+
     def _sendExact(self):
-        length = struct.pack("!i", len(self._string) + 4)
-        # print("python_sendExact: '%s'" % ' '.join(map(lambda x : "%X" % ord(x), self._string)))
-        self._socket.send(length + self._string)
+        # print("python_sendExact: '%s'" % ' '.join(map(lambda x : "%X" % x, self._message.getMessage())))
+        if self._profiler is None and self._recorder is None:
+            self._transport.sendall(self._message.getMessage())
+        else:
+            message = bytes(self._message.getMessage())
+            start = time.perf_counter()
+            self._transport.sendall(message)
+        self._roundTrips += 1
+        queue, deferred = self._takeQueue()
         result = self._recvExact()
         if not result:
-            self._socket.close()
-            del self._socket
+            self._transport.close()
+            del self._transport
+            self._abortDeferred(deferred, FatalTraCIError("connection closed by SUMO"))
             raise FatalTraCIError("connection closed by SUMO")
-        for command in self._queue:
+        if self._profiler is not None:
+            self._profiler.record(message, 4 + len(result._content), start, time.perf_counter())
+        if self._recorder is not None:
+            self._recorder.record(message, result._content)
+        self._readResponses(result, queue, deferred)
+        return result
+
+    def _takeQueue(self):
+        """Returns the commands and deferred results of the sent message and starts a new message."""
+        queue, deferred = self._queue, self._deferred
+        self._message.reset()
+        self._queue = []
+        self._deferred = {}
+        return queue, deferred
+
+    def _readResponses(self, result, queue, deferred):
+        """Reads the status of every sent command, responses of deferred commands are read by their readers.
+        Afterwards result is positioned at the response of the last command.
+        """
+        for index, command in enumerate(queue):
             prefix = result.read("!BBB")
             err = result.readString()
-            if prefix[2] or err:
-                self._string = bytes()
-                self._queue = []
+            if index in deferred:
+                self._readDeferred(result, prefix, err, deferred.pop(index))
+            elif prefix[2] or err:
+                self._abortDeferred(deferred, TraCIException(err, prefix[1], _RESULTS[prefix[2]]))
                 raise TraCIException(err, prefix[1], _RESULTS[prefix[2]])
             elif prefix[1] != command:
+                self._abortDeferred(deferred, FatalTraCIError("Received answer %s for command %s." % (prefix[1],
+                                                                                                   command)))
                 raise FatalTraCIError("Received answer %s for command %s." % (prefix[1],
                                                                               command))
             elif prefix[1] == tc.CMD_STOP:
                 length = result.read("!B")[0] - 1
                 result.read("!%sx" % length)
-        self._string = bytes()
-        self._queue = []
-        return result
+
+    def _sendDeferrable(self):
+        """Sends the pending commands unless a batch is active.
+        Only commands which do not need a result (i.e. setters) may use this.
+        """
+        if self._batchDepth == 0:
+            self._sendExact()
+
+    def _createDeferredResult(self):
+        return DeferredResult()
+
+    def _deferLastCommand(self, reader):
+        """Registers the last queued command for deferred reading.
+        reader is called with the result positioned after the status and returns the value of the command.
+        """
+        future = self._createDeferredResult()
+        self._deferred[len(self._queue) - 1] = (future, reader)
+        return future
+
+    def _deferReadOneStringCmd(self, cmdID, varID, objID, valueFunc, store=None):
+        self._beginMessage(cmdID, varID, objID)
+        if store is None:
+            return self._deferLastCommand(lambda result: self._readValue(result, cmdID, varID, objID, valueFunc))
+        return self._deferLastCommand(lambda result: store(self._readValue(result, cmdID, varID, objID, valueFunc)))
+
+    def _readDeferred(self, result, prefix, err, deferred):
+        future, reader = deferred
+        if prefix[2] or err:
+            future._setException(TraCIException(err, prefix[1], _RESULTS[prefix[2]]))
+            return
+        future._setResult(reader(result))
+
+    def _abortDeferred(self, deferred, exception):
+        for future, _ in deferred.values():
+            future._setException(exception)
+        deferred.clear()
+
+    def batch(self):
+        """batch() -> Batch
+
+        Returns a context manager which queues all set commands, all simple getters and all subscriptions
+        issued inside the with block and sends them as a single message on exit.
+        Getters and subscriptions return a DeferredResult whose value is available after the block.
+        Any other command which needs an immediate answer sends the queued commands early.
+        """
+        return Batch(self)
 
     def _beginMessage(self, cmdID, varID, objID, length=0):
+        self._queueCommand(cmdID, objID)
+        self._message.beginMessage(cmdID, varID, objID, length)
+
+    def _queueCommand(self, cmdID, objID):
+        if self._getterCache is not None:
+            self._getterCache.commandSent(cmdID, objID)
         self._queue.append(cmdID)
-        length += 1 + 1 + 1 + 4 + len(objID)
-        if length <= 255:
-            self._string += struct.pack("!BB", length, cmdID)
-        else:
-            self._string += struct.pack("!BiB", 0, length + 4, cmdID)
-        self._packString(objID, varID)
 
     def _sendReadOneStringCmd(self, cmdID, varID, objID):
         self._beginMessage(cmdID, varID, objID)
         return self._checkResult(cmdID, varID, objID)
 
     def _sendIntCmd(self, cmdID, varID, objID, value):
-        self._beginMessage(cmdID, varID, objID, 1 + 4)
-        self._string += struct.pack("!Bi", tc.TYPE_INTEGER, value)
-        self._sendExact()
+        self._queueCommand(cmdID, objID)
+        self._message.packSetter(cmdID, varID, objID, tc.TYPE_INTEGER, value)
+        self._sendDeferrable()
 
     def _sendDoubleCmd(self, cmdID, varID, objID, value):
-        self._beginMessage(cmdID, varID, objID, 1 + 8)
-        self._string += struct.pack("!Bd", tc.TYPE_DOUBLE, value)
-        self._sendExact()
+        self._queueCommand(cmdID, objID)
+        self._message.packSetter(cmdID, varID, objID, tc.TYPE_DOUBLE, value)
+        self._sendDeferrable()
 
     def _sendByteCmd(self, cmdID, varID, objID, value):
-        self._beginMessage(cmdID, varID, objID, 1 + 1)
-        self._string += struct.pack("!BB", tc.TYPE_BYTE, value)
-        self._sendExact()
+        self._queueCommand(cmdID, objID)
+        self._message.packSetter(cmdID, varID, objID, tc.TYPE_BYTE, value)
+        self._sendDeferrable()
 
     def _sendUByteCmd(self, cmdID, varID, objID, value):
-        self._beginMessage(cmdID, varID, objID, 1 + 1)
-        self._string += struct.pack("!BB", tc.TYPE_UBYTE, value)
-        self._sendExact()
+        self._queueCommand(cmdID, objID)
+        self._message.packSetter(cmdID, varID, objID, tc.TYPE_UBYTE, value)
+        self._sendDeferrable()
 
     def _sendStringCmd(self, cmdID, varID, objID, value):
         self._beginMessage(cmdID, varID, objID, 1 + 4 + len(value))
         self._packString(value)
-        self._sendExact()
+        self._sendDeferrable()
+
+    def _sendReadOneValueCmd(self, cmdID, varID, objID, valueFunc):
+        self._beginMessage(cmdID, varID, objID)
+        return self._readValue(self._sendExact(), cmdID, varID, objID, valueFunc)
+
+    def _readValue(self, result, cmdID, varID, objID, valueFunc):
+        # the generated decoder of the variable reads the whole response, valueFunc the ones without a layout
+        decoder = compileGetterDecoder(cmdID, varID)
+        if decoder is not None:
+            decoded = result.readRecord(decoder)
+            if decoded is not None and decoded[0] == objID:
+                return decoded[1]
+            if decoded is not None:
+                raise FatalTraCIError("Received answer %s,%s,%s for command %s,%s,%s."
+                                      % (cmdID + 16, varID, decoded[0], cmdID, varID, objID))
+        return valueFunc(self._checkResponse(result, cmdID, varID, objID))
 
     def _checkResult(self, cmdID, varID, objID):
-        result = self._sendExact()
+        return self._checkResponse(self._sendExact(), cmdID, varID, objID)
+
+    def _checkResponse(self, result, cmdID, varID, objID):
         result.readLength()
         response, retVarID = result.read("!BB")
         objectID = result.readString()
@@ -174,83 +294,111 @@ class Connection:
             domain = result.read("!B")[0]
         numVars = result.read("!B")[0]
         if isVariableSubscription:
+            subscriptionResults = self._getSubscriptionResults(response)
+            varIDs = []
             while numVars > 0:
                 varID = result.read("!B")[0]
                 status, _ = result.read("!BB")
                 if status:
                     print("Error!", result.readString())
-                elif response in self._subscriptionMapping:
-                    self._subscriptionMapping[response].add(objectID, varID, result)
+                    varIDs = None
+                elif subscriptionResults is not None:
+                    subscriptionResults.add(objectID, varID, result)
+                    if varIDs is not None:
+                        varIDs.append(varID)
                 else:
                     raise FatalTraCIError(
                         "Cannot handle subscription response %02x for %s." % (response, objectID))
                 numVars -= 1
+            if varIDs:
+                subscriptionResults.learnRecord(varIDs)
         else:
             objectNo = result.read("!i")[0]
+            contextResults = self._getSubscriptionResults(response)
+            domainResults = self._getSubscriptionResults(domain)
             for _ in range(objectNo):
                 oid = result.readString()
                 if numVars == 0:
-                    self._subscriptionMapping[response].addContext(
-                        objectID, self._subscriptionMapping[domain], oid)
+                    contextResults.addContext(objectID, domainResults, oid)
+                elif contextResults is not None and domainResults is not None:
+                    # the records of the objects in the context are decoded by the decoder of their domain
+                    record = domainResults.readRecord(result, numVars)
+                    if record is not None:
+                        contextResults.addContextRecord(objectID, oid, *record)
+                        continue
+                varIDs = []
                 for __ in range(numVars):
                     varID = result.read("!B")[0]
                     status, ___ = result.read("!BB")
                     if status:
                         print("Error!", result.readString())
-                    elif response in self._subscriptionMapping:
-                        self._subscriptionMapping[response].addContext(
-                            objectID, self._subscriptionMapping[domain], oid, varID, result)
+                        varIDs = None
+                    elif contextResults is not None:
+                        contextResults.addContext(objectID, domainResults, oid, varID, result)
+                        if varIDs is not None:
+                            varIDs.append(varID)
                     else:
                         raise FatalTraCIError(
                             "Cannot handle subscription response %02x for %s." % (response, objectID))
+                if varIDs and domainResults is not None:
+                    domainResults.learnRecord(varIDs)
         return objectID, response
 
+    def _readSubscriptionRun(self, result, maxObjects, columnResults):
+        # the responses of many objects of a domain with columnar results are read at once
+        for subscriptionResults in columnResults:
+            objectIDs = subscriptionResults.readRun(result, maxObjects)
+            if objectIDs is not None:
+                response = subscriptionResults._responseID
+                return [(objectID, response) for objectID in objectIDs]
+        return None
+
     def _subscribe(self, cmdID, begin, end, objID, varIDs, parameters=None):
-        self._queue.append(cmdID)
-        length = 1 + 1 + 8 + 8 + 4 + len(objID) + 1 + len(varIDs)
-        if parameters:
-            for v in varIDs:
-                if v in parameters:
-                    length += len(parameters[v])
-        if length <= 255:
-            self._string += struct.pack("!B", length)
+        self._encodeSubscribe(cmdID, begin, end, objID, varIDs, parameters)
+        if self._subscriptionManager is not None:
+            self._subscriptionManager.added(cmdID, begin, end, objID, varIDs, parameters)
+        return self._sendSubscription(cmdID, objID, varIDs, False)
+
+    def _sendSubscription(self, cmdID, objID, varIDs, context):
+        """Sends the subscription unless a batch is active, then its response is read when the batch is sent
+        and the returned DeferredResult tells whether SUMO accepted it.
+        """
+        if not varIDs:
+            # unsubscribing has no response
+            self._sendDeferrable()
+        elif self._batchDepth > 0:
+            return self._deferLastCommand(lambda result: self._checkSubscription(result, cmdID, objID, context))
         else:
-            self._string += struct.pack("!Bi", 0, length + 4)
-        self._string += struct.pack("!Bddi",
-                                    cmdID, begin, end, len(objID)) + objID.encode("latin1")
-        self._string += struct.pack("!B", len(varIDs))
-        for v in varIDs:
-            self._string += struct.pack("!B", v)
-            if parameters and v in parameters:
-                self._string += parameters[v]
-        result = self._sendExact()
-        if varIDs:
-            objectID, response = self._readSubscription(result)
-            if response - cmdID != 16 or objectID != objID:
-                raise FatalTraCIError("Received answer %02x,%s for subscription command %02x,%s." % (
-                    response, objectID, cmdID, objID))
+            self._checkSubscription(self._sendExact(), cmdID, objID, context)
+        return None
+
+    def _checkSubscription(self, result, cmdID, objID, context=False):
+        objectID, response = self._readSubscription(result)
+        if response - cmdID != 16 or objectID != objID:
+            raise FatalTraCIError("Received answer %02x,%s for %ssubscription command %02x,%s." % (
+                response, objectID, "context " if context else "", cmdID, objID))
+
+    def _encodeSubscribe(self, cmdID, begin, end, objID, varIDs, parameters=None):
+        self._queue.append(cmdID)
+        self._message.packBytes(compileSubscription(cmdID, begin, end, varIDs, parameters).encode(objID))
 
     def _getSubscriptionResults(self, cmdID):
-        return self._subscriptionMapping[cmdID]
+        subscriptionResults = self._subscriptionMapping.get(cmdID)
+        if subscriptionResults is None and cmdID in _DOMAIN_IDS:
+            # a domain which was not used with this connection yet, e.g. the objects of a context subscription
+            _getDefaultDomain(_DOMAIN_IDS[cmdID])._register(self, self._subscriptionMapping)
+            subscriptionResults = self._subscriptionMapping[cmdID]
+        return subscriptionResults
 
     def _subscribeContext(self, cmdID, begin, end, objID, domain, dist, varIDs):
+        self._encodeSubscribeContext(cmdID, begin, end, objID, domain, dist, varIDs)
+        if self._subscriptionManager is not None:
+            self._subscriptionManager.addedContext(cmdID, begin, end, objID, domain, dist, varIDs)
+        return self._sendSubscription(cmdID, objID, varIDs, True)
+
+    def _encodeSubscribeContext(self, cmdID, begin, end, objID, domain, dist, varIDs):
         self._queue.append(cmdID)
-        length = 1 + 1 + 8 + 8 + 4 + len(objID) + 1 + 8 + 1 + len(varIDs)
-        if length <= 255:
-            self._string += struct.pack("!B", length)
-        else:
-            self._string += struct.pack("!Bi", 0, length + 4)
-        self._string += struct.pack("!Bddi",
-                                    cmdID, begin, end, len(objID)) + objID.encode("latin1")
-        self._string += struct.pack("!BdB", domain, dist, len(varIDs))
-        for v in varIDs:
-            self._string += struct.pack("!B", v)
-        result = self._sendExact()
-        if varIDs:
-            objectID, response = self._readSubscription(result)
-            if response - cmdID != 16 or objectID != objID:
-                raise FatalTraCIError("Received answer %02x,%s for context subscription command %02x,%s." % (
-                    response, objectID, cmdID, objID))
+        self._message.packBytes(compileSubscription(cmdID, begin, end, varIDs, None, domain, dist).encode(objID))
 
     def _addSubscriptionFilter(self, filterType, params=None):
         command = tc.CMD_ADD_SUBSCRIPTION_FILTER
@@ -260,12 +408,12 @@ class Connection:
             # filter without parameter
             assert(params is None)
             length = 1 + 1 + 1  # length + CMD + FILTER_ID
-            self._string += struct.pack("!BBB", length, command, filterType)
+            self._message.pack("!BBB", length, command, filterType)
         elif filterType in (tc.FILTER_TYPE_DOWNSTREAM_DIST, tc.FILTER_TYPE_UPSTREAM_DIST):
             # filter with float parameter
             assert(type(params) is float)
             length = 1 + 1 + 1 + 1 + 8  # length + CMD + FILTER_ID + floattype + float
-            self._string += struct.pack("!BBBBd", length, command, filterType, tc.TYPE_DOUBLE, params)
+            self._message.pack("!BBBBd", length, command, filterType, tc.TYPE_DOUBLE, params)
         elif filterType in (tc.FILTER_TYPE_VCLASS, tc.FILTER_TYPE_VTYPE):
             # filter with list(string) parameter
             length = 1 + 1 + 1 + 1 + 4  # length + CMD + FILTER_ID + TYPE_STRINGLIST + length(stringlist)
@@ -275,10 +423,10 @@ class Connection:
             except Exception:
                 raise TraCIException("Filter type %s requires identifier list as parameter." % filterType)
             if length <= 255:
-                self._string += struct.pack("!BBB", length, command, filterType)
+                self._message.pack("!BBB", length, command, filterType)
             else:
                 length += 4  # extended msg length
-                self._string += struct.pack("!BiBB", 0, length, command, filterType)
+                self._message.pack("!BiBB", 0, length, command, filterType)
             self._packStringList(params)
         elif filterType == tc.FILTER_TYPE_LANES:
             # filter with list(byte) parameter
@@ -287,7 +435,7 @@ class Connection:
             if len(lanes) < len(list(params)):
                 warnings.warn("Ignoring duplicate lane specification for subscription filter.")
             length = 1 + 1 + 1 + 1 + len(lanes)  # length + CMD + FILTER_ID + length(list) as ubyte + lane-indices
-            self._string += struct.pack("!BBBB", length, command, filterType, len(lanes))
+            self._message.pack("!BBBB", length, command, filterType, len(lanes))
             for i in lanes:
                 if not type(i) is int:
                     raise TraCIException("Filter type lanes requires numeric index list as parameter.")
@@ -295,16 +443,25 @@ class Connection:
                     raise TraCIException("Filter type lanes: maximal lane index is 127.")
                 if i < 0:
                     i += 256
-                self._string += struct.pack("!B", i)
+                self._message.pack("!B", i)
 
     def load(self, args):
         """
         Load a simulation from the given arguments.
         """
+        self._encodeLoad(args)
+        self._sendExact()
+        if self._subscriptionManager is not None:
+            with self.batch():
+                pending = self._subscriptionManager.restore()
+            self._subscriptionManager.checkRestored(pending)
+
+    def _encodeLoad(self, args):
+        if self._getterCache is not None:
+            self._getterCache.clear()
         self._queue.append(tc.CMD_LOAD)
-        self._string += struct.pack("!BiB", 0, 1 + 4 + 1 + 1 + 4 + sum(map(len, args)) + 4 * len(args), tc.CMD_LOAD)
+        self._message.pack("!BiB", 0, 1 + 4 + 1 + 1 + 4 + sum(map(len, args)) + 4 * len(args), tc.CMD_LOAD)
         self._packStringList(args)
-        self._sendExact()
 
     def simulationStep(self, step=0.):
         """
@@ -314,40 +471,62 @@ class Connection:
         """
         if type(step) is int and step >= 1000:
             warnings.warn("API change now handles step as floating point seconds", stacklevel=2)
+        self._encodeSimulationStep(step)
+        responses = self._readSimulationStep(self._sendExact())
+        self._manageStepListeners(step)
+        return responses
+
+    def _encodeSimulationStep(self, step):
+        if self._getterCache is not None:
+            self._getterCache.nextStep()
         self._queue.append(tc.CMD_SIMSTEP)
-        self._string += struct.pack("!BBd", 1 + 1 + 8, tc.CMD_SIMSTEP, step)
-        result = self._sendExact()
-        for subscriptionResults in self._subscriptionMapping.values():
+        self._message.pack("!BBd", 1 + 1 + 8, tc.CMD_SIMSTEP, step)
+
+    def _readSimulationStep(self, result):
+        # every domain is mapped three times (variable, context and get response)
+        allResults = set(self._subscriptionMapping.values())
+        for subscriptionResults in allResults:
             subscriptionResults.reset()
+        columnResults = [subscriptionResults for subscriptionResults in allResults if subscriptionResults.hasColumns()]
         numSubs = result.readInt()
         responses = []
+        lastResults = None
         while numSubs > 0:
-            responses.append(self._readSubscription(result))
+            if columnResults and numSubs >= _MIN_COLUMN_RUN:
+                read = self._readSubscriptionRun(result, numSubs, columnResults)
+                if read:
+                    responses.extend(read)
+                    numSubs -= len(read)
+                    continue
+            if lastResults is not None:
+                # the responses following a generically decoded one mostly have the same variables
+                objectIDs = lastResults.readRecords(result, numSubs)
+                if objectIDs:
+                    responses.extend([(objectID, lastResults._responseID) for objectID in objectIDs])
+                    numSubs -= len(objectIDs)
+                    continue
+            objectID, response = self._readSubscription(result)
+            responses.append((objectID, response))
+            lastResults = self._subscriptionMapping.get(response)
             numSubs -= 1
+        if self._subscriptionManager is not None:
+            self._subscriptionManager.stepDone()
+        return responses
 
-        # manage stepListeners
-        listenersToRemove = []
-        for (listenerID, listener) in self._stepListeners.items():
-            keep = listener.step(step)
-            if not keep:
-                listenersToRemove.append(listenerID)
-        for listenerID in listenersToRemove:
+    def _manageStepListeners(self, step):
+        for listenerID in self._stepListeners.run(step, self._subscriptionMapping):
             self.removeStepListener(listenerID)
 
-        return responses
-
-    def addStepListener(self, listener):
-        """addStepListener(traci.StepListener) -> int
+    def addStepListener(self, listener, priority=0):
+        """addStepListener(traci.StepListener, integer) -> int
 
         Append the step listener (its step function is called at the end of every call to traci.simulationStep())
+        Listeners with a lower priority are called first, the ones with equal priority in the order they were added.
+        A traci.ReadOnlyStepListener is called on a worker thread with a snapshot of the subscription results.
         Returns the ID assigned to the listener if it was added successfully, None otherwise.
         """
         if issubclass(type(listener), StepListener):
-            listener.setID(self._nextStepListenerID)
-            self._stepListeners[self._nextStepListenerID] = listener
-            self._nextStepListenerID += 1
-            # print ("traci: Added stepListener %s\nlisteners: %s"%(_nextStepListenerID - 1, _stepListeners))
-            return self._nextStepListenerID - 1
+            return self._stepListeners.add(listener, priority, isinstance(listener, ReadOnlyStepListener))
         warnings.warn(
             "Proposed listener's type must inherit from traci.StepListener. Not adding object of type '%s'" %
             type(listener))
@@ -359,45 +538,199 @@ class Connection:
         Remove the step listener from traci's step listener container.
         Returns True if the listener was removed successfully, False if it wasn't registered.
         """
-        # print ("traci: removeStepListener %s\nlisteners: %s"%(listenerID, _stepListeners))
-        if listenerID in self._stepListeners:
-            self._stepListeners[listenerID].cleanUp()
-            del self._stepListeners[listenerID]
-            # print ("traci: Removed stepListener %s"%(listenerID))
+        if self._stepListeners.remove(listenerID):
             return True
-        warnings.warn("Cannot remove unknown listener %s.\nlisteners:%s" % (listenerID, self._stepListeners))
+        warnings.warn("Cannot remove unknown listener %s.\nlisteners:%s" % (listenerID, self._stepListeners.getIDs()))
         return False
 
+    def getStepListenerStats(self):
+        """getStepListenerStats() -> list(ListenerStats)
+
+        Returns calls and execution times of the step listeners in the order they are called.
+        """
+        return self._stepListeners.getStats()
+
+    def getRoundTrips(self):
+        """getRoundTrips() -> int
+
+        Returns the number of messages which were sent to SUMO over this connection.
+        """
+        return self._roundTrips
+
+    def enableProfiler(self, traceFile=None, summaryFile=None):
+        """enableProfiler(string, string) -> CommandProfiler
+
+        Records count, bytes and latency of every command sent over this connection from now on.
+        On close (or disableProfiler) the summary is written to summaryFile (stdout if None)
+        and the timeline of the round trips as Chrome trace to traceFile (if given).
+        """
+        # the optional tools are only imported when they are enabled
+        from .profiler import CommandProfiler
+        self._profiler = CommandProfiler(traceFile, summaryFile)
+        return self._profiler
+
+    def enableGetterCache(self):
+        """enableGetterCache() -> GetterCache
+
+        Caches the values of static and per step getters of this connection, see cache.py.
+        """
+        if self._getterCache is None:
+            from .cache import GetterCache
+            self._getterCache = GetterCache()
+        return self._getterCache
+
+    def getGetterCache(self):
+        return self._getterCache
+
+    def disableGetterCache(self):
+        self._getterCache = None
+
+    def enableSubscriptionManager(self, pruneSize=1024):
+        """enableSubscriptionManager(integer) -> SubscriptionManager
+
+        Records the variable and context subscriptions made over this connection from now on
+        and subscribes them again after load(). See subscriptions.py.
+        """
+        if self._subscriptionManager is None:
+            self._subscriptionManager = SubscriptionManager(self, pruneSize)
+        return self._subscriptionManager
+
+    def getSubscriptionManager(self):
+        return self._subscriptionManager
+
+    def disableSubscriptionManager(self):
+        self._subscriptionManager = None
+
+    def getProfiler(self):
+        return self._profiler
+
+    def disableProfiler(self):
+        """disableProfiler() -> CommandProfiler
+
+        Stops the profiling, writes its summary and trace and returns the profiler (None if it was not enabled).
+        """
+        profiler, self._profiler = self._profiler, None
+        if profiler is not None:
+            profiler.close()
+        return profiler
+
+    def enableRecorder(self, fileName):
+        """enableRecorder(string) -> SessionRecorder
+
+        Writes the requests and responses of all round trips over this connection from now on to the session file,
+        which can be served by a replay.ReplayServer instead of SUMO. See replay.py.
+        """
+        self.disableRecorder()
+        from .replay import SessionRecorder
+        self._recorder = SessionRecorder(fileName)
+        return self._recorder
+
+    def getRecorder(self):
+        return self._recorder
+
+    def disableRecorder(self):
+        """disableRecorder() -> SessionRecorder
+
+        Stops the recording, closes the session file and returns the recorder (None if it was not enabled).
+        """
+        recorder, self._recorder = self._recorder, None
+        if recorder is not None:
+            recorder.close()
+        return recorder
+
     def getVersion(self):
-        command = tc.CMD_GETVERSION
-        self._queue.append(command)
-        self._string += struct.pack("!BB", 1 + 1, command)
-        result = self._sendExact()
+        self._encodeGetVersion()
+        return self._readVersion(self._sendExact())
+
+    def _encodeGetVersion(self):
+        self._queue.append(tc.CMD_GETVERSION)
+        self._message.pack("!BB", 1 + 1, tc.CMD_GETVERSION)
+
+    def _readVersion(self, result):
         result.readLength()
         response = result.read("!B")[0]
-        if response != command:
+        if response != tc.CMD_GETVERSION:
             raise FatalTraCIError(
-                "Received answer %s for command %s." % (response, command))
+                "Received answer %s for command %s." % (response, tc.CMD_GETVERSION))
         return result.readInt(), result.readString()
 
     def setOrder(self, order):
         self._queue.append(tc.CMD_SETORDER)
-        self._string += struct.pack("!BBi", 1 + 1 + 4, tc.CMD_SETORDER, order)
+        self._message.pack("!BBi", 1 + 1 + 4, tc.CMD_SETORDER, order)
         self._sendExact()
 
     def close(self, wait=True):
-        for listenerID in list(self._stepListeners.keys()):
+        for listenerID in self._stepListeners.getIDs():
             self.removeStepListener(listenerID)
-        if hasattr(self, "_socket"):
+        if hasattr(self, "_transport"):
             self._queue.append(tc.CMD_CLOSE)
-            self._string += struct.pack("!BB", 1 + 1, tc.CMD_CLOSE)
+            self._message.pack("!BB", 1 + 1, tc.CMD_CLOSE)
             self._sendExact()
-            self._socket.close()
-            del self._socket
+            self._transport.close()
+            del self._transport
+        self.disableProfiler()
+        self.disableRecorder()
         if wait and self._process is not None:
             self._process.wait()
 
 
+class DeferredResult(object):
+
+    """Placeholder for the value of a getter issued inside Connection.batch()."""
+
+    def __init__(self):
+        self._done = False
+        self._value = None
+        self._exception = None
+
+    def _setResult(self, value):
+        self._value = value
+        self._done = True
+
+    def _setException(self, exception):
+        self._exception = exception
+        self._done = True
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        """result() -> <value_type>
+
+        Returns the value of the deferred getter or raises the error reported by SUMO.
+        """
+        if not self._done:
+            raise TraCIException("The result is not available before the batch has been sent.")
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+
+class Batch(object):
+
+    """Context manager returned by Connection.batch()."""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __enter__(self):
+        self._connection._batchDepth += 1
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        connection = self._connection
+        connection._batchDepth -= 1
+        if connection._batchDepth > 0:
+            return False
+        if excType is None:
+            if connection._queue:
+                connection._sendExact()
+        else:
+            _, deferred = connection._takeQueue()
+            connection._abortDeferred(deferred, TraCIException("Batch aborted."))
+        return False
+
+
 class StepListener(object):
     __metaclass__ = abc.ABCMeta
 
@@ -423,3 +756,19 @@ class StepListener(object):
 
     def getID(self):
         return self._ID
+
+
+class ReadOnlyStepListener(StepListener):
+
+    """A step listener which only reads the subscription results, e.g. for logging or metrics.
+    It is called on a worker thread while the simulation goes on, so it must not use the connection.
+    """
+
+    @abc.abstractmethod
+    def step(self, t=0, snapshot=None):
+        """step(int, traci.listeners.StepSnapshot) -> bool
+
+        Called with the read-only subscription results of the step after each call to traci.simulationStep(t).
+        The return value indicates whether the stepListener wants to stay active.
+        """
+        return True
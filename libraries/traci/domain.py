@@ -19,22 +19,91 @@
 from __future__ import print_function
 from __future__ import absolute_import
 import copy
-import struct
+import importlib
 import warnings
 
 from . import constants as tc
 from .storage import Storage
-from .exceptions import FatalTraCIError
+from .exceptions import FatalTraCIError, TraCIException
+from .records import compileRecordDecoder, compileRunDecoder
 
 _defaultDomains = []
+# the default domains are created when they are used first (see _getDefaultDomain),
+# name -> module, class and the ids of the get command and of the variable and context subscription responses
+_DOMAIN_MODULES = {
+    "inductionloop": ("_inductionloop", "InductionLoopDomain",
+                      (tc.CMD_GET_INDUCTIONLOOP_VARIABLE, tc.RESPONSE_SUBSCRIBE_INDUCTIONLOOP_VARIABLE,
+                       tc.RESPONSE_SUBSCRIBE_INDUCTIONLOOP_CONTEXT)),
+    "lanearea": ("_lanearea", "LaneAreaDomain",
+                 (tc.CMD_GET_LANEAREA_VARIABLE, tc.RESPONSE_SUBSCRIBE_LANEAREA_VARIABLE,
+                  tc.RESPONSE_SUBSCRIBE_LANEAREA_CONTEXT)),
+    "multientryexit": ("_multientryexit", "MultiEntryExitDomain",
+                       (tc.CMD_GET_MULTIENTRYEXIT_VARIABLE, tc.RESPONSE_SUBSCRIBE_MULTIENTRYEXIT_VARIABLE,
+                        tc.RESPONSE_SUBSCRIBE_MULTIENTRYEXIT_CONTEXT)),
+    "trafficlight": ("_trafficlight", "TrafficLightDomain",
+                     (tc.CMD_GET_TL_VARIABLE, tc.RESPONSE_SUBSCRIBE_TL_VARIABLE, tc.RESPONSE_SUBSCRIBE_TL_CONTEXT)),
+    "lane": ("_lane", "LaneDomain",
+             (tc.CMD_GET_LANE_VARIABLE, tc.RESPONSE_SUBSCRIBE_LANE_VARIABLE, tc.RESPONSE_SUBSCRIBE_LANE_CONTEXT)),
+    "person": ("_person", "PersonDomain",
+               (tc.CMD_GET_PERSON_VARIABLE, tc.RESPONSE_SUBSCRIBE_PERSON_VARIABLE,
+                tc.RESPONSE_SUBSCRIBE_PERSON_CONTEXT)),
+    "route": ("_route", "RouteDomain",
+              (tc.CMD_GET_ROUTE_VARIABLE, tc.RESPONSE_SUBSCRIBE_ROUTE_VARIABLE, tc.RESPONSE_SUBSCRIBE_ROUTE_CONTEXT)),
+    "vehicle": ("_vehicle", "VehicleDomain",
+                (tc.CMD_GET_VEHICLE_VARIABLE, tc.RESPONSE_SUBSCRIBE_VEHICLE_VARIABLE,
+                 tc.RESPONSE_SUBSCRIBE_VEHICLE_CONTEXT)),
+    "vehicletype": ("_vehicletype", "VehicleTypeDomain",
+                    (tc.CMD_GET_VEHICLETYPE_VARIABLE, tc.RESPONSE_SUBSCRIBE_VEHICLETYPE_VARIABLE,
+                     tc.RESPONSE_SUBSCRIBE_VEHICLETYPE_CONTEXT)),
+    "edge": ("_edge", "EdgeDomain",
+             (tc.CMD_GET_EDGE_VARIABLE, tc.RESPONSE_SUBSCRIBE_EDGE_VARIABLE, tc.RESPONSE_SUBSCRIBE_EDGE_CONTEXT)),
+    "gui": ("_gui", "GuiDomain",
+            (tc.CMD_GET_GUI_VARIABLE, tc.RESPONSE_SUBSCRIBE_GUI_VARIABLE, tc.RESPONSE_SUBSCRIBE_GUI_CONTEXT)),
+    "junction": ("_junction", "JunctionDomain",
+                 (tc.CMD_GET_JUNCTION_VARIABLE, tc.RESPONSE_SUBSCRIBE_JUNCTION_VARIABLE,
+                  tc.RESPONSE_SUBSCRIBE_JUNCTION_CONTEXT)),
+    "poi": ("_poi", "PoiDomain",
+            (tc.CMD_GET_POI_VARIABLE, tc.RESPONSE_SUBSCRIBE_POI_VARIABLE, tc.RESPONSE_SUBSCRIBE_POI_CONTEXT)),
+    "polygon": ("_polygon", "PolygonDomain",
+                (tc.CMD_GET_POLYGON_VARIABLE, tc.RESPONSE_SUBSCRIBE_POLYGON_VARIABLE,
+                 tc.RESPONSE_SUBSCRIBE_POLYGON_CONTEXT)),
+    "simulation": ("_simulation", "SimulationDomain",
+                   (tc.CMD_GET_SIM_VARIABLE, tc.RESPONSE_SUBSCRIBE_SIM_VARIABLE, tc.RESPONSE_SUBSCRIBE_SIM_CONTEXT)),
+}
+_DOMAIN_IDS = dict((cmdID, name) for name, (_, __, cmdIDs) in _DOMAIN_MODULES.items() for cmdID in cmdIDs)
+# shorter runs of subscription responses are read by the compiled run decoders even with columnar results,
+# copying their values with numpy does not beat them
+_MIN_COLUMN_RUN = 500
+
+
+def _getDefaultDomain(name):
+    """Returns the default domain with the given name, its module is imported on the first call."""
+    for domain in _defaultDomains:
+        if domain._name == name:
+            return domain
+    moduleName, className, _ = _DOMAIN_MODULES[name]
+    module = importlib.import_module("." + moduleName, __package__)
+    # the domain adds itself to _defaultDomains
+    return getattr(module, className)()
 
 
 class SubscriptionResults:
 
-    def __init__(self, valueFunc):
+    def __init__(self, valueFunc, cmdGetID=None, responseID=None):
         self._results = {}
         self._contextResults = {}
         self._valueFunc = valueFunc
+        self._cmdGetID = cmdGetID
+        self._responseID = responseID
+        # variables and compiled decoders of the last record, most objects are subscribed to the same variables
+        self._recordVarIDs = None
+        self._recordDecoder = None
+        self._runDecoder = None
+        self._columns = None
+        self._filled = False
+        self._history = None
+        # whether the dicts of the step are referenced by a StepSnapshot, see share
+        self._shared = False
 
     def _parse(self, varID, data):
         if varID not in self._valueFunc:
@@ -42,20 +111,161 @@ class SubscriptionResults:
         return self._valueFunc[varID](data)
 
     def reset(self):
-        self._results.clear()
-        self._contextResults.clear()
+        # new dicts instead of clearing the old ones, which may be referenced by a StepSnapshot
+        self._results = {}
+        self._contextResults = {}
+        self._shared = False
+        if self._columns is not None:
+            self._columns.reset()
+            self._filled = False
+        if self._history is not None:
+            self._history.nextStep()
+
+    def enableColumns(self, varIDs, capacity=1024):
+        # numpy is only imported if columnar results are used
+        from .columnar import ColumnarResults
+        self._columns = ColumnarResults(varIDs, capacity)
+        self._filled = False
+
+    def hasColumns(self):
+        return self._columns is not None
+
+    def enableHistory(self, varIDs, steps, maxObjects=10000, stepLength=None):
+        from .history import SubscriptionHistory
+        self._history = SubscriptionHistory(varIDs, steps, maxObjects, stepLength)
+        return self._history
+
+    def getHistory(self):
+        return self._history
+
+    def readRecord(self, data, numVars):
+        """readRecord(Storage, integer) -> (tuple, tuple)
+
+        Reads the variables and values of one object with the decoder of the last record.
+        Returns None and leaves data unchanged if they do not match.
+        """
+        if self._recordDecoder is None or len(self._recordVarIDs) != numVars:
+            return None
+        values = data.readRecord(self._recordDecoder)
+        if values is None:
+            return None
+        return self._recordVarIDs, values
+
+    def learnRecord(self, varIDs):
+        """Compiles the decoder for records with the given variables, e.g. after decoding one generically."""
+        varIDs = tuple(varIDs)
+        if varIDs != self._recordVarIDs:
+            self._recordVarIDs = varIDs
+            self._recordDecoder = compileRecordDecoder(self._cmdGetID, varIDs)
+            self._runDecoder = compileRunDecoder(self._responseID, self._cmdGetID, varIDs)
+
+    def readRecords(self, data, maxObjects):
+        """readRecords(Storage, integer) -> list(string)
+
+        Reads the following variable subscription responses of the domain which have the variables
+        of the last record with one call of the compiled run decoder. Returns the ids of the objects read.
+        """
+        if self._runDecoder is None:
+            return []
+        records, data._pos = self._runDecoder(data._content, data._pos, maxObjects)
+        varIDs = self._recordVarIDs
+        if self._history is not None or self._columns is not None:
+            for objectID, values in records:
+                self.addRecord(objectID, varIDs, values)
+            return [objectID for objectID, _ in records]
+        if self._shared:
+            self._unshare()
+        results = self._results
+        for objectID, values in records:
+            if objectID in results:
+                results[objectID].update(zip(varIDs, values))
+            else:
+                results[objectID] = dict(zip(varIDs, values))
+        return [objectID for objectID, _ in records]
+
+    def readRun(self, data, maxObjects):
+        """readRun(Storage, integer) -> list(string)
+
+        Reads the following subscription responses of the domain at once if columnar results are enabled
+        and they have the variables of the last record, the numeric values of column variables are copied
+        into the columns without decoding them one by one. Returns the ids of the objects read,
+        None if the next response is not read this way.
+        """
+        if self._recordDecoder is None or self._history is not None:
+            return None
+        run = self._columns.readRun(data, self._responseID, _MIN_COLUMN_RUN, maxObjects, self._cmdGetID,
+                                    self._recordVarIDs)
+        if run is None:
+            return None
+        objectIDs, values = run
+        self._filled = False
+        if self._shared:
+            self._unshare()
+        if values:
+            # the values of the variables which are not stored in columns
+            varIDs = [varID for varID, _ in values]
+            for objectID, record in zip(objectIDs, zip(*[objectValues for _, objectValues in values])):
+                if objectID in self._results:
+                    self._results[objectID].update(zip(varIDs, record))
+                else:
+                    self._results[objectID] = dict(zip(varIDs, record))
+        return objectIDs
+
+    def addRecord(self, refID, varIDs, values):
+        if self._shared:
+            self._unshare()
+        if self._history is None:
+            if self._columns is not None:
+                # objects which are not read in a run keep all their values in the dicts as well
+                self._columns.addRecord(refID, varIDs, values)
+                self._filled = False
+            if refID in self._results:
+                self._results[refID].update(zip(varIDs, values))
+            else:
+                self._results[refID] = dict(zip(varIDs, values))
+            return
+        for varID, value in zip(varIDs, values):
+            self._addValue(refID, varID, value)
 
     def add(self, refID, varID, data):
+        self._addValue(refID, varID, self._parse(varID, data))
+
+    def _addValue(self, refID, varID, value):
+        if self._history is not None and varID in self._history.varIDs:
+            self._history.add(refID, varID, value)
+        if self._columns is not None and varID in self._columns.varIDs:
+            self._columns.add(refID, varID, value)
+            self._filled = False
+            return
+        if self._shared:
+            self._unshare()
         if refID not in self._results:
             self._results[refID] = {}
-        self._results[refID][varID] = self._parse(varID, data)
+        self._results[refID][varID] = value
+
+    def hasObject(self, refID):
+        """Returns whether the object delivered results in the last step."""
+        return refID in self._results or (self._columns is not None and refID in self._columns._slots)
 
     def get(self, refID=None):
+        if self._columns is not None and not self._filled:
+            # the dicts are only built when someone asks for them
+            if self._shared:
+                self._unshare()
+            self._columns.fill(self._results)
+            self._filled = True
         if refID is None:
             return self._results
         return self._results.get(refID, None)
 
+    def getArray(self, varID):
+        if self._columns is None:
+            raise TraCIException("Columnar subscription results are not enabled.")
+        return self._columns.getArray(varID)
+
     def addContext(self, refID, domain, objID, varID=None, data=None):
+        if self._shared:
+            self._unshare()
         if refID not in self._contextResults:
             self._contextResults[refID] = {}
         if objID not in self._contextResults[refID]:
@@ -64,6 +274,34 @@ class SubscriptionResults:
             self._contextResults[refID][objID][
                 varID] = domain._parse(varID, data)
 
+    def addContextRecord(self, refID, objID, varIDs, values):
+        if self._shared:
+            self._unshare()
+        if refID not in self._contextResults:
+            self._contextResults[refID] = {}
+        if objID in self._contextResults[refID]:
+            self._contextResults[refID][objID].update(zip(varIDs, values))
+        else:
+            self._contextResults[refID][objID] = dict(zip(varIDs, values))
+
+    def share(self):
+        """share() -> (dict, dict)
+
+        Returns the results and the context results of the step for a StepSnapshot without copying them.
+        The next write in the same step, e.g. of a subscription made between two steps, copies them first,
+        so the returned dicts stay unchanged.
+        """
+        results = self.get(None)
+        self._shared = True
+        return results, self._contextResults
+
+    def _unshare(self):
+        self._results = dict((refID, dict(values)) for refID, values in self._results.items())
+        self._contextResults = dict(
+            (refID, dict((objID, dict(values)) for objID, values in objects.items()))
+            for refID, objects in self._contextResults.items())
+        self._shared = False
+
     def getContext(self, refID=None):
         if refID is None:
             return self._contextResults
@@ -96,7 +334,7 @@ class Domain:
     def _register(self, connection, mapping):
         dom = copy.copy(self)
         dom._connection = connection
-        subscriptionResults = SubscriptionResults(self._retValFunc)
+        subscriptionResults = SubscriptionResults(self._retValFunc, self._cmdGetID, self._subscribeResponseID)
         mapping[self._subscribeResponseID] = subscriptionResults
         mapping[self._contextResponseID] = subscriptionResults
         mapping[self._cmdGetID] = subscriptionResults
@@ -111,8 +349,12 @@ class Domain:
                 self._name, self._deprecatedFor))  # , DeprecationWarning)
         if self._connection is None:
             raise FatalTraCIError("Not connected.")
-        result = self._connection._sendReadOneStringCmd(self._cmdGetID, varID, objectID)
-        return self._retValFunc[varID](result)
+        if self._connection._getterCache is not None:
+            return self._connection._getterCache.get(self._connection, self._cmdGetID, varID, objectID,
+                                                     self._retValFunc[varID])
+        if self._connection._batchDepth:
+            return self._connection._deferReadOneStringCmd(self._cmdGetID, varID, objectID, self._retValFunc[varID])
+        return self._connection._sendReadOneValueCmd(self._cmdGetID, varID, objectID, self._retValFunc[varID])
 
     def getIDList(self):
         """getIDList() -> list(string)
@@ -138,7 +380,7 @@ class Domain:
                 varIDs = (tc.LAST_STEP_VEHICLE_NUMBER,)
             else:
                 varIDs = (tc.TRACI_ID_LIST,)
-        self._connection._subscribe(
+        return self._connection._subscribe(
             self._subscribeID, begin, end, objectID, varIDs)
 
     def unsubscribe(self, objectID):
@@ -169,6 +411,48 @@ class Domain:
         """
         return self._connection._getSubscriptionResults(self._subscribeResponseID).get(None)
 
+    def enableColumnarSubscriptionResults(self, varIDs, capacity=1024):
+        """enableColumnarSubscriptionResults(list(integer), integer) -> None
+
+        Stores the subscription results of the given numeric variables for all objects of the domain
+        in numpy arrays instead of building a dict per object every step.
+        When many objects deliver the same variables, their values are copied from the simulation step
+        response into the arrays at once. Steps with fewer objects are decoded as without the arrays,
+        which pay off from several hundred objects.
+        The dicts returned by getSubscriptionResults and getAllSubscriptionResults are then only built
+        on request, getAllSubscriptionResultsArray gives direct access to the arrays.
+        capacity is the initial number of object slots, the arrays grow if more objects deliver results.
+        """
+        self._connection._getSubscriptionResults(self._subscribeResponseID).enableColumns(varIDs, capacity)
+
+    def getAllSubscriptionResultsArray(self, varID):
+        """getAllSubscriptionResultsArray(integer) -> (list(string), numpy.ndarray)
+
+        Returns the ids of all objects of the domain which delivered the given variable in the last time step
+        and its values for these objects as array in the same order.
+        Scalar variables give a 1d array, positions an array with one row per object.
+        The variable has to be enabled with enableColumnarSubscriptionResults.
+        """
+        return self._connection._getSubscriptionResults(self._subscribeResponseID).getArray(varID)
+
+    def enableSubscriptionHistory(self, varIDs, steps, maxObjects=10000, stepLength=None):
+        """enableSubscriptionHistory(list(integer), integer, integer, double) -> SubscriptionHistory
+
+        Records the subscription results of the given variables for the last steps calls of simulationStep
+        in ring buffers and returns the recorder. It offers windowed queries (get, mean, min, max,
+        rateOfChange) per object and variable. At most maxObjects objects are kept, the ones updated
+        least recently are evicted first. If stepLength is given, windows can also be given in seconds.
+        """
+        return self._connection._getSubscriptionResults(self._subscribeResponseID).enableHistory(
+            varIDs, steps, maxObjects, stepLength)
+
+    def getSubscriptionHistory(self):
+        """getSubscriptionHistory() -> SubscriptionHistory
+
+        Returns the recorder enabled by enableSubscriptionHistory or None.
+        """
+        return self._connection._getSubscriptionResults(self._subscribeResponseID).getHistory()
+
     def subscribeContext(self, objectID, domain, dist, varIDs=None,
                          begin=tc.INVALID_DOUBLE_VALUE, end=tc.INVALID_DOUBLE_VALUE):
         """subscribeContext(string, int, double, list(integer), double, double) -> None
@@ -181,7 +465,7 @@ class Domain:
                 varIDs = (tc.LAST_STEP_VEHICLE_NUMBER,)
             else:
                 varIDs = (tc.TRACI_ID_LIST,)
-        self._connection._subscribeContext(
+        return self._connection._subscribeContext(
             self._contextID, begin, end, objectID, domain, dist, varIDs)
 
     def unsubscribeContext(self, objectID, domain, dist):
@@ -212,7 +496,7 @@ class Domain:
         """
         self._connection._beginMessage(self._cmdSetID, tc.VAR_PARAMETER, objID,
                                        1 + 4 + 1 + 4 + len(param) + 1 + 4 + len(value))
-        self._connection._string += struct.pack("!Bi", tc.TYPE_COMPOUND, 2)
+        self._connection._message.pack("!Bi", tc.TYPE_COMPOUND, 2)
         self._connection._packString(param)
         self._connection._packString(value)
-        self._connection._sendExact()
+        self._connection._sendDeferrable()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    encoder.py
+# @date    2019-11-12
+# @version $Id$
+
+from __future__ import absolute_import
+import struct
+
+from . import constants as tc
+from .storage import _STRUCTS, _getStruct
+
+_INT = _getStruct("!i")
+_TYPED_LIST = _getStruct("!Bi")
+# type and value of the single value set commands
+_VALUES = {tc.TYPE_INTEGER: _getStruct("!Bi"),
+           tc.TYPE_DOUBLE: _getStruct("!Bd"),
+           tc.TYPE_BYTE: _getStruct("!BB"),
+           tc.TYPE_UBYTE: _getStruct("!BB")}
+
+
+class Encoder:
+
+    """Accumulates the commands of one outgoing message in a single bytearray which is extended in place.
+    The first four bytes are reserved for the message length which is filled in by getMessage.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray(4)
+        self._headers = {}
+
+    def __len__(self):
+        return len(self._buffer) - 4
+
+    def reset(self):
+        del self._buffer[4:]
+
+    def pack(self, format, *values):
+        s = _STRUCTS.get(format)
+        if s is None:
+            s = _getStruct(format)
+        self._buffer += s.pack(*values)
+
+    def packBytes(self, data):
+        self._buffer += data
+
+    def packString(self, s, pre=tc.TYPE_STRING):
+        data = s.encode("latin1")
+        self._buffer += _TYPED_LIST.pack(pre, len(data))
+        self._buffer += data
+
+    def packStringList(self, l):
+        parts = [_TYPED_LIST.pack(tc.TYPE_STRINGLIST, len(l))]
+        for s in l:
+            data = s.encode("latin1")
+            parts.append(_INT.pack(len(data)))
+            parts.append(data)
+        self._buffer += b"".join(parts)
+
+    def packDoubleList(self, l):
+        self._buffer += _getStruct("!Bi%sd" % len(l)).pack(tc.TYPE_DOUBLELIST, len(l), *l)
+
+    def _header(self, cmdID, varID, idLength, length):
+        key = (cmdID, varID, length, idLength)
+        header = self._headers.get(key)
+        if header is None:
+            length += 1 + 1 + 1 + 4 + idLength
+            if length <= 255:
+                header = struct.pack("!BBBi", length, cmdID, varID, idLength)
+            else:
+                header = struct.pack("!BiBBi", 0, length + 4, cmdID, varID, idLength)
+            self._headers[key] = header
+        return header
+
+    def beginMessage(self, cmdID, varID, objID, length=0):
+        """Writes the header of a variable get or set command.
+        length is the number of bytes following the object id.
+        The bytes before the object id only depend on the command, the variable and the lengths,
+        so they are cached per (cmdID, varID, length, length of the object id).
+        """
+        data = objID.encode("latin1")
+        header = self._headers.get((cmdID, varID, length, len(data)))
+        if header is None:
+            header = self._header(cmdID, varID, len(data), length)
+        self._buffer += header
+        self._buffer += data
+
+    def packSetter(self, cmdID, varID, objID, valueType, value):
+        """Writes a complete set command with a single integer, double or byte value."""
+        s = _VALUES[valueType]
+        data = objID.encode("latin1")
+        header = self._headers.get((cmdID, varID, s.size, len(data)))
+        if header is None:
+            header = self._header(cmdID, varID, len(data), s.size)
+        buffer = self._buffer
+        buffer += header
+        buffer += data
+        buffer += s.pack(valueType, value)
+
+    def getMessage(self):
+        """Fills in the length and returns a view on the complete message.
+        The view has to be released before further commands are added.
+        """
+        _INT.pack_into(self._buffer, 0, len(self._buffer))
+        return memoryview(self._buffer)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    history.py
+# @date    2019-11-12
+# @version $Id$
+
+from __future__ import absolute_import
+import collections
+
+from .exceptions import TraCIException
+from .columnar import np, createColumn
+
+
+class _Ring:
+
+    """The last values of one variable of one object together with the step they were received in."""
+
+    __slots__ = ("steps", "values", "next", "size")
+
+    def __init__(self, length, value):
+        self.steps = np.full(length, -1, dtype=np.int64)
+        self.values = createColumn(length, value)
+        self.next = 0
+        self.size = 0
+
+    def append(self, step, value):
+        last = self.next - 1
+        if self.size and self.steps[last] == step:
+            # a second value in the same step (e.g. the answer to a new subscription) replaces the first
+            self.values[last] = value
+            return
+        self.steps[self.next] = step
+        self.values[self.next] = value
+        self.next = (self.next + 1) % len(self.steps)
+        if self.size < len(self.steps):
+            self.size += 1
+
+    def window(self, firstStep):
+        indices = np.arange(self.next - self.size, self.next) % len(self.steps)
+        steps = self.steps[indices]
+        inWindow = steps >= firstStep
+        return steps[inWindow], self.values[indices[inWindow]]
+
+
+class SubscriptionHistory:
+
+    """Records the subscription values of the given variables for the last steps calls of simulationStep.
+    Steps are counted per call, so windows in seconds assume that every call advances by one step length.
+    Every object and variable has its own ring buffer, appending is O(1).
+    At most maxObjects objects are kept, if a new object arrives the one which was not updated
+    for the longest time is evicted, so the memory is bounded by
+    maxObjects * len(varIDs) * steps * (8 + size of a value) bytes.
+    If stepLength is given, windows can be given in seconds and rates are per second, otherwise per step.
+    Windows always end with the last simulation step and include only steps in which the object had results.
+    """
+
+    def __init__(self, varIDs, steps, maxObjects=10000, stepLength=None):
+        if np is None:
+            raise TraCIException("The subscription history needs numpy.")
+        if steps < 1 or maxObjects < 1:
+            raise TraCIException("The subscription history needs at least one step and one object.")
+        self.varIDs = frozenset(varIDs)
+        self._length = steps
+        self._maxObjects = maxObjects
+        self._stepLength = stepLength
+        self._step = 0
+        # least recently updated objects first
+        self._objects = collections.OrderedDict()
+
+    def nextStep(self):
+        self._step += 1
+
+    def getStep(self):
+        return self._step
+
+    def add(self, objectID, varID, value):
+        rings = self._objects.get(objectID)
+        if rings is None:
+            if len(self._objects) >= self._maxObjects:
+                self._objects.popitem(last=False)
+            rings = self._objects[objectID] = {}
+        else:
+            self._objects.move_to_end(objectID)
+        ring = rings.get(varID)
+        if ring is None:
+            ring = rings[varID] = _Ring(self._length, value)
+        ring.append(self._step, value)
+
+    def evict(self, objectID):
+        self._objects.pop(objectID, None)
+
+    def clear(self):
+        self._objects.clear()
+
+    def getIDList(self):
+        return list(self._objects)
+
+    def getMemoryUsage(self):
+        """Returns the number of bytes used by the buffers."""
+        return sum(ring.steps.nbytes + ring.values.nbytes
+                   for rings in self._objects.values() for ring in rings.values())
+
+    def _firstStep(self, steps, seconds):
+        if seconds is not None:
+            if self._stepLength is None:
+                raise TraCIException("Windows in seconds need the step length of the history.")
+            steps = int(round(seconds / self._stepLength))
+        if steps is None:
+            steps = self._length
+        return self._step - steps + 1
+
+    def get(self, objectID, varID, steps=None, seconds=None):
+        """get(string, integer, integer, double) -> (numpy.ndarray, numpy.ndarray)
+
+        Returns the steps and the values of the given variable within the window, oldest first.
+        Without a window all recorded values are returned.
+        """
+        ring = self._objects.get(objectID, {}).get(varID)
+        if ring is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        return ring.window(self._firstStep(steps, seconds))
+
+    def mean(self, objectID, varID, steps=None, seconds=None):
+        values = self.get(objectID, varID, steps, seconds)[1]
+        return values.mean(axis=0) if len(values) else None
+
+    def min(self, objectID, varID, steps=None, seconds=None):
+        values = self.get(objectID, varID, steps, seconds)[1]
+        return values.min(axis=0) if len(values) else None
+
+    def max(self, objectID, varID, steps=None, seconds=None):
+        values = self.get(objectID, varID, steps, seconds)[1]
+        return values.max(axis=0) if len(values) else None
+
+    def rateOfChange(self, objectID, varID, steps=None, seconds=None):
+        """Returns the change between the first and the last value of the window per second (per step
+        if the step length is unknown) or None if there are less than two values.
+        """
+        recordedSteps, values = self.get(objectID, varID, steps, seconds)
+        if len(values) < 2:
+            return None
+        elapsed = float(recordedSteps[-1] - recordedSteps[0])
+        if self._stepLength is not None:
+            elapsed *= self._stepLength
+        return (values[-1] - values[0]) / elapsed
@@ -0,0 +1,306 @@
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2009-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    layouts.py
+# @author  generated by "rebuildLayouts.py"
+# @date    2026-10-18 13:19:43.643421
+# @version $Id$
+
+"""
+This script contains the value layouts of the variables of every domain, derived from their _RETURN_VALUE_FUNC.
+A layout is a struct format (without byte order) for values of fixed size,
+"s" for strings and "l" for string lists. Variables without a layout are decoded by their function.
+"""
+
+from . import constants as tc
+
+LAYOUTS = {
+    tc.CMD_GET_INDUCTIONLOOP_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x10: 'i',  # LAST_STEP_VEHICLE_NUMBER
+        0x11: 'd',  # LAST_STEP_MEAN_SPEED
+        0x12: 'l',  # LAST_STEP_VEHICLE_ID_LIST
+        0x13: 'd',  # LAST_STEP_OCCUPANCY
+        0x15: 'd',  # LAST_STEP_LENGTH
+        0x16: 'd',  # LAST_STEP_TIME_SINCE_DETECTION
+        0x42: 'd',  # VAR_POSITION
+        0x51: 's',  # VAR_LANE_ID
+    },
+    tc.CMD_GET_MULTIENTRYEXIT_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x10: 'i',  # LAST_STEP_VEHICLE_NUMBER
+        0x11: 'd',  # LAST_STEP_MEAN_SPEED
+        0x12: 'l',  # LAST_STEP_VEHICLE_ID_LIST
+        0x14: 'i',  # LAST_STEP_VEHICLE_HALTING_NUMBER
+    },
+    tc.CMD_GET_TL_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x1b: 's',  # VAR_NAME
+        0x20: 's',  # TL_RED_YELLOW_GREEN_STATE
+        0x24: 'd',  # TL_PHASE_DURATION
+        0x26: 'l',  # TL_CONTROLLED_LANES
+        0x28: 'i',  # TL_CURRENT_PHASE
+        0x29: 's',  # TL_CURRENT_PROGRAM
+        0x2d: 'd',  # TL_NEXT_SWITCH
+    },
+    tc.CMD_GET_LANE_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x10: 'i',  # LAST_STEP_VEHICLE_NUMBER
+        0x11: 'd',  # LAST_STEP_MEAN_SPEED
+        0x12: 'l',  # LAST_STEP_VEHICLE_ID_LIST
+        0x13: 'd',  # LAST_STEP_OCCUPANCY
+        0x14: 'i',  # LAST_STEP_VEHICLE_HALTING_NUMBER
+        0x15: 'd',  # LAST_STEP_LENGTH
+        0x30: 'i',  # LANE_LINK_NUMBER
+        0x31: 's',  # LANE_EDGE_ID
+        0x34: 'l',  # LANE_ALLOWED
+        0x35: 'l',  # LANE_DISALLOWED
+        0x37: 'l',  # VAR_FOES
+        0x41: 'd',  # VAR_MAXSPEED
+        0x44: 'd',  # VAR_LENGTH
+        0x4d: 'd',  # VAR_WIDTH
+        0x5a: 'd',  # VAR_CURRENT_TRAVELTIME
+        0x60: 'd',  # VAR_CO2EMISSION
+        0x61: 'd',  # VAR_COEMISSION
+        0x62: 'd',  # VAR_HCEMISSION
+        0x63: 'd',  # VAR_PMXEMISSION
+        0x64: 'd',  # VAR_NOXEMISSION
+        0x65: 'd',  # VAR_FUELCONSUMPTION
+        0x66: 'd',  # VAR_NOISEEMISSION
+        0x71: 'd',  # VAR_ELECTRICITYCONSUMPTION
+        0x7a: 'd',  # VAR_WAITING_TIME
+    },
+    tc.CMD_GET_VEHICLE_VARIABLE: {
+        0x00: 'l',  # ROUTING_MODE_DEFAULT
+        0x01: 'i',  # FILTER_TYPE_LANES
+        0x1a: 'l',  # LAST_STEP_PERSON_ID_LIST
+        0x32: 'd',  # VAR_SPEED_LAT
+        0x36: 'd',  # VAR_SLOPE
+        0x38: 'i',  # VAR_PERSON_CAPACITY
+        0x39: 'ddd',  # VAR_POSITION3D
+        0x40: 'd',  # STOP_PARKING_AREA
+        0x41: 'd',  # VAR_MAXSPEED
+        0x42: 'dd',  # VAR_POSITION
+        0x43: 'd',  # VAR_ANGLE
+        0x44: 'd',  # VAR_LENGTH
+        0x45: 'BBBB',  # VAR_COLOR
+        0x46: 'd',  # VAR_ACCEL
+        0x47: 'd',  # VAR_DECEL
+        0x48: 'd',  # VAR_TAU
+        0x49: 's',  # VAR_VEHICLECLASS
+        0x4a: 's',  # VAR_EMISSIONCLASS
+        0x4b: 's',  # VAR_SHAPECLASS
+        0x4c: 'd',  # VAR_MINGAP
+        0x4d: 'd',  # VAR_WIDTH
+        0x4f: 's',  # VAR_TYPE
+        0x50: 's',  # VAR_ROAD_ID
+        0x51: 's',  # VAR_LANE_ID
+        0x52: 'i',  # VAR_LANE_INDEX
+        0x53: 's',  # VAR_ROUTE_ID
+        0x54: 'l',  # VAR_EDGES
+        0x56: 'd',  # VAR_LANEPOSITION
+        0x58: 'd',  # VAR_EDGE_TRAVELTIME
+        0x59: 'd',  # VAR_EDGE_EFFORT
+        0x5b: 'i',  # VAR_SIGNALS
+        0x5d: 'd',  # VAR_IMPERFECTION
+        0x5e: 'd',  # VAR_SPEED_FACTOR
+        0x5f: 'd',  # VAR_SPEED_DEVIATION
+        0x60: 'd',  # VAR_CO2EMISSION
+        0x61: 'd',  # VAR_COEMISSION
+        0x62: 'd',  # VAR_HCEMISSION
+        0x63: 'd',  # VAR_PMXEMISSION
+        0x64: 'd',  # VAR_NOXEMISSION
+        0x65: 'd',  # VAR_FUELCONSUMPTION
+        0x66: 'd',  # VAR_NOISEEMISSION
+        0x67: 'i',  # VAR_PERSON_NUMBER
+        0x69: 'i',  # VAR_ROUTE_INDEX
+        0x71: 'd',  # VAR_ELECTRICITYCONSUMPTION
+        0x72: 'd',  # VAR_ACCELERATION
+        0x7a: 'd',  # VAR_WAITING_TIME
+        0x7b: 'd',  # VAR_EMERGENCY_DECEL
+        0x7c: 'd',  # VAR_APPARENT_DECEL
+        0x7d: 'd',  # VAR_ACTIONSTEPLENGTH
+        0x7f: 'd',  # VAR_LASTACTIONTIME
+        0x83: 'd',  # DISTANCE_REQUEST
+        0x84: 'd',  # CMD_SUBSCRIBE_VEHICLE_CONTEXT
+        0x87: 'd',  # VAR_ACCUMULATED_WAITING_TIME
+        0x89: 'i',  # VAR_ROUTING_MODE
+        0xb1: 'd',  # VAR_SPEED_WITHOUT_TRACI
+        0xb3: 'i',  # VAR_SPEEDSETMODE
+        0xb5: 'i',  # VAR_STOPSTATE
+        0xb6: 'i',  # VAR_LANECHANGE_MODE
+        0xb7: 'd',  # VAR_ALLOWED_SPEED
+        0xb8: 'd',  # VAR_LANEPOSITION_LAT
+        0xb9: 's',  # VAR_LATALIGNMENT
+        0xba: 'd',  # VAR_MAXSPEED_LAT
+        0xbb: 'd',  # VAR_MINGAP_LAT
+        0xbc: 'd',  # VAR_HEIGHT
+        0xbd: 's',  # VAR_LINE
+        0xbe: 'l',  # VAR_VIA
+    },
+    tc.CMD_GET_VEHICLETYPE_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x38: 'i',  # VAR_PERSON_CAPACITY
+        0x41: 'd',  # VAR_MAXSPEED
+        0x44: 'd',  # VAR_LENGTH
+        0x45: 'BBBB',  # VAR_COLOR
+        0x46: 'd',  # VAR_ACCEL
+        0x47: 'd',  # VAR_DECEL
+        0x48: 'd',  # VAR_TAU
+        0x49: 's',  # VAR_VEHICLECLASS
+        0x4a: 's',  # VAR_EMISSIONCLASS
+        0x4b: 's',  # VAR_SHAPECLASS
+        0x4c: 'd',  # VAR_MINGAP
+        0x4d: 'd',  # VAR_WIDTH
+        0x5d: 'd',  # VAR_IMPERFECTION
+        0x5e: 'd',  # VAR_SPEED_FACTOR
+        0x5f: 'd',  # VAR_SPEED_DEVIATION
+        0x7b: 'd',  # VAR_EMERGENCY_DECEL
+        0x7c: 'd',  # VAR_APPARENT_DECEL
+        0x7d: 'd',  # VAR_ACTIONSTEPLENGTH
+        0xb9: 's',  # VAR_LATALIGNMENT
+        0xba: 'd',  # VAR_MAXSPEED_LAT
+        0xbb: 'd',  # VAR_MINGAP_LAT
+        0xbc: 'd',  # VAR_HEIGHT
+    },
+    tc.CMD_GET_ROUTE_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x54: 'l',  # VAR_EDGES
+    },
+    tc.CMD_GET_POI_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x42: 'dd',  # VAR_POSITION
+        0x43: 'd',  # VAR_ANGLE
+        0x45: 'BBBB',  # VAR_COLOR
+        0x4d: 'd',  # VAR_WIDTH
+        0x4f: 's',  # VAR_TYPE
+        0x93: 's',  # VAR_IMAGEFILE
+        0xbc: 'd',  # VAR_HEIGHT
+    },
+    tc.CMD_GET_POLYGON_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x45: 'BBBB',  # VAR_COLOR
+        0x4d: 'd',  # VAR_WIDTH
+        0x4f: 's',  # VAR_TYPE
+    },
+    tc.CMD_GET_JUNCTION_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x42: 'dd',  # VAR_POSITION
+    },
+    tc.CMD_GET_EDGE_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x10: 'i',  # LAST_STEP_VEHICLE_NUMBER
+        0x11: 'd',  # LAST_STEP_MEAN_SPEED
+        0x12: 'l',  # LAST_STEP_VEHICLE_ID_LIST
+        0x13: 'd',  # LAST_STEP_OCCUPANCY
+        0x14: 'i',  # LAST_STEP_VEHICLE_HALTING_NUMBER
+        0x15: 'd',  # LAST_STEP_LENGTH
+        0x1a: 'l',  # LAST_STEP_PERSON_ID_LIST
+        0x1b: 's',  # VAR_NAME
+        0x52: 'i',  # VAR_LANE_INDEX
+        0x58: 'd',  # VAR_EDGE_TRAVELTIME
+        0x59: 'd',  # VAR_EDGE_EFFORT
+        0x5a: 'd',  # VAR_CURRENT_TRAVELTIME
+        0x60: 'd',  # VAR_CO2EMISSION
+        0x61: 'd',  # VAR_COEMISSION
+        0x62: 'd',  # VAR_HCEMISSION
+        0x63: 'd',  # VAR_PMXEMISSION
+        0x64: 'd',  # VAR_NOXEMISSION
+        0x65: 'd',  # VAR_FUELCONSUMPTION
+        0x66: 'd',  # VAR_NOISEEMISSION
+        0x71: 'd',  # VAR_ELECTRICITYCONSUMPTION
+        0x7a: 'd',  # VAR_WAITING_TIME
+    },
+    tc.CMD_GET_SIM_VARIABLE: {
+        0x00: 'l',  # POSITION_LON_LAT
+        0x01: 'i',  # POSITION_2D
+        0x66: 'd',  # VAR_TIME
+        0x67: 'i',  # VAR_BUS_STOP_WAITING
+        0x68: 'i',  # VAR_STOP_STARTING_VEHICLES_NUMBER
+        0x69: 'l',  # VAR_STOP_STARTING_VEHICLES_IDS
+        0x6a: 'i',  # VAR_STOP_ENDING_VEHICLES_NUMBER
+        0x6b: 'l',  # VAR_STOP_ENDING_VEHICLES_IDS
+        0x6c: 'i',  # VAR_PARKING_STARTING_VEHICLES_NUMBER
+        0x6d: 'l',  # VAR_PARKING_STARTING_VEHICLES_IDS
+        0x6e: 'i',  # VAR_PARKING_ENDING_VEHICLES_NUMBER
+        0x6f: 'l',  # VAR_PARKING_ENDING_VEHICLES_IDS
+        0x70: 'i',  # VAR_TIME_STEP
+        0x71: 'i',  # VAR_LOADED_VEHICLES_NUMBER
+        0x72: 'l',  # VAR_LOADED_VEHICLES_IDS
+        0x73: 'i',  # VAR_DEPARTED_VEHICLES_NUMBER
+        0x74: 'l',  # VAR_DEPARTED_VEHICLES_IDS
+        0x75: 'i',  # VAR_TELEPORT_STARTING_VEHICLES_NUMBER
+        0x76: 'l',  # VAR_TELEPORT_STARTING_VEHICLES_IDS
+        0x77: 'i',  # VAR_TELEPORT_ENDING_VEHICLES_NUMBER
+        0x78: 'l',  # VAR_TELEPORT_ENDING_VEHICLES_IDS
+        0x79: 'i',  # VAR_ARRIVED_VEHICLES_NUMBER
+        0x7a: 'l',  # VAR_ARRIVED_VEHICLES_IDS
+        0x7b: 'd',  # VAR_DELTA_T
+        0x7d: 'i',  # VAR_MIN_EXPECTED_VEHICLES
+        0x80: 'i',  # VAR_COLLIDING_VEHICLES_NUMBER
+        0x81: 'l',  # VAR_COLLIDING_VEHICLES_IDS
+        0x89: 'i',  # VAR_EMERGENCYSTOPPING_VEHICLES_NUMBER
+        0x8a: 'l',  # VAR_EMERGENCYSTOPPING_VEHICLES_IDS
+        0x9f: 'l',  # VAR_BUS_STOP_ID_LIST
+        0xef: 'l',  # VAR_BUS_STOP_WAITING_IDS
+    },
+    tc.CMD_GET_GUI_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # POSITION_2D
+        0xa0: 'd',  # VAR_VIEW_ZOOM
+        0xa1: 'dd',  # VAR_VIEW_OFFSET
+        0xa2: 's',  # VAR_VIEW_SCHEMA
+        0xa6: 's',  # VAR_TRACK_VEHICLE
+    },
+    tc.CMD_GET_LANEAREA_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x10: 'i',  # LAST_STEP_VEHICLE_NUMBER
+        0x11: 'd',  # LAST_STEP_MEAN_SPEED
+        0x12: 'l',  # LAST_STEP_VEHICLE_ID_LIST
+        0x13: 'd',  # LAST_STEP_OCCUPANCY
+        0x14: 'i',  # LAST_STEP_VEHICLE_HALTING_NUMBER
+        0x18: 'i',  # JAM_LENGTH_VEHICLE
+        0x19: 'd',  # JAM_LENGTH_METERS
+        0x42: 'd',  # VAR_POSITION
+        0x44: 'd',  # VAR_LENGTH
+        0x51: 's',  # VAR_LANE_ID
+    },
+    tc.CMD_GET_PERSON_VARIABLE: {
+        0x00: 'l',  # TRACI_ID_LIST
+        0x01: 'i',  # ID_COUNT
+        0x36: 'd',  # VAR_SLOPE
+        0x39: 'ddd',  # VAR_POSITION3D
+        0x40: 'd',  # VAR_SPEED
+        0x42: 'dd',  # VAR_POSITION
+        0x43: 'd',  # VAR_ANGLE
+        0x44: 'd',  # VAR_LENGTH
+        0x45: 'BBBB',  # VAR_COLOR
+        0x4c: 'd',  # VAR_MINGAP
+        0x4d: 'd',  # VAR_WIDTH
+        0x4f: 's',  # VAR_TYPE
+        0x50: 's',  # VAR_ROAD_ID
+        0x53: 's',  # VAR_ROUTE_ID
+        0x54: 'l',  # VAR_EDGES
+        0x56: 'd',  # VAR_LANEPOSITION
+        0x7a: 'd',  # VAR_WAITING_TIME
+        0xc1: 's',  # VAR_NEXT_EDGE
+        0xc2: 'i',  # VAR_STAGES_REMAINING
+        0xc3: 's',  # VAR_VEHICLE
+    },
+}
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    listeners.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Ordered execution of the step listeners of a connection with timing statistics.
+
+After every simulationStep the listeners run in the order of their priority (lower values first,
+equal priorities in the order they were added) and the calls and execution times of every listener
+are recorded, see Connection.getStepListenerStats().
+
+A ReadOnlyStepListener does not run on the calling thread. It gets a StepSnapshot of the subscription
+results of the step and runs on a thread pool, overlapping with the other listeners and the round trip
+of the next simulationStep. Before the listeners of the next step run, the pipeline waits for it,
+so every read-only listener sees the steps one after the other. Exceptions raised by it are re-raised
+there (or when the listener is removed).
+
+The snapshot does not copy the results, it shares the dicts of the step with the connection. The connection
+starts new dicts for the next step, and a write between the steps (e.g. the response of a subscription made by
+another listener) copies them first, so the shared ones stay unchanged. The worker threads share the GIL with
+the main thread, so a read-only listener only overlaps with the time the main thread waits for SUMO
+(or runs other code releasing the GIL). With a server answering at once it is about as fast as
+a listener on the calling thread, and when SUMO runs on the same single core, the listener delays it
+instead of overlapping with it. It pays off when SUMO needs time for its steps on another core.
+"""
+
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import time
+from types import MappingProxyType
+
+from .domain import _DOMAIN_MODULES
+
+_EMPTY = MappingProxyType({})
+
+
+class ListenerStats:
+
+    """Calls and execution time of one step listener."""
+
+    def __init__(self, listenerID, name, priority, readOnly):
+        self.listenerID = listenerID
+        self.name = name
+        self.priority = priority
+        self.readOnly = readOnly
+        self.calls = 0
+        self.totalTime = 0.
+        self.maxTime = 0.
+
+    def add(self, seconds):
+        self.calls += 1
+        self.totalTime += seconds
+        self.maxTime = max(self.maxTime, seconds)
+
+    def getMeanTime(self):
+        return self.totalTime / self.calls if self.calls else 0.
+
+
+class StepSnapshot:
+
+    """Read-only view of the subscription results of all domains after one step.
+    It shares the dicts of the step with the connection, see SubscriptionResults.share.
+    """
+
+    def __init__(self, step, subscriptionMapping):
+        self.step = step
+        self._results = {}
+        self._contextResults = {}
+        for name, (_, __, (___, responseID, ____)) in _DOMAIN_MODULES.items():
+            # the same results are mapped for the variable, context and get response ids
+            subscriptionResults = subscriptionMapping.get(responseID)
+            if subscriptionResults is None:
+                continue
+            results, contextResults = subscriptionResults.share()
+            if results:
+                self._results[name] = MappingProxyType(results)
+            if contextResults:
+                self._contextResults[name] = MappingProxyType(contextResults)
+
+    def getSubscriptionResults(self, domain, objectID=None):
+        """getSubscriptionResults(string, string) -> dict
+
+        Returns the results of the object of the domain (e.g. "vehicle") or of all its objects if objectID is None.
+        """
+        results = self._results.get(domain, _EMPTY)
+        if objectID is None:
+            return results
+        values = results.get(objectID)
+        return None if values is None else MappingProxyType(values)
+
+    def getContextSubscriptionResults(self, domain, objectID=None):
+        """getContextSubscriptionResults(string, string) -> dict
+
+        Returns the context results of the object of the domain (e.g. "junction")
+        or of all its objects if objectID is None.
+        """
+        results = self._contextResults.get(domain, _EMPTY)
+        if objectID is None:
+            return results
+        objects = results.get(objectID)
+        return None if objects is None else MappingProxyType(objects)
+
+
+class StepListenerPipeline:
+
+    """The step listeners of a connection in execution order."""
+
+    def __init__(self, maxWorkers=2):
+        # listener id -> (priority, listener id, listener, stats)
+        self._listeners = {}
+        # the entries sorted by priority, rebuilt after a listener was added or removed
+        self._order = []
+        self._nextID = 0
+        self._maxWorkers = maxWorkers
+        self._executor = None
+        # (listener id, future) of the read-only listeners of the last step
+        self._pending = []
+
+    def __len__(self):
+        return len(self._listeners)
+
+    def getIDs(self):
+        return [entry[1] for entry in self._order]
+
+    def add(self, listener, priority=0, readOnly=False):
+        listenerID = self._nextID
+        self._nextID += 1
+        listener.setID(listenerID)
+        stats = ListenerStats(listenerID, type(listener).__name__, priority, readOnly)
+        self._listeners[listenerID] = (priority, listenerID, listener, stats)
+        self._order = sorted(self._listeners.values(), key=lambda entry: entry[:2])
+        return listenerID
+
+    def remove(self, listenerID):
+        """Removes the listener after its pending call finished and re-raises the exception of that call."""
+        if listenerID not in self._listeners:
+            return False
+        pending = [future for pendingID, future in self._pending if pendingID == listenerID]
+        self._pending = [entry for entry in self._pending if entry[0] != listenerID]
+        listener = self._listeners.pop(listenerID)[2]
+        self._order = sorted(self._listeners.values(), key=lambda entry: entry[:2])
+        try:
+            for future in pending:
+                future.result()
+        finally:
+            listener.cleanUp()
+            if self._executor is not None and not any(entry[3].readOnly for entry in self._order):
+                self._executor.shutdown()
+                self._executor = None
+        return True
+
+    def getStats(self):
+        return [entry[3] for entry in self._order]
+
+    def _getExecutor(self):
+        if self._executor is None:
+            # only imported if there are read-only listeners
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(self._maxWorkers)
+        return self._executor
+
+    def wait(self):
+        """wait() -> list(integer)
+
+        Waits for the read-only listeners of the last step, re-raises the first exception they raised.
+        Returns the ids of the listeners which do not want to stay active.
+        """
+        pending, self._pending = self._pending, []
+        finished = []
+        error = None
+        for listenerID, future in pending:
+            try:
+                if not future.result():
+                    finished.append(listenerID)
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        return finished
+
+    def run(self, step, subscriptionMapping):
+        """run(double, dict) -> list(integer)
+
+        Runs the listeners for the step and returns the ids of the ones which do not want to stay active.
+        """
+        finished = self.wait()
+        snapshot = None
+        for priority, listenerID, listener, stats in self._order:
+            if listenerID not in self._listeners:
+                # removed by a listener which ran before
+                continue
+            if stats.readOnly:
+                if snapshot is None:
+                    snapshot = StepSnapshot(step, subscriptionMapping)
+                self._pending.append((listenerID, self._getExecutor().submit(
+                    _runReadOnly, listener, step, snapshot, stats)))
+                continue
+            start = time.perf_counter()
+            keep = listener.step(step)
+            stats.add(time.perf_counter() - start)
+            if not keep:
+                finished.append(listenerID)
+        return finished
+
+    def writeSummary(self, out=None):
+        out = sys.stdout if out is None else out
+        print("%-4s %-32s %8s %9s %8s %10s %9s %9s" % (
+            "id", "listener", "priority", "read-only", "calls", "total ms", "mean us", "max us"), file=out)
+        for stats in self.getStats():
+            print("%-4s %-32s %8s %9s %8s %10.2f %9.1f %9.1f" % (
+                stats.listenerID, stats.name, stats.priority, stats.readOnly, stats.calls, stats.totalTime * 1e3,
+                stats.getMeanTime() * 1e6, stats.maxTime * 1e6), file=out)
+
+
+def _runReadOnly(listener, step, snapshot, stats):
+    start = time.perf_counter()
+    keep = listener.step(step, snapshot)
+    stats.add(time.perf_counter() - start)
+    return keep
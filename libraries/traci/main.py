@@ -22,7 +22,6 @@ from __future__ import print_function
 from __future__ import absolute_import
 import socket
 import time
-import subprocess
 import warnings
 import sys
 import os
@@ -32,31 +31,10 @@ if 'SUMO_HOME' in os.environ:
 else:
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import sumolib  # noqa
-
-from .domain import _defaultDomains  # noqa
+from .domain import _defaultDomains, _getDefaultDomain, _DOMAIN_MODULES  # noqa
 # StepListener needs to be imported for backwards compatibility
-from .connection import Connection  # noqa
+from .connection import Connection, StepListener, ReadOnlyStepListener  # noqa
 from .exceptions import FatalTraCIError, TraCIException  # noqa
-from . import _inductionloop, _lanearea, _multientryexit, _trafficlight  # noqa
-from . import _lane, _person, _route, _vehicle, _vehicletype  # noqa
-from . import _edge, _gui, _junction, _poi, _polygon, _simulation  # noqa
-
-inductionloop = _inductionloop.InductionLoopDomain()
-lanearea = _lanearea.LaneAreaDomain()
-multientryexit = _multientryexit.MultiEntryExitDomain()
-trafficlight = _trafficlight.TrafficLightDomain()
-lane = _lane.LaneDomain()
-person = _person.PersonDomain()
-route = _route.RouteDomain()
-vehicle = _vehicle.VehicleDomain()
-vehicletype = _vehicletype.VehicleTypeDomain()
-edge = _edge.EdgeDomain()
-gui = _gui.GuiDomain()
-junction = _junction.JunctionDomain()
-poi = _poi.PoiDomain()
-polygon = _polygon.PolygonDomain()
-simulation = _simulation.SimulationDomain()
 
 _connections = {}
 # cannot use immutable type as global variable
@@ -64,6 +42,26 @@ _currentLabel = [""]
 _connectHook = None
 
 
+def __getattr__(name):
+    # the domains (traci.vehicle, traci.simulation, ...) and their modules are loaded on first access
+    if name not in _DOMAIN_MODULES:
+        raise AttributeError("module '%s' has no attribute '%s'" % (__name__, name))
+    domain = _getDefaultDomain(name)
+    domain._setConnection(_connections.get(""))
+    globals()[name] = domain
+    return domain
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_DOMAIN_MODULES))
+
+
+if sys.version_info < (3, 7):
+    # no module level __getattr__
+    for _name in _DOMAIN_MODULES:
+        __getattr__(_name)
+
+
 def _STEPS2TIME(step):
     """Conversion from time steps in milliseconds to seconds as float"""
     return step / 1000.
@@ -74,16 +72,19 @@ def setConnectHook(hookFunc):
     _connectHook = hookFunc
 
 
-def connect(port=8813, numRetries=10, host="localhost", proc=None):
+def connect(port=8813, numRetries=10, host="localhost", proc=None, recordFile=None):
     """
     Establish a connection to a TraCI-Server and return the
     connection object. The connection is not saved in the pool and not
     accessible via traci.switch. It should be safe to use different
     connections established by this method in different threads.
+    With a recordFile the session is recorded from the start, see Connection.enableRecorder().
     """
     for wait in range(1, numRetries + 2):
         try:
             conn = Connection(host, port, proc)
+            if recordFile is not None:
+                conn.enableRecorder(recordFile)
             if _connectHook is not None:
                 _connectHook(conn)
             return conn
@@ -98,29 +99,32 @@ def connect(port=8813, numRetries=10, host="localhost", proc=None):
     raise FatalTraCIError("Could not connect in %s tries" % (numRetries + 1))
 
 
-def init(port=8813, numRetries=10, host="localhost", label="default", proc=None):
+def init(port=8813, numRetries=10, host="localhost", label="default", proc=None, recordFile=None):
     """
     Establish a connection to a TraCI-Server and store it under the given
     label. This method is not thread-safe. It accesses the connection
     pool concurrently.
     """
-    _connections[label] = connect(port, numRetries, host, proc)
+    _connections[label] = connect(port, numRetries, host, proc, recordFile)
     switch(label)
     return getVersion()
 
 
-def start(cmd, port=None, numRetries=10, label="default"):
+def start(cmd, port=None, numRetries=10, label="default", recordFile=None):
     """
     Start a sumo server using cmd, establish a connection to it and
     store it under the given label. This method is not thread-safe.
     """
     if label in _connections:
         raise TraCIException("Connection '%s' is already active." % label)
+    # sumolib and subprocess are only needed to start sumo
+    import subprocess
+    import sumolib
     while numRetries >= 0 and label not in _connections:
         sumoPort = sumolib.miscutils.getFreeSocketPort() if port is None else port
         sumoProcess = subprocess.Popen(cmd + ["--remote-port", str(sumoPort)])
         try:
-            return init(sumoPort, numRetries, "localhost", label, sumoProcess)
+            return init(sumoPort, numRetries, "localhost", label, sumoProcess, recordFile)
         except TraCIException:
             if port is not None:
                 break
@@ -135,7 +139,8 @@ def isLibsumo():
 
 def hasGUI():
     try:
-        gui.getIDList()
+        # the gui domain is loaded by the module __getattr__ on first use
+        sys.modules[__name__].gui.getIDList()
         return True
     except TraCIException:
         return False
@@ -164,16 +169,16 @@ def simulationStep(step=0):
     return _connections[""].simulationStep(step)
 
 
-def addStepListener(listener):
-    """addStepListener(traci.StepListener) -> int
+def addStepListener(listener, priority=0):
+    """addStepListener(traci.StepListener, integer) -> int
 
     Append the step listener (its step function is called at the end of every call to traci.simulationStep())
-    to the current connection.
+    to the current connection. Listeners with a lower priority are called first.
     Returns the ID assigned to the listener if it was added successfully, None otherwise.
     """
     if "" not in _connections:
         raise FatalTraCIError("Not connected.")
-    return _connections[""].addStepListener(listener)
+    return _connections[""].addStepListener(listener, priority)
 
 
 def removeStepListener(listenerID):
@@ -187,6 +192,82 @@ def removeStepListener(listenerID):
     return _connections[""].removeStepListener(listenerID)
 
 
+def getStepListenerStats():
+    """getStepListenerStats() -> list(ListenerStats)
+
+    Returns calls and execution times of the step listeners of the current connection.
+    """
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    return _connections[""].getStepListenerStats()
+
+
+def batch():
+    """batch() -> Batch
+
+    Returns a context manager which collects the commands of the current connection
+    and sends them in a single message when the with block is left. See Connection.batch().
+    """
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    return _connections[""].batch()
+
+
+def enableProfiler(traceFile=None, summaryFile=None):
+    """enableProfiler(string, string) -> CommandProfiler
+
+    Profiles the commands of the current connection, see Connection.enableProfiler().
+    The summary and the trace are written by traci.close().
+    """
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    return _connections[""].enableProfiler(traceFile, summaryFile)
+
+
+def disableProfiler():
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    return _connections[""].disableProfiler()
+
+
+def enableRecorder(fileName):
+    """enableRecorder(string) -> SessionRecorder
+
+    Records the round trips of the current connection to the session file, see Connection.enableRecorder().
+    The file is closed by traci.close().
+    """
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    return _connections[""].enableRecorder(fileName)
+
+
+def disableRecorder():
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    return _connections[""].disableRecorder()
+
+
+def enableGetterCache():
+    """enableGetterCache() -> GetterCache
+
+    Caches static and per step getters of the current connection, see Connection.enableGetterCache().
+    """
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    return _connections[""].enableGetterCache()
+
+
+def enableSubscriptionManager(pruneSize=1024):
+    """enableSubscriptionManager(integer) -> SubscriptionManager
+
+    Records the subscriptions of the current connection to restore them after load(),
+    see Connection.enableSubscriptionManager().
+    """
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    return _connections[""].enableSubscriptionManager(pruneSize)
+
+
 def getVersion():
     if "" not in _connections:
         raise FatalTraCIError("Not connected.")
@@ -206,6 +287,32 @@ def close(wait=True):
     del _connections[_currentLabel[0]]
 
 
+def attach(connection, label="default"):
+    """
+    Store an established connection (e.g. one acquired from a ConnectionPool)
+    under the given label and switch to it. This method is not thread-safe.
+    """
+    if label in _connections:
+        raise TraCIException("Connection '%s' is already active." % label)
+    _connections[label] = connection
+    switch(label)
+
+
+def detach():
+    """detach() -> Connection
+
+    Remove the current connection from the labels without closing it and return it.
+    This method is not thread-safe.
+    """
+    if "" not in _connections:
+        raise FatalTraCIError("Not connected.")
+    del _connections[_currentLabel[0]]
+    _currentLabel[0] = ""
+    for domain in _defaultDomains:
+        domain._setConnection(None)
+    return _connections.pop("")
+
+
 def switch(label):
     _connections[""] = getConnection(label)
     _currentLabel[0] = label
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    pool.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Thread-safe pool of TraCI connections.
+
+Unlike traci.start() and traci.switch(), the pool does not touch any module level state.
+Every connection handed out has its own domains (connection.vehicle, connection.simulation, ...),
+so each thread can drive its own simulation:
+
+    pool = ConnectionPool(["sumo"])
+    with pool.connection(["-c", "run.sumocfg"]) as conn:
+        conn.simulationStep()
+
+Released connections stay connected to their sumo process. The next acquire loads the new
+simulation into such a warm process with Connection.load() instead of starting a new one.
+"""
+
+from __future__ import absolute_import
+import contextlib
+import subprocess
+import threading
+import warnings
+
+import sumolib  # noqa
+
+from .exceptions import FatalTraCIError, TraCIException
+from .main import connect
+
+
+class ConnectionPool:
+
+    """Hands out connections to sumo processes started from the given command (e.g. ["sumo"]),
+    the simulation options are given separately per acquire.
+    At most maxSize connections are open at the same time, acquire blocks if all of them are in use.
+    """
+
+    def __init__(self, sumoCmd, maxSize=None, numRetries=10):
+        self._sumoCmd = list(sumoCmd)
+        self._maxSize = maxSize
+        self._numRetries = numRetries
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._idle = []
+        self._numOpen = 0
+        # ports handed to processes which did not accept the connection yet
+        self._reservedPorts = set()
+        self._closed = False
+        self.started = 0
+        self.reused = 0
+
+    def _reservePort(self):
+        with self._lock:
+            for _ in range(10):
+                port = sumolib.miscutils.getFreeSocketPort()
+                if port is not None and port not in self._reservedPorts:
+                    self._reservedPorts.add(port)
+                    return port
+        raise FatalTraCIError("Could not find a free port.")
+
+    def _start(self, args):
+        for _ in range(self._numRetries + 1):
+            port = self._reservePort()
+            process = subprocess.Popen(self._sumoCmd + args + ["--remote-port", str(port)])
+            try:
+                connection = connect(port, self._numRetries, "localhost", process)
+                connection.getVersion()
+                return connection
+            except TraCIException:
+                warnings.warn("Could not connect to TraCI server using port %s. Retrying with different port." % port)
+                if process.poll() is None:
+                    process.kill()
+            finally:
+                with self._lock:
+                    self._reservedPorts.discard(port)
+        raise FatalTraCIError("Could not connect.")
+
+    def _take(self):
+        # returns an idle connection or None if a new one may be started
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise FatalTraCIError("The connection pool is closed.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._maxSize is None or self._numOpen < self._maxSize:
+                    self._numOpen += 1
+                    return None
+                self._released.wait()
+
+    def _forget(self):
+        with self._lock:
+            self._numOpen -= 1
+            self._released.notify()
+
+    def acquire(self, args):
+        """acquire(list(string)) -> Connection
+
+        Returns a connection to a sumo process running the simulation given by the options.
+        """
+        connection = self._take()
+        if connection is not None:
+            try:
+                connection.load(args)
+                self.reused += 1
+                return connection
+            except (TraCIException, FatalTraCIError):
+                # the warm process could not load the simulation, replace it with a new one
+                self._closeQuietly(connection)
+        try:
+            connection = self._start(args)
+        except Exception:
+            self._forget()
+            raise
+        self.started += 1
+        return connection
+
+    def release(self, connection):
+        """Returns the connection to the pool, its step listeners, subscriptions, profiler and recorder are dropped."""
+        for listenerID in connection._stepListeners.getIDs():
+            connection.removeStepListener(listenerID)
+        connection.disableProfiler()
+        connection.disableRecorder()
+        if not hasattr(connection, "_transport") or connection._queue:
+            self.discard(connection)
+            return
+        # fresh client state for the next user, the server is reset by the load in acquire
+        connection._initState(connection._process)
+        with self._lock:
+            if not self._closed:
+                self._idle.append(connection)
+                self._released.notify()
+                return
+        self.discard(connection)
+
+    def discard(self, connection):
+        """Closes the connection instead of returning it, e.g. after an error."""
+        self._closeQuietly(connection)
+        self._forget()
+
+    def _closeQuietly(self, connection):
+        try:
+            connection.close()
+        except (TraCIException, FatalTraCIError, OSError):
+            if connection._process is not None:
+                connection._process.kill()
+                connection._process.wait()
+
+    @contextlib.contextmanager
+    def connection(self, args):
+        """Context manager around acquire and release, a connection which raised an error is discarded."""
+        connection = self.acquire(args)
+        try:
+            yield connection
+        except BaseException:
+            self.discard(connection)
+            raise
+        self.release(connection)
+
+    def close(self):
+        """Closes the idle connections, connections in use are closed when they are released."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._released.notify_all()
+        for connection in idle:
+            self.discard(connection)
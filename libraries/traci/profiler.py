@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    profiler.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Per command profiling of a TraCI connection.
+
+The profiler is fed by Connection._sendExact with every round trip and keeps per command
+(command id and variable id, the command id also names the domain) the number of calls, the bytes sent
+and received and a histogram of the latencies. Commands sharing a message (batches) share its latency
+and the received bytes equally. When the connection is closed the summary table is printed and the
+round trips are written as Chrome trace (load it in chrome://tracing or https://ui.perfetto.dev):
+
+    conn.enableProfiler("trace.json")
+    ...
+    conn.close()
+"""
+
+from __future__ import print_function
+from __future__ import absolute_import
+import json
+import math
+import os
+import struct
+import sys
+import threading
+import time
+
+from . import constants as tc
+
+_LENGTH = struct.Struct("!i")
+# histogram buckets per factor two of the latency in microseconds
+_BUCKETS_PER_OCTAVE = 4
+_PERCENTILES = (50, 90, 99)
+
+
+def _commandNames():
+    names = {}
+    for name in sorted(dir(tc)):
+        if name.startswith("CMD_"):
+            value = getattr(tc, name)
+            # several commands share an id, prefer the names of the domain commands
+            if value not in names or name.endswith(("_VARIABLE", "_CONTEXT")):
+                names[value] = name
+    return names
+
+
+_COMMAND_NAMES = _commandNames()
+# commands addressing a single variable, the variable id follows the command id
+_VARIABLE_COMMANDS = frozenset(value for value, name in _COMMAND_NAMES.items()
+                               if name.startswith(("CMD_GET_", "CMD_SET_")) and name.endswith("_VARIABLE"))
+
+
+def _domainName(name):
+    for prefix in ("CMD_GET_", "CMD_SET_", "CMD_SUBSCRIBE_"):
+        if name.startswith(prefix):
+            return name[len(prefix):].rsplit("_", 1)[0].lower()
+    return ""
+
+
+def splitCommands(message):
+    """splitCommands(bytes) -> list((integer, integer, integer))
+
+    Returns command id, variable id (None for commands without a variable) and length
+    of all commands in the given message (including the message length).
+    """
+    commands = []
+    pos = 4
+    while pos < len(message):
+        length = message[pos]
+        header = 1
+        if length == 0:
+            length = _LENGTH.unpack_from(message, pos + 1)[0]
+            header = 5
+        cmdID = message[pos + header]
+        varID = message[pos + header + 1] if cmdID in _VARIABLE_COMMANDS else None
+        commands.append((cmdID, varID, length))
+        pos += length
+    return commands
+
+
+class CommandStats:
+
+    """Count, bytes and latency histogram of one command."""
+
+    def __init__(self, cmdID, varID):
+        self.cmdID = cmdID
+        self.varID = varID
+        self.calls = 0
+        self.bytesSent = 0
+        self.bytesReceived = 0
+        self.totalTime = 0.
+        self.maxTime = 0.
+        self._histogram = {}
+
+    def add(self, bytesSent, bytesReceived, seconds):
+        self.calls += 1
+        self.bytesSent += bytesSent
+        self.bytesReceived += bytesReceived
+        self.totalTime += seconds
+        self.maxTime = max(self.maxTime, seconds)
+        bucket = int(math.floor(_BUCKETS_PER_OCTAVE * math.log(max(seconds * 1e6, 1.), 2)))
+        self._histogram[bucket] = self._histogram.get(bucket, 0) + 1
+
+    def getName(self):
+        name = _COMMAND_NAMES.get(self.cmdID, "0x%02x" % self.cmdID)
+        return name if self.varID is None else "%s 0x%02x" % (name, self.varID)
+
+    def getDomain(self):
+        return _domainName(_COMMAND_NAMES.get(self.cmdID, ""))
+
+    def getHistogram(self):
+        """getHistogram() -> list((double, integer))
+
+        Returns the upper bound of every non-empty latency bucket in seconds with the number of calls.
+        """
+        return [(2 ** (float(bucket + 1) / _BUCKETS_PER_OCTAVE) / 1e6, count)
+                for bucket, count in sorted(self._histogram.items())]
+
+    def getPercentile(self, percent):
+        """getPercentile(double) -> double
+
+        Returns the latency in seconds which percent of the calls did not exceed (the upper bound of its bucket).
+        """
+        needed = self.calls * percent / 100.
+        seen = 0
+        for bound, count in self.getHistogram():
+            seen += count
+            if seen >= needed:
+                return min(bound, self.maxTime)
+        return self.maxTime
+
+
+class CommandProfiler:
+
+    """Collects the statistics of the commands and the timeline of the round trips of a connection.
+    The summary goes to summaryFile (stdout if None) and the Chrome trace to traceFile (if given) on close.
+    At most maxEvents round trips are kept for the trace, the statistics cover all of them.
+    """
+
+    def __init__(self, traceFile=None, summaryFile=None, maxEvents=1000000):
+        self.traceFile = traceFile
+        self.summaryFile = summaryFile
+        self._maxEvents = maxEvents
+        self._stats = {}
+        self._events = []
+        self._origin = time.perf_counter()
+        self.roundTrips = 0
+        self.droppedEvents = 0
+
+    def record(self, message, bytesReceived, start, end):
+        """Adds a round trip which sent message (including its length) at start and received the answer at end
+        (both time.perf_counter()).
+        """
+        self.roundTrips += 1
+        commands = splitCommands(message)
+        if not commands:
+            return
+        seconds = end - start
+        for cmdID, varID, length in commands:
+            key = (cmdID, varID)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = CommandStats(cmdID, varID)
+            stats.add(length, bytesReceived / len(commands), seconds / len(commands))
+        if len(self._events) >= self._maxEvents:
+            self.droppedEvents += 1
+            return
+        if len(commands) == 1:
+            name = self._stats[commands[0][:2]].getName()
+        else:
+            name = "batch of %s commands" % len(commands)
+        self._events.append({"name": name, "cat": "traci", "ph": "X", "pid": os.getpid(),
+                             "tid": threading.current_thread().ident,
+                             "ts": (start - self._origin) * 1e6, "dur": seconds * 1e6,
+                             "args": {"commands": [self._stats[command[:2]].getName() for command in commands],
+                                      "sent": len(message), "received": bytesReceived}})
+
+    def getStats(self):
+        """getStats() -> list(CommandStats)
+
+        Returns the statistics of all commands, the ones with the largest total latency first.
+        """
+        return sorted(self._stats.values(), key=lambda stats: -stats.totalTime)
+
+    def writeSummary(self, out=None):
+        out = sys.stdout if out is None else out
+        print("%-42s %-14s %8s %10s %10s %10s %9s %9s %9s %9s %9s" % (
+            "command", "domain", "calls", "sent", "received", "total ms", "mean us", "p50 us", "p90 us",
+            "p99 us", "max us"), file=out)
+        for stats in self.getStats():
+            print("%-42s %-14s %8s %10s %10.0f %10.2f %9.1f %9.1f %9.1f %9.1f %9.1f" % (
+                stats.getName(), stats.getDomain(), stats.calls, stats.bytesSent, stats.bytesReceived,
+                stats.totalTime * 1e3, stats.totalTime / stats.calls * 1e6,
+                stats.getPercentile(_PERCENTILES[0]) * 1e6, stats.getPercentile(_PERCENTILES[1]) * 1e6,
+                stats.getPercentile(_PERCENTILES[2]) * 1e6, stats.maxTime * 1e6), file=out)
+        print("%s round trips" % self.roundTrips, file=out)
+
+    def writeTrace(self, traceFile):
+        with open(traceFile, "w") as out:
+            json.dump({"traceEvents": self._events, "displayTimeUnit": "ms",
+                       "otherData": {"droppedEvents": self.droppedEvents}}, out)
+
+    def close(self):
+        """Writes the summary and the trace."""
+        if self.summaryFile is None:
+            self.writeSummary()
+        else:
+            with open(self.summaryFile, "w") as out:
+                self.writeSummary(out)
+        if self.traceFile is not None:
+            self.writeTrace(self.traceFile)
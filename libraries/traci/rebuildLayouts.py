@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2009-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    rebuildLayouts.py
+# @date    2019-11-12
+# @version $Id$
+
+"""
+This script derives the value layouts of all domain variables from the _RETURN_VALUE_FUNC
+tables of the domain modules and writes them to "layouts.py". The layouts are used to compile
+the decoders of subscription records and getter responses (see records.py). Call it without options whenever
+a return value function is added or changed.
+"""
+
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import sys
+import datetime
+import argparse
+import inspect
+import re
+
+dirname = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(dirname))
+
+from traci import constants as tc  # noqa
+from traci.domain import _getDefaultDomain, _DOMAIN_MODULES  # noqa
+from traci.storage import Storage  # noqa
+
+argParser = argparse.ArgumentParser()
+argParser.add_argument("-o", "--output", default=os.path.join(dirname, "layouts.py"),
+                       help="File to save layouts into", metavar="FILE")
+options = argParser.parse_args()
+
+# readers with a known layout, all other functions are left to the generic decoding
+_KNOWN_READERS = {Storage.readDouble: "d",
+                  Storage.readInt: "i",
+                  Storage.readString: "s",
+                  Storage.readStringList: "l"}
+# prefixes of the constant names preferred in the comments, several constants share a value
+_NAME_PREFIXES = ("VAR_", "LAST_STEP_", "TL_", "JAM_", "TRACI_", "ID_", "POSITION_", "LANE_", "FIND_")
+
+
+def getLayout(func):
+    if func in _KNOWN_READERS:
+        return _KNOWN_READERS[func]
+    code = getattr(func, "__code__", None)
+    if code is None or code.co_names != ("read",):
+        return None
+    # lambda result: result.read("!dd") returns the tuple unpacked with the format
+    formats = [c for c in code.co_consts if c is not None]
+    if len(formats) == 1 and isinstance(formats[0], str) and formats[0].startswith("!"):
+        return formats[0][1:]
+    return None
+
+
+def getName(value, names, usedNames):
+    candidates = names.get(value, [])
+    # the name used in the domain module, otherwise the first one with a preferred prefix
+    for name in candidates:
+        if name in usedNames:
+            return name
+    for prefix in _NAME_PREFIXES:
+        for name in candidates:
+            if name.startswith(prefix):
+                return name
+    return candidates[0] if candidates else ""
+
+
+names = {}
+for name in sorted(dir(tc)):
+    if name.isupper():
+        names.setdefault(getattr(tc, name), []).append(name)
+commandNames = dict((getattr(tc, name), name) for name in sorted(dir(tc)) if name.startswith("CMD_GET_"))
+
+layouts = {}
+usedNames = {}
+for domain in [_getDefaultDomain(name) for name in sorted(_DOMAIN_MODULES)]:
+    with open(inspect.getsourcefile(type(domain))) as source:
+        usedNames[domain._cmdGetID] = set(re.findall(r"tc\.([A-Z0-9_]+)", source.read()))
+    for varID, func in domain._retValFunc.items():
+        layout = getLayout(func)
+        if layout is not None:
+            layouts.setdefault(domain._cmdGetID, {})[varID] = layout
+
+with open(options.output, "w") as fdo:
+    print("""# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2009-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    %s
+# @author  generated by "%s"
+# @date    %s
+# @version $Id$
+
+\"\"\"
+This script contains the value layouts of the variables of every domain, derived from their _RETURN_VALUE_FUNC.
+A layout is a struct format (without byte order) for values of fixed size,
+"s" for strings and "l" for string lists. Variables without a layout are decoded by their function.
+\"\"\"
+
+from . import constants as tc
+
+LAYOUTS = {""" % (os.path.basename(options.output), os.path.basename(__file__), datetime.datetime.now()), file=fdo)
+    for cmdGetID in sorted(layouts):
+        print("    tc.%s: {" % commandNames[cmdGetID], file=fdo)
+        for varID in sorted(layouts[cmdGetID]):
+            name = getName(varID, names, usedNames[cmdGetID])
+            print("        0x%02x: %r,  # %s" % (varID, layouts[cmdGetID][varID], name), file=fdo)
+        print("    },", file=fdo)
+    print("}", file=fdo)
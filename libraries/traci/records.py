@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    records.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Compiled decoders for subscription records and getter responses.
+
+A record are the values of all subscribed variables of one object, each preceded by
+the variable id, the status and the type. For a given tuple of variables the decoders are
+generated from the layouts in layouts.py, so the fixed size parts between two strings are read
+with a single struct.unpack_from (a record of numbers only with exactly one).
+The decoders of whole responses include the framing (length, response id and object id),
+the run decoder reads all following responses with the same variables in one call,
+which saves the per response calls of the generic decoding.
+"""
+
+from __future__ import absolute_import
+import struct
+
+from .layouts import LAYOUTS
+from .storage import _decodeString
+
+# compiled decoders per (kind, command, variables), None if a variable has no layout
+_DECODERS = {}
+# compiled getter decoders per (get command, variable), they are looked up for every get command
+_GETTER_DECODERS = {}
+
+
+def _readStringList(content, pos):
+    n = struct.unpack_from("!i", content, pos)[0]
+    pos += 4
+    result = []
+    for _ in range(n):
+        end = pos + 4 + struct.unpack_from("!i", content, pos)[0]
+        result.append(_decodeString(content[pos + 4:end].tobytes()))
+        pos = end
+    return tuple(result), pos
+
+
+class _Source:
+
+    """Collects the lines of a generated decoder, consecutive fixed size fields are unpacked at once."""
+
+    def __init__(self, indent, fail):
+        self.lines = []
+        self.structs = []
+        self._indent = indent
+        self._fail = fail
+        self._fmt = "!"
+        self._fields = 0
+        self._checks = []
+
+    def _name(self):
+        return "v%s" % len(self.structs)
+
+    def line(self, line):
+        self.lines.append(self._indent + line)
+
+    def fixed(self, fmt, expected=None):
+        """Adds fields to the pending struct and returns their expressions, expected values are checked."""
+        size = len(struct.Struct("!" + fmt).unpack(bytes(struct.calcsize("!" + fmt))))
+        fields = ["%s[%s]" % (self._name(), self._fields + i) for i in range(size)]
+        for field, value in zip(fields, expected or ()):
+            if value is not None:
+                self._checks.append("%s != %s" % (field, value))
+        self._fmt += fmt
+        self._fields += size
+        return fields
+
+    def check(self, condition):
+        """Adds a condition on pending fields under which the decoder fails."""
+        self._checks.append(condition)
+
+    def flush(self):
+        if self._fields == 0:
+            return
+        name = self._name()
+        self.structs.append(struct.Struct(self._fmt))
+        self.line("%s = _S%s.unpack_from(content, pos)" % (name, len(self.structs) - 1))
+        if self._checks:
+            self.line("if %s:" % " or ".join(self._checks))
+            self.line("    " + self._fail)
+        self.line("pos += %s" % self.structs[-1].size)
+        self._fmt, self._fields, self._checks = "!", 0, []
+
+    def string(self, name):
+        length = self.fixed("i")[0]
+        self.flush()
+        self.line("end = pos + %s" % length)
+        self.line("%s = _decodeString(content[pos:end].tobytes())" % name)
+        self.line("pos = end")
+        return name
+
+    def value(self, layout, name):
+        """Adds the reading of a value with the given layout and returns its expression."""
+        if layout == "s":
+            return self.string(name)
+        if layout == "l":
+            self.flush()
+            self.line("%s, pos = _readStringList(content, pos)" % name)
+            return name
+        fields = self.fixed(layout)
+        if len(fields) == 1:
+            return fields[0]
+        return "(%s)" % "".join(field + ", " for field in fields)
+
+    def record(self, layouts, varIDs):
+        """Adds the variables with id, status and type, returns the value expressions or None for an unknown layout."""
+        values = []
+        for varID in varIDs:
+            layout = layouts.get(varID)
+            if layout is None:
+                return None
+            self.fixed("BBB", (varID, 0))
+            values.append(self.value(layout, "r%s" % len(values)))
+        return values
+
+    def compile(self, header, footer, name):
+        self.flush()
+        namespace = {"_readStringList": _readStringList, "_decodeString": _decodeString, "_error": struct.error}
+        for index, compiled in enumerate(self.structs):
+            namespace["_S%s" % index] = compiled
+        source = "\n".join([header] + self.lines + footer)
+        exec(compile(source, "<%s>" % name, "exec"), namespace)
+        return namespace["decode"]
+
+
+def _generateRecord(cmdGetID, varIDs):
+    source = _Source("    ", "return None")
+    values = source.record(LAYOUTS.get(cmdGetID, {}), varIDs)
+    if values is None:
+        return None
+    return source.compile("def decode(content, pos):", ["    return (%s), pos" % "".join(
+        value + ", " for value in values)], "record decoder %02x %s" % (cmdGetID, varIDs))
+
+
+def _generateRun(responseID, cmdGetID, varIDs):
+    source = _Source("            ", "break")
+    length = source.fixed("BB", (None, responseID))[0]
+    source.check("%s == 0" % length)
+    objectID = source.string("objectID")
+    source.fixed("B", (len(varIDs),))
+    values = source.record(LAYOUTS.get(cmdGetID, {}), varIDs)
+    if values is None:
+        return None
+    header = """def decode(content, pos, maxObjects):
+    records = []
+    while len(records) < maxObjects:
+        start = pos
+        try:"""
+    footer = ["            if pos - start != %s:" % length,
+              "                break",
+              "        except _error:",
+              "            break",
+              "        records.append((%s, (%s)))" % (objectID, "".join(value + ", " for value in values)),
+              "    else:",
+              "        return records, pos",
+              "    return records, start"]
+    return source.compile(header, footer, "run decoder %02x %s" % (responseID, varIDs))
+
+
+def _generateGetter(cmdGetID, varID):
+    layout = LAYOUTS.get(cmdGetID, {}).get(varID)
+    if layout is None:
+        return None
+    source = _Source("    ", "return None")
+    length = source.fixed("BBB", (None, cmdGetID + 16, varID))[0]
+    source.check("%s == 0" % length)
+    objectID = source.string("objectID")
+    source.fixed("B")
+    value = source.value(layout, "value")
+    return source.compile("def decode(content, pos):", ["    return (%s, %s), pos" % (objectID, value)],
+                          "getter decoder %02x %02x" % (cmdGetID, varID))
+
+
+def compileRecordDecoder(cmdGetID, varIDs):
+    """compileRecordDecoder(integer, tuple(integer)) -> function
+
+    Returns a function decode(content, pos) which reads a record with the given variables of
+    the domain at pos and returns the values and the position after the record, or None if the record
+    has other variables or an error status. Returns None if a variable has no known layout.
+    """
+    key = ("record", cmdGetID, varIDs)
+    if key not in _DECODERS:
+        _DECODERS[key] = _generateRecord(cmdGetID, varIDs)
+    return _DECODERS[key]
+
+
+def compileRunDecoder(responseID, cmdGetID, varIDs):
+    """compileRunDecoder(integer, integer, tuple(integer)) -> function
+
+    Returns a function decode(content, pos, maxObjects) which reads up to maxObjects consecutive
+    variable subscription responses with the given variables and returns a list of (objectID, values)
+    and the position after the last one read. It stops before the first response which has another
+    response id, other variables, an error status or the long length form. Returns None if a variable
+    has no known layout.
+    """
+    key = ("run", responseID, varIDs)
+    if key not in _DECODERS:
+        _DECODERS[key] = _generateRun(responseID, cmdGetID, varIDs)
+    return _DECODERS[key]
+
+
+def compileGetterDecoder(cmdGetID, varID):
+    """compileGetterDecoder(integer, integer) -> function
+
+    Returns a function decode(content, pos) which reads the response of a get command for the variable
+    (after the status) and returns (objectID, value) and the position after it, or None if the response
+    is for another variable or has the long length form. Returns None if the variable has no known layout.
+    """
+    key = (cmdGetID, varID)
+    if key not in _GETTER_DECODERS:
+        _GETTER_DECODERS[key] = _generateGetter(cmdGetID, varID)
+    return _GETTER_DECODERS[key]
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    replay.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Recording of TraCI sessions and a server replaying them without SUMO.
+
+The SessionRecorder is fed by Connection._sendExact with every round trip and writes the request
+and the response messages as they went over the wire, so a session file is a header followed by
+alternating requests and responses, each starting with its length. Files ending with .gz are compressed.
+Recording from the start of the connection includes the version handshake:
+
+    traci.start(cmd, recordFile="session.trs.gz")
+
+The ReplayServer is a local stand-in for SUMO which answers the requests of a client with the recorded
+responses. A client issuing the same commands as the recorded one (e.g. the same seeded run) sees the same
+session as with SUMO, so client side decoding, subscription handling and control logic can be measured
+without SUMO and without SUMO's own cost:
+
+    server = ReplayServer(readSession("session.trs.gz"))
+    traci.init(server.start())
+
+The server can also be started like SUMO, e.g. by traci.start:
+
+    python -m libraries.traci.replay session.trs.gz --remote-port 8813
+"""
+
+from __future__ import print_function
+from __future__ import absolute_import
+import struct
+import sys
+import threading
+import time
+
+from . import constants as tc
+from . import transport
+from .exceptions import FatalTraCIError
+
+_MAGIC = b"TraCIrec\x01"
+_LENGTH = struct.Struct("!i")
+
+
+def _open(fileName, mode):
+    if fileName.endswith(".gz"):
+        import gzip
+        return gzip.open(fileName, mode)
+    return open(fileName, mode)
+
+
+class SessionRecorder:
+
+    """Writes the request and the response of every round trip of a connection to a session file."""
+
+    def __init__(self, fileName):
+        self.fileName = fileName
+        self.roundTrips = 0
+        self.bytes = 0
+        self._file = _open(fileName, "wb")
+        self._file.write(_MAGIC)
+
+    def record(self, request, response):
+        """Records a complete request and the content of its response (without the length)."""
+        self._file.write(request)
+        self._file.write(_LENGTH.pack(4 + len(response)))
+        self._file.write(response)
+        self.roundTrips += 1
+        self.bytes += len(request) + 4 + len(response)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _commands(content):
+    """Returns the (command id, command) pairs of the content of a message."""
+    commands = []
+    pos = 0
+    while pos < len(content):
+        length, idOffset = content[pos], 1
+        if length == 0 and pos + 5 < len(content):
+            # the long form of the length for large commands
+            length, idOffset = _LENGTH.unpack_from(content, pos + 1)[0], 5
+        if length <= idOffset or pos + length > len(content):
+            break
+        commands.append((content[pos + idOffset], bytes(content[pos:pos + length])))
+        pos += length
+    return commands
+
+
+def _describeMismatch(expected, content):
+    """Returns the id of the first command of the request which differs from the recorded one and a description."""
+    recorded = _commands(expected[4:])
+    received = _commands(content)
+    for position, (recordedCommand, receivedCommand) in enumerate(zip(recorded, received)):
+        if recordedCommand[0] != receivedCommand[0]:
+            return receivedCommand[0], "command %s is 0x%02x instead of the recorded 0x%02x" % (
+                position, receivedCommand[0], recordedCommand[0])
+        if recordedCommand[1] != receivedCommand[1]:
+            return receivedCommand[0], "command %s (0x%02x) has other parameters than the recorded one" % (
+                position, receivedCommand[0])
+    if len(received) > len(recorded):
+        return received[len(recorded)][0], "command %s (0x%02x) was not recorded" % (
+            len(recorded), received[len(recorded)][0])
+    cmdID = received[-1][0] if received else 0
+    return cmdID, "%s commands instead of the recorded %s" % (len(received), len(recorded))
+
+
+def _statusResponse(cmdID, result, description=""):
+    """Returns a message with the status of the command, e.g. an error the way SUMO answers a failed command."""
+    description = description.encode("latin1")[:200]
+    status = struct.pack("!BBBi", 1 + 1 + 1 + 4 + len(description), cmdID, result,
+                         len(description)) + description
+    return _LENGTH.pack(4 + len(status)) + status
+
+
+def _readMessage(f):
+    header = f.read(4)
+    if not header:
+        return None
+    length = _LENGTH.unpack(header)[0]
+    content = f.read(length - 4)
+    if len(header) < 4 or len(content) < length - 4:
+        raise FatalTraCIError("Truncated message in session file")
+    return header + content
+
+
+def readSession(fileName):
+    """readSession(string) -> list((bytes, bytes))
+
+    Returns the recorded round trips as pairs of the complete request and response messages.
+    """
+    with _open(fileName, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise FatalTraCIError("%s is not a TraCI session file" % fileName)
+        session = []
+        while True:
+            request = _readMessage(f)
+            if request is None:
+                return session
+            response = _readMessage(f)
+            if response is None:
+                raise FatalTraCIError("Missing response of request %s in session file" % len(session))
+            session.append((request, response))
+
+
+class ReplayServer:
+
+    """Answers the requests of one client with the recorded responses.
+    session is a list of (request, response) pairs of complete messages, a request None matches
+    every request. With check the requests have to match the recorded ones, the first one which does not
+    (or which comes after the end of the session) is answered with an error status describing the difference,
+    its index is kept as mismatch and the description as mismatchDescription. All following requests get
+    the same error except for a close command, so the client can close the connection. With cycle the session
+    starts again after the last response. With a chunk size the responses are written in several pieces
+    like a busy server would, with a latency every response is delayed by that many seconds like by
+    the computation of a step. The host may name another transport than TCP, see transport.py.
+    """
+
+    def __init__(self, session, host="localhost", port=0, check=True, cycle=False, chunkSize=None, latency=0.):
+        self.session = session
+        self.check = check
+        self.cycle = cycle
+        self.chunkSize = chunkSize
+        self.latency = latency
+        self.requests = 0
+        self.mismatch = None
+        self.mismatchDescription = None
+        self.host = host
+        self._socket = transport.createListener(host, port)
+        address = self._socket.getsockname()
+        self.port = address[1] if isinstance(address, tuple) else 0
+        self._thread = None
+        self._process = None
+        self._results = None
+
+    def start(self):
+        """Serves from a thread, returns the port."""
+        self._thread = threading.Thread(target=self.serve)
+        self._thread.daemon = True
+        self._thread.start()
+        return self.port
+
+    def startProcess(self):
+        """Serves from a forked process, so that client and server do not share one interpreter, returns the port.
+        The process sends its requests and mismatch back when it ends, they are only updated by join.
+        It exits with status 1 after a mismatch.
+        """
+        import multiprocessing
+        self._results, sender = multiprocessing.Pipe(False)
+        self._process = multiprocessing.Process(target=self._serveProcess, args=(sender,))
+        self._process.daemon = True
+        self._process.start()
+        sender.close()
+        return self.port
+
+    def _serveProcess(self, sender):
+        try:
+            self.serve()
+        finally:
+            sender.send((self.requests, self.mismatch, self.mismatchDescription))
+            sender.close()
+        if self.mismatch is not None:
+            sys.exit(1)
+
+    def join(self, timeout=None):
+        """Waits for the end of the server, for a server process requests and mismatch are updated."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._process is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                return
+            try:
+                self.requests, self.mismatch, self.mismatchDescription = self._results.recv()
+            except EOFError:
+                # the process ended without sending them, e.g. it was killed
+                pass
+            self._results.close()
+            self._socket.close()
+            self._process = None
+
+    def _recv(self, conn, size):
+        data = bytearray(size)
+        view = memoryview(data)
+        pos = 0
+        while pos < size:
+            received = conn.recv_into(view[pos:], size - pos)
+            if not received:
+                return None
+            pos += received
+        return data
+
+    def serve(self):
+        """Serves one client until it closes the connection."""
+        conn = transport.accept(self._socket)
+        try:
+            while True:
+                header = self._recv(conn, 4)
+                if header is None:
+                    break
+                content = self._recv(conn, _LENGTH.unpack(header)[0] - 4)
+                if content is None:
+                    break
+                if self.mismatch is not None:
+                    commands = _commands(content)
+                    if [cmdID for cmdID, _ in commands] == [tc.CMD_CLOSE]:
+                        conn.sendall(_statusResponse(tc.CMD_CLOSE, tc.RTYPE_OK))
+                    else:
+                        conn.sendall(_statusResponse(commands[0][0] if commands else 0, tc.RTYPE_ERR,
+                                                     self.mismatchDescription))
+                    continue
+                if not self.cycle and self.requests >= len(self.session):
+                    commands = _commands(content)
+                    self._reject(conn, commands[0][0] if commands else 0, "the recorded session ended")
+                    continue
+                expected, response = self.session[self.requests % len(self.session)]
+                if self.check and expected is not None and (expected[:4] != header or expected[4:] != content):
+                    self._reject(conn, *_describeMismatch(expected, content))
+                    continue
+                if self.latency:
+                    time.sleep(self.latency)
+                if self.chunkSize is None:
+                    conn.sendall(response)
+                else:
+                    for pos in range(0, len(response), self.chunkSize):
+                        conn.sendall(response[pos:pos + self.chunkSize])
+                self.requests += 1
+        finally:
+            conn.close()
+            self._socket.close()
+
+    def _reject(self, conn, cmdID, description):
+        # the client raises a TraCIException with the description
+        self.mismatch = self.requests
+        self.mismatchDescription = "Request %s differs from the recorded session: %s" % (self.requests, description)
+        conn.sendall(_statusResponse(cmdID, tc.RTYPE_ERR, self.mismatchDescription))
+
+
+if __name__ == "__main__":
+    # serves a session file like a sumo process, the other sumo options are ignored
+    args = sys.argv[1:]
+    server = ReplayServer(readSession(args[0]),
+                          args[args.index("--remote-host") + 1] if "--remote-host" in args else "localhost",
+                          int(args[args.index("--remote-port") + 1]) if "--remote-port" in args else 8813)
+    server.serve()
+    if server.mismatch is not None:
+        print(server.mismatchDescription, file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    session.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Warm reuse of one sumo process for many experiments.
+
+A SimulationSession keeps a single sumo process running. Checkpoints are saved with
+simulation.saveState() and restored by loading the simulation again with --load-state,
+so a warm-up only has to be simulated once:
+
+    session = SimulationSession(["sumo"], ["-c", "run.sumocfg"])
+    session.warmUp(300.)
+    results = session.fork("warm", [experimentA, experimentB])
+
+Each experiment is called with a connection whose simulation starts at the checkpoint.
+"""
+
+from __future__ import absolute_import
+import os
+import shutil
+import tempfile
+
+from .exceptions import TraCIException
+from .pool import ConnectionPool
+
+
+class SimulationSession:
+
+    """Runs the simulation given by args (sumo options) in one process started with sumoCmd.
+    State files are written to stateDir, by default to a temporary directory removed on close.
+    """
+
+    def __init__(self, sumoCmd, args, stateDir=None, numRetries=10):
+        self._pool = ConnectionPool(sumoCmd, 1, numRetries)
+        self._args = list(args)
+        self._ownsStateDir = stateDir is None
+        self._stateDir = tempfile.mkdtemp(prefix="traci_session_") if stateDir is None else stateDir
+        # checkpoint name -> (state file, simulation time)
+        self._checkpoints = {}
+        self._connection = None
+
+    def _load(self, args):
+        if self._connection is not None:
+            self._pool.release(self._connection)
+        # the pool has at most one process, so this loads into the running one after the first call
+        self._connection = None
+        self._connection = self._pool.acquire(args)
+        return self._connection
+
+    def getConnection(self):
+        """getConnection() -> Connection
+
+        Returns the connection to the current simulation, starting it if necessary.
+        """
+        if self._connection is None:
+            return self.reset()
+        return self._connection
+
+    def reset(self, args=None):
+        """reset(list(string)) -> Connection
+
+        Loads the simulation from its beginning, optionally with other options than the ones of the session.
+        """
+        return self._load(self._args if args is None else list(args))
+
+    def checkpoint(self, name):
+        """checkpoint(string) -> string
+
+        Saves the state of the current simulation under the given name and returns the state file.
+        """
+        connection = self.getConnection()
+        stateFile = os.path.join(self._stateDir, name + ".xml")
+        connection.simulation.saveState(stateFile)
+        self._checkpoints[name] = (stateFile, connection.simulation.getTime())
+        return stateFile
+
+    def warmUp(self, seconds, name="warm", args=None):
+        """warmUp(double, string, list(string)) -> string
+
+        Simulates the first seconds of the simulation and saves them as checkpoint.
+        """
+        connection = self.reset(args)
+        connection.simulationStep(seconds)
+        return self.checkpoint(name)
+
+    def getCheckpoints(self):
+        return list(self._checkpoints)
+
+    def restore(self, name, args=None):
+        """restore(string, list(string)) -> Connection
+
+        Loads the simulation again and continues at the given checkpoint. By default the options of the session
+        are used, other args may e.g. change the seed or add files for a variant of the experiment.
+        """
+        if name not in self._checkpoints:
+            raise TraCIException("Checkpoint '%s' is not known." % name)
+        stateFile, time = self._checkpoints[name]
+        args = self._args if args is None else list(args)
+        return self._load(args + ["--load-state", stateFile, "--begin", repr(time)])
+
+    def fork(self, name, experiments, args=None):
+        """fork(string, list(function), list(string)) -> list
+
+        Calls every experiment with a connection restored to the given checkpoint and returns their results.
+        """
+        return [experiment(self.restore(name, args)) for experiment in experiments]
+
+    def close(self):
+        if self._connection is not None:
+            self._pool.release(self._connection)
+            self._connection = None
+        self._pool.close()
+        if self._ownsStateDir:
+            shutil.rmtree(self._stateDir, ignore_errors=True)
@@ -24,20 +24,81 @@ from . import constants as tc
 
 _DEBUG = False
 
+# precompiled struct objects, one per format string used while decoding,
+# formats with a length in them (e.g. skipped bytes) are not cached once the table is full
+_MAX_CACHED_STRUCTS = 256
+_STRUCTS = {}
+
+
+def _getStruct(format):
+    s = _STRUCTS.get(format)
+    if s is None:
+        s = struct.Struct(format)
+        if len(_STRUCTS) < _MAX_CACHED_STRUCTS:
+            _STRUCTS[format] = s
+    return s
+
+
+_INT = _getStruct("!i")
+_UBYTE = _getStruct("!B")
+_DOUBLE = _getStruct("!d")
+_POINT = _getStruct("!dd")
+
+# decoded strings by their encoding, object ids repeat in every step and are decoded only once
+# and shared by all results, the table is cleared when it is full
+_MAX_INTERNED_STRINGS = 1 << 18
+_MAX_INTERNED_LENGTH = 64
+_STRINGS = {}
+
+
+def _decodeString(data):
+    s = _STRINGS.get(data)
+    if s is None:
+        s = data.decode("latin1")
+        if len(data) <= _MAX_INTERNED_LENGTH:
+            if len(_STRINGS) >= _MAX_INTERNED_STRINGS:
+                _STRINGS.clear()
+            _STRINGS[data] = s
+    return s
+
+
+def internString(s):
+    """internString(string) -> string
+
+    Returns the string object which is returned whenever s is decoded, e.g. for ids created by the client.
+    """
+    data = s.encode("latin1")
+    interned = _STRINGS.get(data)
+    if interned is None:
+        if len(_STRINGS) >= _MAX_INTERNED_STRINGS:
+            _STRINGS.clear()
+        interned = _STRINGS[data] = s
+    return interned
+
+
+def getInternedCount():
+    return len(_STRINGS)
+
 
 class Storage:
 
     def __init__(self, content):
-        self._content = content
+        # a memoryview allows slicing strings without copying the whole remaining message
+        self._content = memoryview(content)
         self._pos = 0
 
     def read(self, format):
+        s = _STRUCTS.get(format)
+        if s is None:
+            s = _getStruct(format)
         oldPos = self._pos
-        self._pos += struct.calcsize(format)
-        return struct.unpack(format, self._content[oldPos:self._pos])
+        self._pos += s.size
+        return s.unpack_from(self._content, oldPos)
 
     def readInt(self):
-        return self.read("!i")[0]
+        oldPos = self._pos
+        self._pos += 4
+        return _INT.unpack_from(self._content, oldPos)[0]
 
     def readTypedInt(self):
         t, i = self.read("!Bi")
@@ -45,7 +106,9 @@ class Storage:
         return i
 
     def readDouble(self):
-        return self.read("!d")[0]
+        oldPos = self._pos
+        self._pos += 8
+        return _DOUBLE.unpack_from(self._content, oldPos)[0]
 
     def readTypedDouble(self):
         t, d = self.read("!Bd")
@@ -59,8 +122,10 @@ class Storage:
         return self.read("!i")[0]
 
     def readString(self):
-        length = self.read("!i")[0]
-        return str(self.read("!%ss" % length)[0].decode("latin1"))
+        pos = self._pos + 4
+        end = pos + _INT.unpack_from(self._content, self._pos)[0]
+        self._pos = end
+        return _decodeString(self._content[pos:end].tobytes())
 
     def readTypedString(self):
         t = self.read("!B")[0]
@@ -68,8 +133,17 @@ class Storage:
         return self.readString()
 
     def readStringList(self):
-        n = self.read("!i")[0]
-        return tuple([self.readString() for i in range(n)])
+        content = self._content
+        pos = self._pos
+        n = _INT.unpack_from(content, pos)[0]
+        pos += 4
+        result = []
+        for _ in range(n):
+            end = pos + 4 + _INT.unpack_from(content, pos)[0]
+            result.append(_decodeString(content[pos + 4:end].tobytes()))
+            pos = end
+        self._pos = pos
+        return tuple(result)
 
     def readTypedStringList(self):
         t = self.read("!B")[0]
@@ -78,7 +152,19 @@ class Storage:
 
     def readShape(self):
         length = self.readLength()
-        return tuple([self.read("!dd") for i in range(length)])
+        pos = self._pos
+        self._pos += length * _POINT.size
+        return tuple(_POINT.iter_unpack(self._content[pos:self._pos]))
+
+    def readRecord(self, decoder):
+        """Reads values with a compiled record decoder (see records.py).
+        Returns None and keeps the position if the record does not match the decoder.
+        """
+        decoded = decoder(self._content, self._pos)
+        if decoded is None:
+            return None
+        self._pos = decoded[1]
+        return decoded[0]
 
     def readCompound(self, expectedSize=None):
         t, s = self.read("!Bi")
@@ -91,5 +177,5 @@ class Storage:
 
     def printDebug(self):
         if _DEBUG:
-            for char in self._content[self._pos:]:
+            for char in self._content[self._pos:].tobytes():
                 print("%03i %02x %s" % (ord(char), ord(char), char))
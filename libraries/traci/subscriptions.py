@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    subscriptions.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Compiled subscribe commands and the registry restoring subscriptions after a load.
+
+For a given command, interval and set of variables the subscribe commands of all objects only
+differ in the object id. The bytes before and after it are compiled once into a SubscriptionTemplate,
+so encoding a subscription is a single join. Subscribing many objects, e.g. all vehicles which
+departed in a step, needs a single round trip inside Connection.batch():
+
+    with conn.batch():
+        for vehID in departed:
+            conn.vehicle.subscribe(vehID, varIDs)
+
+The SubscriptionManager (Connection.enableSubscriptionManager) records all subscriptions made
+over the connection and issues them again with one message after Connection.load. Subscriptions of
+objects which are not part of the loaded simulation are dropped. Context subscription filters are
+not recorded.
+"""
+
+from __future__ import absolute_import
+import struct
+
+from . import constants as tc
+
+# number of compiled templates kept before the cache is cleared
+_MAX_CACHED_TEMPLATES = 4096
+_TEMPLATES = {}
+# begin values of subscriptions which are active from the start
+_DEFAULT_BEGINS = (tc.INVALID_DOUBLE_VALUE, 0)
+
+_SHORT_HEADER = struct.Struct("!B")
+_LONG_HEADER = struct.Struct("!Bi")
+_INT = struct.Struct("!i")
+
+
+class SubscriptionTemplate:
+
+    """The bytes of a variable or context subscribe command around the object id."""
+
+    def __init__(self, cmdID, begin, end, varIDs, parameters=None, domain=None, dist=None):
+        self._head = struct.pack("!Bdd", cmdID, begin, end)
+        tail = [] if domain is None else [struct.pack("!Bd", domain, dist)]
+        tail.append(struct.pack("!B", len(varIDs)))
+        for v in varIDs:
+            tail.append(struct.pack("!B", v))
+            if parameters and v in parameters:
+                tail.append(parameters[v])
+        self._tail = b"".join(tail)
+        # length byte, head, length of the object id and tail
+        self._length = 1 + len(self._head) + 4 + len(self._tail)
+
+    def encode(self, objID):
+        """encode(string) -> bytes
+
+        Returns the complete subscribe command for the given object.
+        """
+        data = objID.encode("latin1")
+        length = self._length + len(data)
+        if length <= 255:
+            header = _SHORT_HEADER.pack(length)
+        else:
+            header = _LONG_HEADER.pack(0, length + 4)
+        return b"".join((header, self._head, _INT.pack(len(data)), data, self._tail))
+
+
+def compileSubscription(cmdID, begin, end, varIDs, parameters=None, domain=None, dist=None):
+    """compileSubscription(integer, double, double, list(integer), dict, integer, double) -> SubscriptionTemplate
+
+    Returns the (cached) template of the subscribe command. domain and dist are given for context subscriptions.
+    """
+    key = (cmdID, begin, end, tuple(varIDs), domain, dist)
+    if parameters:
+        key += tuple(sorted(parameters.items()))
+    template = _TEMPLATES.get(key)
+    if template is None:
+        template = SubscriptionTemplate(cmdID, begin, end, varIDs, parameters, domain, dist)
+        if len(_TEMPLATES) >= _MAX_CACHED_TEMPLATES:
+            _TEMPLATES.clear()
+        _TEMPLATES[key] = template
+    return template
+
+
+class SubscriptionManager:
+
+    """Records the subscriptions of a connection and restores them after a load.
+    SUMO drops the subscriptions of objects which leave the simulation, so whenever more than pruneSize
+    variable subscriptions are recorded the ones without results in the last step are forgotten.
+    """
+
+    def __init__(self, connection, pruneSize=1024):
+        self._connection = connection
+        # (command, object id) -> (begin, end, variables, parameters)
+        self._variable = {}
+        # (command, object id, domain) -> (begin, end, distance, variables)
+        self._context = {}
+        self._minPruneSize = pruneSize
+        self._pruneSize = pruneSize
+        self.restored = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._variable) + len(self._context)
+
+    def added(self, cmdID, begin, end, objID, varIDs, parameters=None):
+        """Records a variable subscription, an empty variable list removes it."""
+        if varIDs:
+            self._variable[(cmdID, objID)] = (begin, end, tuple(varIDs), parameters)
+        else:
+            self._variable.pop((cmdID, objID), None)
+
+    def addedContext(self, cmdID, begin, end, objID, domain, dist, varIDs):
+        """Records a context subscription, an empty variable list removes it."""
+        if varIDs:
+            self._context[(cmdID, objID, domain)] = (begin, end, dist, tuple(varIDs))
+        else:
+            self._context.pop((cmdID, objID, domain), None)
+
+    def stepDone(self):
+        """Called after the results of a simulation step were read."""
+        if len(self._variable) > self._pruneSize:
+            self.prune()
+            self._pruneSize = max(self._minPruneSize, 2 * len(self._variable))
+
+    def prune(self):
+        """Forgets the variable subscriptions which delivered no results in the last step.
+        Subscriptions with a begin are kept since they may not have started yet.
+        """
+        for key, (begin, _, __, ___) in list(self._variable.items()):
+            if begin not in _DEFAULT_BEGINS:
+                continue
+            results = self._connection._getSubscriptionResults(key[0] + 0x10)
+            if results is None or not results.hasObject(key[1]):
+                del self._variable[key]
+
+    def restore(self):
+        """restore() -> list((tuple, DeferredResult))
+
+        Queues all recorded subscriptions on the connection, which has to be inside a batch.
+        Returns the keys and pending results to be passed to checkRestored once they were sent.
+        """
+        variable, context = self._variable, self._context
+        self._variable, self._context = {}, {}
+        pending = []
+        for (cmdID, objID), (begin, end, varIDs, parameters) in variable.items():
+            pending.append(((cmdID, objID), self._connection._subscribe(
+                cmdID, begin, end, objID, varIDs, parameters)))
+        for (cmdID, objID, domain), (begin, end, dist, varIDs) in context.items():
+            pending.append(((cmdID, objID, domain), self._connection._subscribeContext(
+                cmdID, begin, end, objID, domain, dist, varIDs)))
+        return pending
+
+    def checkRestored(self, pending):
+        """Forgets the restored subscriptions which SUMO rejected, e.g. of vehicles which do not exist."""
+        for key, result in pending:
+            if result is None or not result.done():
+                continue
+            if result._exception is None:
+                self.restored += 1
+                continue
+            self.dropped += 1
+            if len(key) == 2:
+                self._variable.pop(key, None)
+            else:
+                self._context.pop(key, None)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+# Eclipse SUMO, Simulation of Urban MObility; see https://eclipse.org/sumo
+# Copyright (C) 2008-2019 German Aerospace Center (DLR) and others.
+# This program and the accompanying materials
+# are made available under the terms of the Eclipse Public License v2.0
+# which accompanies this distribution, and is available at
+# http://www.eclipse.org/legal/epl-v20.html
+# SPDX-License-Identifier: EPL-2.0
+
+# @file    transport.py
+# @date    2019-11-12
+# @version $Id$
+
+"""Transports carrying the TraCI messages between client and server.
+
+The transport is chosen by the host given to traci.connect / traci.init:
+    "localhost", "10.0.0.1", ...  TCP (the only transport sumo itself offers)
+    "unix:/tmp/sumo.sock"         Unix domain socket
+    "shm:/tmp/sumo.sock"          shared memory rings, set up through a Unix domain socket (Linux only)
+For the last two the port is ignored and the server has to offer the transport as well,
+createListener() provides the server side (e.g. for local stand-in servers).
+All transports offer the socket methods the connection uses: sendall, recv, recv_into and close.
+
+The shared memory transport copies the messages through two rings in a memfd, one per direction.
+The rings do not share any counters: the writer adds the number of bytes it wrote to an eventfd and the
+reader adds the number of bytes it consumed to another one. A side which has nothing to read or no space
+to write blocks in poll on the eventfd, so there is no polling. The eventfd system calls are the only
+synchronization, they order the copies into the ring before the reads from it. The Unix domain socket
+which handed over the memfd and the eventfds stays open, when it is closed the peer is gone.
+"""
+
+from __future__ import absolute_import
+import errno
+import mmap
+import os
+import select
+import socket
+import struct
+import sys
+
+UNIX_PREFIX = "unix:"
+SHM_PREFIX = "shm:"
+
+# bytes of each ring, the largest messages (the steps of many subscribed vehicles) are about 1 MB
+_DEFAULT_CAPACITY = 1 << 22
+_CAPACITY = struct.Struct("!Q")
+_PEER_EVENTS = select.POLLIN | select.POLLHUP | select.POLLERR
+
+
+def _checkSharedMemory():
+    if not (hasattr(os, "eventfd") and hasattr(os, "memfd_create") and hasattr(socket, "send_fds")):
+        raise OSError(errno.ENOTSUP, "the shared memory transport needs Linux and Python 3.10")
+
+
+class _Ring:
+
+    """One direction of a shared memory connection, seen from one side.
+    The writer side tracks the free space and the reader side the available bytes, both learn about
+    the changes made by the other side only through the eventfds (data from the writer, space from the reader).
+    """
+
+    def __init__(self, view, start, capacity, dataFD, spaceFD, peer):
+        self._view = view
+        self._start = start
+        self._capacity = capacity
+        self._dataFD = dataFD
+        self._spaceFD = spaceFD
+        self._peer = peer
+        # bytes written (writer) or read (reader) so far
+        self._pos = 0
+        # writer: free bytes it knows of
+        self._free = capacity
+        # reader: bytes available to it and consumed bytes not yet handed back to the writer
+        self._available = 0
+        self._consumed = 0
+        self._poll = None
+
+    def _wait(self, fd):
+        """Returns the value added to the eventfd since the last call, blocks until there is one.
+        Returns 0 if the peer closed its end.
+        """
+        if self._poll is None:
+            self._poll = select.poll()
+            self._poll.register(fd, select.POLLIN)
+            self._poll.register(self._peer, _PEER_EVENTS)
+        while True:
+            # in a round trip the answer mostly is not there yet, so the poll comes first
+            events = self._poll.poll()
+            try:
+                return os.eventfd_read(fd)
+            except BlockingIOError:
+                if not any(eventFD == fd for eventFD, _ in events):
+                    # only the socket of the peer, which never carries data after the setup, so it was closed
+                    return 0
+
+    def write(self, data):
+        view = memoryview(data)
+        if view.format != "B":
+            view = view.cast("B")
+        pos = 0
+        while pos < len(view):
+            if self._free == 0:
+                self._free = self._wait(self._spaceFD)
+                if not self._free:
+                    raise OSError(errno.EPIPE, "shared memory peer closed")
+            offset = self._pos % self._capacity
+            size = min(self._free, len(view) - pos, self._capacity - offset)
+            self._view[self._start + offset:self._start + offset + size] = view[pos:pos + size]
+            self._pos += size
+            self._free -= size
+            pos += size
+            # publishes the copied bytes, the system call orders them before the reader's
+            os.eventfd_write(self._dataFD, size)
+
+    def readInto(self, view):
+        if self._available == 0:
+            self._available = self._wait(self._dataFD)
+            if not self._available:
+                return 0
+        offset = self._pos % self._capacity
+        size = min(self._available, len(view), self._capacity - offset)
+        view[:size] = self._view[self._start + offset:self._start + offset + size]
+        self._pos += size
+        self._available -= size
+        self._consumed += size
+        # the space goes back in large parts; a writer waiting for it has written a full ring,
+        # which the reader consumes before it waits itself, so both never wait for each other
+        if self._consumed >= self._capacity // 2:
+            os.eventfd_write(self._spaceFD, self._consumed)
+            self._consumed = 0
+        return size
+
+
+class SharedMemoryTransport:
+
+    """One end of a shared memory connection, the client writes to the first ring and reads from the second.
+    fds are the memfd of the rings and the data and space eventfds of both rings.
+    """
+
+    def __init__(self, peer, capacity, fds, isServer):
+        memFD, requestData, requestSpace, responseData, responseSpace = fds
+        self._peer = peer
+        self._fds = fds
+        self._mmap = mmap.mmap(memFD, 2 * capacity)
+        self._view = memoryview(self._mmap)
+        requests = _Ring(self._view, 0, capacity, requestData, requestSpace, peer.fileno())
+        responses = _Ring(self._view, capacity, capacity, responseData, responseSpace, peer.fileno())
+        if isServer:
+            self._recvRing, self._sendRing = requests, responses
+        else:
+            self._sendRing, self._recvRing = requests, responses
+
+    def sendall(self, data):
+        if self._mmap is None:
+            raise OSError(errno.EBADF, "shared memory transport is closed")
+        self._sendRing.write(data)
+
+    def send(self, data):
+        self.sendall(data)
+        return len(data)
+
+    def recv_into(self, view, nbytes=0):
+        if self._mmap is None:
+            raise OSError(errno.EBADF, "shared memory transport is closed")
+        view = memoryview(view)
+        if view.format != "B":
+            view = view.cast("B")
+        return self._recvRing.readInto(view[:nbytes] if nbytes else view)
+
+    def recv(self, size):
+        data = bytearray(size)
+        return bytes(data[:self.recv_into(data)])
+
+    def close(self):
+        if self._mmap is not None:
+            self._sendRing._view = self._recvRing._view = None
+            self._view.release()
+            self._mmap.close()
+            self._mmap = None
+            for fd in self._fds:
+                os.close(fd)
+            # the peer notices this in its poll
+            self._peer.close()
+
+
+class SharedMemoryListener:
+
+    """Server side of a shared memory connection, a Unix domain socket at path over which each client
+    gets a new memfd and eventfds.
+    """
+
+    def __init__(self, path, capacity=_DEFAULT_CAPACITY):
+        _checkSharedMemory()
+        self.path = path
+        self.capacity = capacity
+        if os.path.exists(path):
+            os.remove(path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(path)
+        self._socket.listen(1)
+
+    def accept(self):
+        peer, _ = self._socket.accept()
+        memFD = os.memfd_create("traci", os.MFD_CLOEXEC)
+        os.ftruncate(memFD, 2 * self.capacity)
+        fds = [memFD] + [os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK) for _ in range(4)]
+        socket.send_fds(peer, [_CAPACITY.pack(self.capacity)], fds)
+        return SharedMemoryTransport(peer, self.capacity, fds, True), self.path
+
+    def getsockname(self):
+        return self.path
+
+    def close(self):
+        self._socket.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _connectSharedMemory(path):
+    _checkSharedMemory()
+    peer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    peer.connect(path)
+    data, fds, _, __ = socket.recv_fds(peer, _CAPACITY.size, 5)
+    if len(data) != _CAPACITY.size or len(fds) != 5:
+        for fd in fds:
+            os.close(fd)
+        peer.close()
+        raise ConnectionRefusedError(errno.ECONNREFUSED, "no shared memory server at %s" % path)
+    return SharedMemoryTransport(peer, _CAPACITY.unpack(data)[0], fds, False)
+
+
+def createTransport(host, port):
+    """Connects to the server at the given address and returns the transport."""
+    if host.startswith(UNIX_PREFIX):
+        transport = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        transport.connect(host[len(UNIX_PREFIX):])
+        return transport
+    if host.startswith(SHM_PREFIX):
+        return _connectSharedMemory(host[len(SHM_PREFIX):])
+    if sys.platform.startswith('java'):
+        # working around jython 2.7.0 bug #2273
+        transport = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    else:
+        transport = socket.socket()
+    transport.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    transport.connect((host, port))
+    return transport
+
+
+def createListener(host, port=0):
+    """Returns a listener for one client at the given address, accept() returns (transport, address)."""
+    if host.startswith(UNIX_PREFIX):
+        path = host[len(UNIX_PREFIX):]
+        if os.path.exists(path):
+            os.remove(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+    elif host.startswith(SHM_PREFIX):
+        return SharedMemoryListener(host[len(SHM_PREFIX):])
+    else:
+        listener = socket.socket()
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind((host, port))
+    listener.listen(1)
+    return listener
+
+
+def accept(listener):
+    """Waits for the client of the listener and returns its transport."""
+    transport, _ = listener.accept()
+    if getattr(transport, "family", None) in (socket.AF_INET, socket.AF_INET6):
+        transport.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return transport